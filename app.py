@@ -2,6 +2,10 @@ import streamlit as st
 from datetime import datetime
 import sys
 from pathlib import Path
+try:
+    from streamlit.runtime.scriptrunner_utils.exceptions import ScriptControlException
+except ImportError:  # older Streamlit
+    from streamlit.runtime.scriptrunner.exceptions import ScriptControlException
 sys.path.insert(0, str(Path(__file__).parent))
 
 st.set_page_config(
@@ -31,13 +35,45 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-from src.agents.graph import run_health_guardian
-from src.utils.cache import briefing_history
-from src.config import api_config
+from src.agents.graph import BriefingStream, get_agent
+from src.utils.cache import briefing_history, LatestResultCache
+from src.utils.singleflight import SingleFlight
+from src.utils.records import to_record
+from src.config import api_config, DEFAULT_LOCATION, SHARED_RESULT_TTL
 
+LOCATION_KEY = DEFAULT_LOCATION.name
+
+@st.cache_data(ttl=300)
 def check_api_status():
     return api_config.validate_keys()
 
+@st.cache_resource
+def load_agent():
+    return get_agent()
+
+@st.cache_resource
+def shared_runs() -> tuple[LatestResultCache, SingleFlight]:
+    """Process-wide latest result per location and in-flight run coalescing, shared by all sessions."""
+    return LatestResultCache(ttl=SHARED_RESULT_TTL), SingleFlight()
+
+@st.cache_resource
+def failed_runs() -> dict:
+    """Run id of the last failed or interrupted run per location; the next attempt resumes it."""
+    return {}
+
+@st.cache_data(ttl=60)
+def history_stats(days=7):
+    return briefing_history.stats(days)
+
+@st.cache_data(ttl=60)
+def recent_briefings(days):
+    return briefing_history.get_recent(days)
+
+@st.cache_data(ttl=30)
+def precomputed_briefing(location):
+    """Newest stored run for the location, usually written by the scheduler (python -m src.scheduler)."""
+    return briefing_history.latest(location)
+
 def render_header():
     col1, col2 = st.columns([3, 1])
     with col1:
@@ -61,11 +97,10 @@ def render_sidebar():
         st.divider()
         
         st.subheader("Recent Stats")
-        recent = briefing_history.get_recent(days=7)
-        if recent:
-            avg = sum(b.get("risk_score", 0) for b in recent) / len(recent)
-            st.metric("Avg Risk Score (7d)", f"{avg:.1f}")
-            st.metric("Briefings Generated", len(recent))
+        stats = history_stats(days=7)
+        if stats["count"]:
+            st.metric("Avg Risk Score (7d)", f"{stats['avg_risk_score'] or 0:.1f}")
+            st.metric("Briefings Generated", stats["count"])
         else:
             st.info("No recent briefings")
 
@@ -79,22 +114,69 @@ def render_main():
         )
     
     if generate:
-        with st.spinner("Analyzing conditions..."):
+        latest, flight = shared_runs()
+        shared = latest.get(LOCATION_KEY)
+        if shared is None:
+            future, leader = flight.join(LOCATION_KEY)
             try:
-                result = run_health_guardian()
-                st.session_state["latest"] = result
-                st.session_state["latest_time"] = datetime.now()
-                briefing_history.save(result)
+                if leader:
+                    shared = _run_and_share(latest, flight)
+                else:
+                    with st.spinner("Another session is generating this briefing..."):
+                        shared = future.result()
             except Exception as e:
                 st.error(f"Error: {e}")
                 return
+        st.session_state["latest"], st.session_state["latest_time"] = shared
+        st.rerun()
     
+    # Serve whichever is newer: this session's last run or the latest precomputed one.
+    candidates = [precomputed_briefing(LOCATION_KEY)]
     if "latest" in st.session_state:
-        render_briefing(st.session_state["latest"])
+        candidates.append((st.session_state["latest"], st.session_state["latest_time"]))
+    candidates = [c for c in candidates if c is not None]
+    if candidates:
+        result, generated_at = max(candidates, key=lambda c: c[1])
+        render_briefing(result, generated_at)
     else:
         st.info("Click to generate today's briefing")
 
-def render_briefing(result):
+def _run_and_share(latest, flight):
+    """Leader path: stream the run to this session, then publish it to waiting sessions."""
+    load_agent()
+    stream = BriefingStream(DEFAULT_LOCATION, failed_runs().pop(LOCATION_KEY, None))
+    try:
+        st.subheader("Today's Briefing")
+        st.write_stream(stream)
+        briefing_history.save(stream.state)
+    except BaseException as e:
+        # Includes Streamlit's stop/rerun signals, so waiters are never left hanging.
+        if stream.run_id:
+            failed_runs()[LOCATION_KEY] = stream.run_id
+        flight.resolve(LOCATION_KEY, error=_shareable(e))
+        raise
+    result = to_record(stream.state)
+    shared = (result, latest.put(LOCATION_KEY, result))
+    flight.resolve(LOCATION_KEY, shared)
+    history_stats.clear()
+    recent_briefings.clear()
+    precomputed_briefing.clear()
+    return shared
+
+def _shareable(e: BaseException) -> Exception:
+    """The error waiting sessions get for a failed leader run.
+
+    Streamlit's stop/rerun signals carry the leader session's script state and
+    escape the waiters' ``except Exception``, so they and other non-Exception
+    errors reach waiters as a plain RuntimeError.
+    """
+    if isinstance(e, Exception) and not isinstance(e, ScriptControlException):
+        return e
+    error = RuntimeError("briefing run was interrupted")
+    error.__cause__ = e
+    return error
+
+def render_briefing(result, generated_at):
     st.divider()
     
     col1, col2, col3 = st.columns(3)
@@ -111,14 +193,18 @@ def render_briefing(result):
         st.metric("Confidence", result.get("confidence", "N/A").title())
         completeness = result.get("data_quality", {}).get("completeness", 0)
         st.progress(completeness, text=f"Data: {completeness*100:.0f}%")
+        missing = result.get("data_quality", {}).get("missing_sources")
+        if missing:
+            st.caption(f"Missing: {', '.join(missing)}")
     
     with col3:
-        time = st.session_state.get("latest_time", datetime.now())
-        st.metric("Generated", time.strftime("%I:%M %p"))
+        st.metric("Generated", generated_at.strftime("%I:%M %p"))
     
     st.divider()
     
     st.subheader("Today's Briefing")
+    for alert in result.get("trend_alerts") or []:
+        st.warning(f"📈 {alert}")
     st.markdown(result.get("briefing_text", "No briefing available"))
     
     with st.expander("Detailed Analysis"):
@@ -142,6 +228,22 @@ def render_briefing(result):
                 st.write(f"Category: {a.get('category')}")
             else:
                 st.warning("Unavailable")
+        
+        usage = result.get("token_usage") or {}
+        if usage.get("total_tokens"):
+            st.caption(f"LLM tokens: {usage['input_tokens']} in / {usage['output_tokens']} out")
+    
+    forecast = result.get("risk_forecast")
+    if forecast:
+        from src.scoring.forecast import describe_window_records
+
+        with st.expander("Next 24 Hours"):
+            st.line_chart(
+                {"Risk score": forecast["risk_scores"]},
+                x_label="Hours from now", y_label="Risk",
+            )
+            for line in describe_window_records(forecast):
+                st.write(line)
     
     with st.expander("Action Plan"):
         if result.get("action_plan"):
@@ -171,21 +273,60 @@ def render_briefing(result):
             for error in result["errors"]:
                 st.error(error)
 
+def _latency_rows(histogram, errors, label):
+    rows = []
+    for labels in histogram.label_sets():
+        p50, p95 = histogram.quantile(0.5, **labels), histogram.quantile(0.95, **labels)
+        rows.append({
+            label: labels[label],
+            "calls": histogram.count(**labels),
+            "p50 ms": round(p50 * 1000, 1),
+            "p95 ms": round(p95 * 1000, 1),
+            "errors": errors.value(**labels),
+        })
+    return rows
+
+def render_diagnostics():
+    import json
+    from src.utils import metrics
+
+    with st.expander("Diagnostics"):
+        st.caption("Since process start, across all sessions")
+        st.subheader("Pipeline stages")
+        st.dataframe(_latency_rows(metrics.NODE_LATENCY, metrics.NODE_ERRORS, "node"), use_container_width=True)
+        st.subheader("Providers")
+        st.dataframe(_latency_rows(metrics.PROVIDER_LATENCY, metrics.PROVIDER_ERRORS, "provider"), use_container_width=True)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("Caches")
+            for row in metrics.CACHE_REQUESTS.to_json():
+                st.write(f"{row['labels']['cache']} {row['labels']['result']}: {row['value']:.0f}")
+        with col2:
+            st.subheader("LLM")
+            st.write(f"Input tokens: {metrics.LLM_TOKENS.value(direction='input'):.0f}")
+            st.write(f"Output tokens: {metrics.LLM_TOKENS.value(direction='output'):.0f}")
+            st.write(f"Retries: {sum(row['value'] for row in metrics.RETRIES.to_json()):.0f}")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("Prometheus", data=metrics.registry.to_prometheus(), file_name="metrics.prom")
+        with col2:
+            st.download_button("JSON", data=json.dumps(metrics.registry.to_json(), indent=2), file_name="metrics.json")
+
 def main():
     render_header()
     render_sidebar()
     render_main()
     
     st.divider()
+    render_diagnostics()
     st.caption("Built with ❤️ for Boston | Powered by LangGraph")
 
 if __name__ == "__main__":
     main()
 
 
-import plotly.express as px
-import pandas as pd
-
 def render_tabs():
     tab1, tab2, tab3 = st.tabs(["Today", "History", "Settings"])
     
@@ -197,9 +338,12 @@ def render_tabs():
         render_settings()
 
 def render_history():
+    import plotly.express as px
+    import pandas as pd
+
     st.header("Briefing History")
     
-    recent = briefing_history.get_recent(days=14)
+    recent = recent_briefings(days=14)
     if not recent:
         st.info("No briefings yet!")
         return
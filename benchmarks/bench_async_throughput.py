@@ -0,0 +1,95 @@
+"""Throughput of the sync graph vs the async graph with simulated provider/LLM latency.
+
+    python -m benchmarks.bench_async_throughput --runs 200 --latency 0.2
+
+Providers and the LLM are replaced by sleeps, so this measures how many runs
+the orchestration can keep in flight, not the real APIs.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from src.agents import graph, nodes
+from src.data_ingestion.collector import Provider
+from src.data_ingestion.weather_client import WeatherData
+from src.utils.cache import BriefingCache
+
+def fake_weather() -> WeatherData:
+    return WeatherData(
+        timestamp=0, temperature_f=68, feels_like_f=68, humidity=50, wind_speed_mph=5,
+        weather_condition="Clear", weather_description="clear sky", cloud_coverage=0,
+        visibility_miles=10, pressure_hpa=1015,
+    )
+
+def install_fakes(latency: float):
+    def fetch(lat, lon):
+        time.sleep(latency)
+        return fake_weather()
+
+    async def afetch(lat, lon):
+        await asyncio.sleep(latency)
+        return fake_weather()
+
+    def missing(lat, lon):
+        time.sleep(latency)
+        return None
+
+    async def amissing(lat, lon):
+        await asyncio.sleep(latency)
+        return None
+
+    class FakeLLM:
+        def invoke(self, messages):
+            time.sleep(latency)
+            return SimpleNamespace(content="Stay safe.")
+
+        async def ainvoke(self, messages):
+            await asyncio.sleep(latency)
+            return SimpleNamespace(content="Stay safe.")
+
+    nodes.get_collector().providers = [
+        Provider("weather", "Weather", fetch, afetch),
+        Provider("aqi", "AQI", missing, amissing),
+    ]
+    nodes.get_llm = FakeLLM
+    # Every run is low risk and shares one fingerprint; disable the template
+    # fast path and the briefing cache so the LLM stage is exercised.
+    nodes.TEMPLATE_BRIEFING_TYPES = set()
+    nodes.briefing_cache = BriefingCache(db_path=":memory:", ttl=0)
+
+def bench_sync(runs: int, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: graph.run_health_guardian(), range(runs)))
+    return time.perf_counter() - start
+
+def bench_async(runs: int, concurrency: int) -> float:
+    start = time.perf_counter()
+    asyncio.run(graph.arun_many(runs, max_concurrency=concurrency))
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--threads", type=int, nargs="+", default=[8, 32])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32, 200])
+    args = parser.parse_args()
+
+    install_fakes(args.latency)
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for threads in args.threads:
+            rows.append((f"sync, {threads} threads", bench_sync(args.runs, threads)))
+        for concurrency in args.concurrency:
+            rows.append((f"async, cap {concurrency}", bench_async(args.runs, concurrency)))
+
+    print(f"{args.runs} runs, {args.latency * 1000:.0f} ms simulated latency per stage")
+    for label, elapsed in rows:
+        print(f"{label:>20}: {elapsed:7.2f} s  {args.runs / elapsed:8.1f} runs/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Scalar vs vectorized RiskCalculator throughput.
+
+    python -m benchmarks.bench_risk_batch --rows 100000 1000000
+"""
+import argparse
+import time
+from types import SimpleNamespace
+import numpy as np
+from src.scoring.risk_calculator import RiskCalculator
+
+def make_inputs(rows: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return (
+        rng.uniform(-10, 115, rows),
+        rng.uniform(0, 50, rows),
+        rng.uniform(0, 10, rows),
+        rng.integers(0, 400, rows).astype(np.float64),
+    )
+
+def bench_scalar(calc, temp, wind, vis, aqi) -> float:
+    weather = [SimpleNamespace(feels_like_f=t, wind_speed_mph=w, visibility_miles=v) for t, w, v in zip(temp, wind, vis)]
+    air = [SimpleNamespace(primary_aqi=int(a)) for a in aqi]
+    start = time.perf_counter()
+    for w, a in zip(weather, air):
+        calc.calculate(w, a)
+    return time.perf_counter() - start
+
+def bench_batch(calc, temp, wind, vis, aqi) -> float:
+    start = time.perf_counter()
+    calc.calculate_batch(temp, wind, vis, aqi)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    calc = RiskCalculator()
+    print(f"{'rows':>10} {'scalar s':>10} {'batch s':>10} {'speedup':>9}")
+    for rows in args.rows:
+        inputs = make_inputs(rows)
+        scalar = bench_scalar(calc, *inputs)
+        batch = min(bench_batch(calc, *inputs) for _ in range(3))
+        print(f"{rows:>10} {scalar:>10.3f} {batch:>10.4f} {scalar / batch:>8.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Compare two benchmark reports written by benchmarks.run.
+
+    python -m benchmarks.compare benchmarks/results/abc123.json benchmarks/results/def456.json
+"""
+import argparse
+import json
+from pathlib import Path
+
+def flatten(results: dict, prefix: str = "") -> dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+def compare(baseline: dict, candidate: dict) -> list[tuple[str, float, float, float]]:
+    before = flatten(baseline["results"])
+    after = flatten(candidate["results"])
+    rows = []
+    for name in sorted(before.keys() & after.keys()):
+        old, new = before[name], after[name]
+        change = (new - old) / old * 100 if old else 0.0
+        rows.append((name, old, new, change))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+    print(f"{baseline['commit']} -> {candidate['commit']}")
+    for name, old, new, change in compare(baseline, candidate):
+        print(f"{name:<50} {old:>14.2f} {new:>14.2f} {change:>+8.1f}%")
+
+if __name__ == "__main__":
+    main()
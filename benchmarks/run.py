@@ -0,0 +1,379 @@
+"""Offline benchmark suite.
+
+Runs the full pipeline against local provider stand-ins (see stubs.py) and
+writes a machine-readable report:
+
+    python -m benchmarks.run                       # -> benchmarks/results/<commit>.json
+    python -m benchmarks.run --latency openai=0.8 --error-rate airnow=0.2
+    python -m benchmarks.compare benchmarks/results/old.json benchmarks/results/new.json
+
+Response, briefing and template fast paths are disabled so every run pays for
+each provider call; the numbers measure the pipeline, not the caches.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from benchmarks.stubs import PROVIDERS, StubProviders
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+UNCACHED_ENV = {
+    "WEATHER_CACHE_TTL": "0",
+    "AIRNOW_CACHE_TTL": "0",
+    "FORECAST_CACHE_TTL": "0",
+    "LLM_REQUESTS_PER_SECOND": "0",
+    "CACHE_MAX_STALE": "0",
+    "BRIEFING_CACHE_TTL": "0",
+    "TEMPLATE_BRIEFING_TYPES": "",
+}
+
+def summarize(seconds: list[float]) -> dict:
+    ordered = sorted(seconds)
+    return {
+        "n": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+def bench_pipeline(runs: int) -> dict:
+    from src.agents.graph import finish_run, get_agent, prepare_run, run_config
+
+    agent = get_agent()
+    node_times = defaultdict(list)
+    end_to_end = []
+    for _ in range(runs):
+        start = last = time.perf_counter()
+        initial_state, run_id = prepare_run(agent)
+        for update in agent.stream(initial_state, run_config(run_id), stream_mode="updates"):
+            now = time.perf_counter()
+            for node in update:
+                node_times[node].append(now - last)
+            last = now
+        finish_run(agent, run_id)
+        end_to_end.append(time.perf_counter() - start)
+    return {
+        "end_to_end": summarize(end_to_end),
+        "nodes": {node: summarize(times) for node, times in node_times.items()},
+    }
+
+def bench_memory(runs: int) -> dict:
+    from src.agents.graph import run_health_guardian
+
+    tracemalloc.start()
+    for _ in range(runs):
+        run_health_guardian()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"runs": runs, "peak_kib": peak / 1024, "retained_kib": current / 1024}
+
+def bench_throughput(runs: int, threads: int, concurrency: int) -> dict:
+    from src.agents.graph import run_health_guardian, arun_many
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: run_health_guardian(), range(runs)))
+    sync_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    asyncio.run(arun_many(runs, max_concurrency=concurrency))
+    async_elapsed = time.perf_counter() - start
+
+    return {
+        "runs": runs,
+        "sync_threads": threads,
+        "sync_runs_per_s": runs / sync_elapsed,
+        "async_concurrency": concurrency,
+        "async_runs_per_s": runs / async_elapsed,
+    }
+
+def bench_batch_scoring(row_counts: list[int]) -> dict:
+    from benchmarks.bench_risk_batch import make_inputs
+    from src.scoring.risk_calculator import RiskCalculator
+
+    calc = RiskCalculator()
+    results = {}
+    for rows in row_counts:
+        inputs = make_inputs(rows)
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            calc.calculate_batch(*inputs)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        results[str(rows)] = {"best_ms": best * 1000, "rows_per_s": rows / best}
+    return results
+
+def bench_profiles(users: int) -> dict:
+    """One shared snapshot scored for ``users`` subscribers cycling through the built-in profiles."""
+    from types import SimpleNamespace
+    from src.scoring.profiles import PROFILES, ProfileScorer
+
+    profiles = list(PROFILES.values())
+    start = time.perf_counter()
+    scorer = ProfileScorer([profiles[i % len(profiles)] for i in range(users)])
+    pack_elapsed = time.perf_counter() - start
+
+    weather = SimpleNamespace(feels_like_f=88.0, wind_speed_mph=12.0, visibility_miles=6.0)
+    air = SimpleNamespace(primary_aqi=95)
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        scorer.score(weather, air)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {"users": users, "pack_ms": pack_elapsed * 1000, "score_ms": best * 1000, "us_per_user": best / users * 1e6}
+
+def bench_stations(points: int) -> dict:
+    """One hourly-file download from the stub, then nearest-station lookups for ``points`` Boston-area points."""
+    import numpy as np
+    from src.data_ingestion.airquality_client import AirQualityClient
+
+    client = AirQualityClient()
+    start = time.perf_counter()
+    index = client.get_station_index()
+    load_elapsed = time.perf_counter() - start
+
+    rng = np.random.default_rng(0)
+    lats, lons = rng.uniform(42.2, 42.5, points), rng.uniform(-71.3, -70.9, points)
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        index.nearest(lats, lons)
+        timings.append(time.perf_counter() - start)
+    single = []
+    for lat, lon in zip(lats[:200], lons[:200]):
+        start = time.perf_counter()
+        index.nearest(lat, lon)
+        single.append(time.perf_counter() - start)
+    best = min(timings)
+    return {
+        "stations": len(index),
+        "load_ms": load_elapsed * 1000,
+        "points": points,
+        "batch_ms": best * 1000,
+        "us_per_point": best / points * 1e6,
+        "single_lookup": summarize(single),
+    }
+
+def bench_replay(frames: int) -> dict:
+    """One collection recorded from the stubs, replayed as ``frames`` half-hourly runs as fast as possible."""
+    from src.agents import nodes
+    from src.agents.state import create_initial_state
+    from src.data_ingestion.sources import RecordingSource, ReplaySource, read_cassette, use_source
+    from src.replay import areplay
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cassette = Path(tmp) / "cassette.jsonl.gz"
+        with use_source(RecordingSource(cassette)):
+            asyncio.run(nodes.acollect_data(create_initial_state()))
+        recorded = read_cassette(cassette)
+        size = cassette.stat().st_size
+    start = recorded[0]["t"]
+    records = [{**record, "t": start + i * 1800 + record["t"] - start} for i in range(frames) for record in recorded]
+
+    result = asyncio.run(areplay(ReplaySource(records), speed=math.inf))
+    return {
+        "frames": frames,
+        "cassette_bytes_per_frame": size,
+        "elapsed_s": result.elapsed,
+        "runs_per_s": len(result.runs) / result.elapsed,
+        "errors": sum(bool(run["errors"]) for run in result.runs),
+    }
+
+def bench_history(rows: int, queries: int) -> dict:
+    from src.utils.cache import BriefingHistory
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history = BriefingHistory(db_path=Path(tmp) / "history.db", legacy_dir=Path(tmp))
+        now = datetime.now()
+        states = [
+            {
+                "timestamp": now - timedelta(minutes=30 * i),
+                "risk_score": float(i % 100),
+                "risk_level": "low",
+                "briefing_text": "Stub briefing.",
+            }
+            for i in range(rows)
+        ]
+        start = time.perf_counter()
+        history.save_many(states)
+        insert_elapsed = time.perf_counter() - start
+
+        recent, stats = [], []
+        for _ in range(queries):
+            start = time.perf_counter()
+            history.get_recent(days=7)
+            recent.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            history.stats(days=7)
+            stats.append(time.perf_counter() - start)
+
+    return {
+        "rows": rows,
+        "insert_rows_per_s": rows / insert_elapsed,
+        "get_recent_7d": summarize(recent),
+        "stats_7d": summarize(stats),
+    }
+
+def bench_observations(rows: int) -> dict:
+    """Append a week of observations per location, then re-score it straight from the column files."""
+    import numpy as np
+    from src.scoring.risk_calculator import RiskCalculator
+    from src.utils.observations import ObservationStore
+
+    start_time = datetime(2026, 1, 1)
+    step = timedelta(days=7) / rows
+    states = [
+        {
+            "timestamp": start_time + step * i,
+            "location": {"name": "Boston"},
+            "risk_score": float(i % 100),
+            "weather_data": {"temperature_f": 60.0, "feels_like_f": 40.0 + i % 60, "humidity": 50,
+                             "wind_speed_mph": float(i % 40), "cloud_coverage": 20, "visibility_miles": 10.0,
+                             "pressure_hpa": 1015},
+            "air_quality_data": {"primary_aqi": i % 200, "category": "Good", "primary_pollutant": "O3"},
+        }
+        for i in range(rows)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ObservationStore(Path(tmp))
+        start = time.perf_counter()
+        for i in range(0, rows, 1_000):
+            store.append(states[i:i + 1_000])
+        append_elapsed = time.perf_counter() - start
+
+        columns = ("feels_like_f", "wind_speed_mph", "visibility_miles", "aqi")
+        start = time.perf_counter()
+        data = store.scan("Boston", columns=columns)
+        scan_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        RiskCalculator().calculate_batch(*(np.asarray(data[c], dtype=float) for c in columns))
+        rescore_elapsed = time.perf_counter() - start
+
+    return {
+        "rows": rows,
+        "append_rows_per_s": rows / append_elapsed,
+        "scan_4_columns_ms": scan_elapsed * 1000,
+        "rescore_ms": rescore_elapsed * 1000,
+    }
+
+def bench_api(requests: int, concurrency: int) -> dict:
+    """Cached /risk through the ASGI app in-process: framework and cache overhead, no sockets."""
+    import httpx
+    from src.api import create_app
+
+    app = create_app()
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            start = time.perf_counter()
+            await client.get("/risk", params={"location": "Boston"})
+            first = time.perf_counter() - start
+
+            async def worker(n):
+                for _ in range(n):
+                    await client.get("/risk", params={"location": "Boston"})
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+            return first, time.perf_counter() - start
+
+    first, elapsed = asyncio.run(run())
+    served = requests // concurrency * concurrency
+    return {"first_request_ms": first * 1000, "cached_requests_per_s": served / elapsed}
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def parse_provider_values(pairs: list[str]) -> dict:
+    values = {}
+    for pair in pairs:
+        provider, _, value = pair.partition("=")
+        if provider not in PROVIDERS:
+            raise SystemExit(f"Unknown provider '{provider}', expected one of {PROVIDERS}")
+        values[provider] = float(value)
+    return values
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--latency", nargs="*", default=["openweather=0.15", "airnow=0.3", "openai=0.8"],
+                        help="provider=seconds")
+    parser.add_argument("--error-rate", nargs="*", default=[], help="provider=fraction")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--history-rows", type=int, default=100_000)
+    parser.add_argument("--replay-frames", type=int, default=1440, help="half-hourly runs; 1440 is a month")
+    parser.add_argument("--quick", action="store_true", help="tiny workload for smoke testing")
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    if args.quick:
+        args.runs, args.rows, args.history_rows, args.replay_frames = 2, [1_000], 1_000, 48
+
+    latency = parse_provider_values(args.latency)
+    error_rate = parse_provider_values(args.error_rate)
+    commit = git_commit()
+
+    with StubProviders(latency=latency, error_rate=error_rate) as stubs, tempfile.TemporaryDirectory() as scratch:
+        stubs.configure_environment()
+        os.environ.update(UNCACHED_ENV)
+        # Stub readings must not feed the real per-location trend statistics or checkpoints.
+        os.environ["TRENDS_DB"] = str(Path(scratch) / "trends.db")
+        os.environ["CHECKPOINT_DB"] = str(Path(scratch) / "checkpoints.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = {
+                "pipeline": bench_pipeline(args.runs),
+                "memory": bench_memory(max(1, args.runs // 4)),
+                "throughput": bench_throughput(args.runs * 5, args.threads, args.concurrency),
+                "batch_scoring": bench_batch_scoring(args.rows),
+                "profiles": bench_profiles(args.rows[-1]),
+                "stations": bench_stations(args.rows[-1]),
+                "replay": bench_replay(args.replay_frames),
+                "history": bench_history(args.history_rows, queries=max(5, args.runs)),
+                "observations": bench_observations(args.history_rows),
+                "api": bench_api(args.runs * 250, concurrency=10),
+            }
+        provider_requests = dict(stubs.requests)
+
+    report = {
+        "commit": commit,
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "config": {"latency": latency, "error_rate": error_rate, "runs": args.runs},
+        "provider_requests": provider_requests,
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+
+    e2e = results["pipeline"]["end_to_end"]
+    print(f"end-to-end p50 {e2e['p50_ms']:.0f} ms, p95 {e2e['p95_ms']:.0f} ms")
+    print(f"report written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""Local stand-ins for OpenWeather, AirNow (API and hourly files) and the OpenAI chat API.
+
+One threaded HTTP server answers all three providers with canned but
+realistic payloads. Each provider has its own simulated latency and error
+rate so benchmarks can model slow or flaky upstreams:
+
+    with StubProviders(latency={"openai": 0.5}, error_rate={"airnow": 0.1}) as stubs:
+        stubs.configure_environment()
+        ...
+"""
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+PROVIDERS = ("openweather", "airnow", "openai")
+
+BRIEFING = (
+    "Good morning, Boston! Mild and clear with good air quality. "
+    "Great day for a walk or bike commute. Stay hydrated and enjoy the sunshine."
+)
+
+def weather_payload() -> dict:
+    return {
+        "dt": int(time.time()),
+        "main": {"temp": 68.2, "feels_like": 67.5, "humidity": 55, "pressure": 1015},
+        "wind": {"speed": 8.1},
+        "weather": [{"main": "Clear", "description": "clear sky"}],
+        "clouds": {"all": 5},
+        "visibility": 10000,
+    }
+
+def forecast_payload() -> dict:
+    # Five days of 3-hourly steps, like OpenWeather's free /forecast endpoint.
+    start = int(time.time()) // 10800 * 10800 + 10800
+    return {"city": {"name": "Boston", "timezone": -14400}, "list": [
+        {
+            "dt": start + step * 10800,
+            "main": {"temp": 64 + 6 * (step % 8 in (4, 5)), "feels_like": 63 + 6 * (step % 8 in (4, 5)),
+                     "humidity": 60, "pressure": 1014},
+            "wind": {"speed": 6.0 + step % 3},
+            "weather": [{"main": "Clouds", "description": "scattered clouds"}],
+            "clouds": {"all": 40},
+            "visibility": 10000,
+        }
+        for step in range(40)
+    ]}
+
+def airnow_forecast_payload() -> list:
+    today = time.strftime("%Y-%m-%d")
+    tomorrow = time.strftime("%Y-%m-%d", time.localtime(time.time() + 86400))
+    return [
+        {"DateForecast": f"{day} ", "AQI": aqi, "ParameterName": pollutant,
+         "Category": {"Number": 1, "Name": "Good"}, "ReportingArea": "Boston"}
+        for day in (today, tomorrow) for pollutant, aqi in (("O3", 38), ("PM2.5", 45))
+    ]
+
+def airnow_payload() -> list:
+    return [
+        {"AQI": 34, "ParameterName": "O3", "Category": {"Number": 1, "Name": "Good"}, "ReportingArea": "Boston"},
+        {"AQI": 41, "ParameterName": "PM2.5", "Category": {"Number": 1, "Name": "Good"}, "ReportingArea": "Boston"},
+    ]
+
+HOURLY_OBS_HEADER = (
+    "AQSID", "SiteName", "Status", "EPARegion", "Latitude", "Longitude", "Elevation", "GMTOffset", "CountryCode",
+    "StateName", "ValidDate", "ValidTime", "DataSource", "ReportingArea_PipeDelimited", "OZONE_AQI", "PM10_AQI",
+    "PM25_AQI", "NO2_AQI", "Ozone_Measured", "PM10_Measured", "PM25_Measured", "NO2_Measured",
+)
+
+def hourly_obs_file(stations: int = 2500, seed: int = 0) -> str:
+    """An HourlyAQObs file with ``stations`` sites spread over the contiguous US."""
+    rng = random.Random(seed)
+    valid_date, valid_time = time.strftime("%m/%d/%y"), time.strftime("%H:00")
+    lines = [",".join(f'"{name}"' for name in HOURLY_OBS_HEADER)]
+    for i in range(stations):
+        ozone, pm10, pm25, no2 = (rng.choice(["", str(rng.randint(0, 160))]) for _ in range(4))
+        pm25 = pm25 or str(rng.randint(0, 160))
+        lines.append(",".join(f'"{value}"' for value in (
+            f"{840000000 + i:09d}", f"Site {i}", "Active", "R1", f"{rng.uniform(25, 49):.4f}",
+            f"{rng.uniform(-124, -67):.4f}", "10", "-5", "US", "XX", valid_date, valid_time, "Stub",
+            f"Area {i // 4}|Region", ozone, pm10, pm25, no2, "1", "1", "1", "1",
+        )))
+    return "\n".join(lines) + "\n"
+
+def chat_completion_payload(model: str) -> dict:
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": BRIEFING}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 80, "completion_tokens": 30, "total_tokens": 110},
+    }
+
+def chat_completion_chunks(model: str):
+    base = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+    yield {**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]}
+    for word in BRIEFING.split(" "):
+        yield {**base, "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}]}
+    yield {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+    yield {**base, "choices": [], "usage": {"prompt_tokens": 80, "completion_tokens": 30, "total_tokens": 110}}
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 makes bursts of concurrent runs wait on SYN retransmits.
+    request_queue_size = 1024
+
+@dataclass
+class StubProviders:
+    """Background HTTP server mimicking the three providers."""
+    latency: dict = field(default_factory=dict)
+    error_rate: dict = field(default_factory=dict)
+    seed: int = 0
+
+    def __post_init__(self):
+        self.requests = {provider: 0 for provider in PROVIDERS}
+        self._random = random.Random(self.seed)
+        self.hourly_obs = hourly_obs_file(seed=self.seed)
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def configure_environment(self):
+        """Points the app's provider settings at this server. Call before importing src."""
+        os.environ.update({
+            "OPENWEATHER_BASE_URL": f"{self.url}/data/2.5",
+            "AIRNOW_BASE_URL": f"{self.url}/aq",
+            "AIRNOW_FILES_URL": f"{self.url}/airnow",
+            "OPENAI_BASE_URL": f"{self.url}/v1",
+            "OPENWEATHER_API_KEY": "stub",
+            "AIRNOW_API_KEY": "stub",
+            "OPENAI_API_KEY": "stub",
+        })
+
+    def start(self) -> "StubProviders":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _admit(self, provider: str) -> bool:
+        """Counts the request, applies latency and decides whether to inject an error."""
+        with self._lock:
+            self.requests[provider] += 1
+            failed = self._random.random() < self.error_rate.get(provider, 0.0)
+        time.sleep(self.latency.get(provider, 0.0))
+        return not failed
+
+    def _handler(self):
+        stubs = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                path = urlparse(self.path).path
+                if path.endswith("/weather"):
+                    self._respond("openweather", weather_payload)
+                elif path.endswith("/forecast"):
+                    self._respond("openweather", forecast_payload)
+                elif path.endswith("/observation/latLong/current/"):
+                    self._respond("airnow", airnow_payload)
+                elif path.endswith("/forecast/latLong/"):
+                    self._respond("airnow", airnow_forecast_payload)
+                elif "/HourlyAQObs_" in path:
+                    if stubs._admit("airnow"):
+                        self._send_text(200, stubs.hourly_obs)
+                    else:
+                        self._send_json(503, {"error": "injected failure"})
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if not urlparse(self.path).path.endswith("/chat/completions"):
+                    self._send_json(404, {"error": "not found"})
+                    return
+                model = body.get("model", "gpt-4o-mini")
+                if not stubs._admit("openai"):
+                    self._send_json(503, {"error": {"message": "injected failure"}})
+                elif body.get("stream"):
+                    self._send_stream(chat_completion_chunks(model))
+                else:
+                    self._send_json(200, chat_completion_payload(model))
+
+            def _respond(self, provider, payload):
+                if stubs._admit(provider):
+                    self._send_json(200, payload())
+                else:
+                    self._send_json(503, {"error": "injected failure"})
+
+            def _send_json(self, status, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_text(self, status, text):
+                data = text.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, chunks):
+                data = b"".join(f"data: {json.dumps(chunk)}\n\n".encode() for chunk in chunks) + b"data: [DONE]\n\n"
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
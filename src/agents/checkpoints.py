@@ -0,0 +1,110 @@
+"""Local SQLite checkpoints for graph runs.
+
+Every completed node is saved under the run's ``run_id`` (the LangGraph
+thread id), so a run that fails in a later node - typically draft_briefing on
+an LLM timeout - can be resumed without collecting and scoring again. See
+src.agents.graph for how runs are started, resumed and cleaned up. Runs that
+are never retried are pruned once they are too old to resume.
+"""
+import asyncio
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
+from src.config import CHECKPOINT_DB, RESUME_MAX_AGE
+
+# Types a state may hold besides builtins and messages; anything else is refused on load.
+STATE_TYPES = [
+    ("src.config", "Location"),
+    ("src.agents.state", "AgentPhase"),
+    ("src.data_ingestion.weather_client", "WeatherData"),
+    ("src.data_ingestion.weather_client", "WeatherForecast"),
+    ("src.data_ingestion.airquality_client", "AirQualityData"),
+    ("src.data_ingestion.airquality_client", "AirQualityForecast"),
+    ("src.scoring.risk_calculator", "RiskLevel"),
+    ("src.scoring.risk_calculator", "Concern"),
+    ("src.scoring.risk_calculator", "RiskAssessment"),
+    ("src.scoring.action_generator", "ActionPlan"),
+    ("src.scoring.forecast", "RiskForecast"),
+    ("src.scoring.forecast", "OutdoorWindow"),
+]
+
+_saver = None
+_lock = threading.Lock()
+
+class ThreadedSqliteSaver(SqliteSaver):
+    """SqliteSaver whose async methods run the sync ones in a worker thread.
+
+    AsyncSqliteSaver ties its connection to one event loop and keeps the
+    process alive until it is closed. The API, scheduler and benchmarks start
+    loops of their own, so they all share this one thread-safe connection.
+    """
+
+    def __init__(self, conn, *, serde=None, max_age: float = RESUME_MAX_AGE):
+        super().__init__(conn, serde=serde)
+        self.max_age = max_age
+        self._pruned_at = 0.0
+
+    def prune_expired(self, force: bool = False) -> int:
+        """Deletes every thread without a checkpoint in the last ``max_age`` seconds and returns how many.
+
+        Such runs can no longer resume. Runs at most once per ``max_age`` unless forced.
+        """
+        now = time.time()
+        if not force and now - self._pruned_at < self.max_age:
+            return 0
+        self._pruned_at = now
+        with self.cursor(transaction=False) as cur:
+            latest = cur.execute(
+                "SELECT thread_id, type, checkpoint FROM checkpoints c WHERE checkpoint_ns = '' AND checkpoint_id = "
+                "(SELECT MAX(checkpoint_id) FROM checkpoints WHERE thread_id = c.thread_id AND checkpoint_ns = '')"
+            ).fetchall()
+        expired = [
+            thread_id for thread_id, type_, blob in latest
+            if now - datetime.fromisoformat(self.serde.loads_typed((type_, blob))["ts"]).timestamp() > self.max_age
+        ]
+        for thread_id in expired:
+            self.delete_thread(thread_id)
+        return len(expired)
+
+    async def aprune_expired(self, force: bool = False) -> int:
+        return await asyncio.to_thread(self.prune_expired, force)
+
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        items = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in items:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id):
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+def open_checkpointer(path) -> ThreadedSqliteSaver:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    saver = ThreadedSqliteSaver(conn, serde=JsonPlusSerializer(allowed_msgpack_modules=STATE_TYPES))
+    saver.prune_expired()
+    return saver
+
+def get_checkpointer() -> Optional[ThreadedSqliteSaver]:
+    """Process-wide saver on CHECKPOINT_DB, or None when checkpointing is disabled."""
+    global _saver
+    if not CHECKPOINT_DB:
+        return None
+    with _lock:
+        if _saver is None:
+            _saver = open_checkpointer(CHECKPOINT_DB)
+    return _saver
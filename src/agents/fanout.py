@@ -0,0 +1,195 @@
+"""Personalized briefings for many subscribers from one data collection per location.
+
+    python -m src.agents.fanout                    # everyone in SUBSCRIBERS_FILE
+    python -m src.agents.fanout --location Boston
+
+Environment data is collected, scored and trend-checked once per location.
+Every profile in use there is then scored against that shared snapshot in one
+vectorized pass (src.scoring.profiles), and subscribers with the same
+location and profile share one briefing. LLM calls therefore scale with
+distinct (location, profile, conditions) combinations, not with subscribers.
+The remaining prompts go out as one batch with bounded concurrency, paced by
+the process-wide rate limiter (see src.agents.llm). Results are written to the
+history store in bulk.
+"""
+import argparse
+import asyncio
+import csv
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+from src.config import LLM_MAX_CONCURRENCY, LOCATIONS, SUBSCRIBERS_FILE, TEMPLATE_BRIEFING_TYPES, Location
+
+@dataclass(slots=True)
+class Subscriber:
+    id: str
+    location: str
+    profile: str = "general"
+
+@dataclass(slots=True)
+class FanOutResult:
+    # One generic ("general" profile) state per location, as a graph run would produce.
+    states: list[dict] = field(default_factory=list)
+    # One record per subscriber: subscriber, location, profile, timestamp, risk, briefing_text, action_plan.
+    briefings: list[dict] = field(default_factory=list)
+    llm_requests: int = 0
+
+def load_subscribers(path: Path = SUBSCRIBERS_FILE) -> list[Subscriber]:
+    """Reads a CSV with an ``id,location,profile`` header; a missing file means no subscribers."""
+    path = Path(path)
+    if not path.exists():
+        return []
+    with open(path, newline="") as f:
+        return [Subscriber(row["id"], row["location"], row.get("profile") or "general") for row in csv.DictReader(f)]
+
+async def _shared_state(location: Location) -> dict:
+    from src.agents import nodes
+    from src.agents.state import create_initial_state
+
+    state = create_initial_state(location)
+    state.update(await nodes.acollect_data(state))
+    state.update(await nodes.aanalyze_risk(state))
+    check = nodes.check_trends if nodes.should_check_trends(state) == "check_trends" else nodes.skip_trends
+    state.update(check(state))
+    return state
+
+def _variant(state: dict, profile: str, assessment) -> dict:
+    """The shared state as seen by one profile, with its own action plan."""
+    from src.agents import nodes
+
+    assessment.confidence = nodes.adjusted_confidence(assessment.confidence, state["data_quality"])
+    variant = {
+        **state,
+        "profile": profile,
+        "assessment": assessment,
+        "risk_score": assessment.overall_score,
+        "risk_level": assessment.risk_level.value,
+        "confidence": assessment.confidence,
+        "errors": list(state["errors"]),
+    }
+    variant.update(nodes.generate_actions(variant))
+    return variant
+
+async def afan_out(
+    subscribers: list[Subscriber],
+    locations: Optional[list[Location]] = None,
+    history=None,
+    max_concurrency: int = LLM_MAX_CONCURRENCY,
+) -> FanOutResult:
+    """Briefs every subscriber of ``locations`` (default: every configured location with subscribers).
+
+    Each location also gets its generic briefing, so the UI and API keep
+    serving fresh results.
+    """
+    from langchain_core.messages import HumanMessage
+    from src.agents import nodes
+    from src.agents.llm import get_llm, record_usage, token_usage
+    from src.utils.cache import briefing_cache, briefing_history
+
+    if history is None:
+        history = briefing_history
+    by_location = {}
+    for subscriber in subscribers:
+        by_location.setdefault(subscriber.location, []).append(subscriber)
+    if locations is None:
+        locations = [LOCATIONS[name] for name in by_location if name in LOCATIONS]
+    for name in by_location.keys() - {location.name for location in locations} - LOCATIONS.keys():
+        print(f"[fanout] skipping {len(by_location[name])} subscribers at unknown location {name}")
+
+    shared = await asyncio.gather(*(_shared_state(location) for location in locations), return_exceptions=True)
+
+    scorer = nodes.get_profile_scorer()
+    rows = {str(name): i for i, name in enumerate(scorer.names)}
+    variants = {}
+    for location, state in zip(locations, shared):
+        if isinstance(state, Exception):
+            print(f"[fanout] {location.name} failed: {state}")
+            continue
+        batch = scorer.score(state["weather_data"], state["air_quality_data"])
+        profiles = {"general"} | {s.profile for s in by_location.get(location.name, []) if s.profile in rows}
+        for profile in profiles:
+            variants[(location.name, profile)] = _variant(state, profile, batch.at(rows[profile]))
+
+    # Variants whose briefing inputs coincide share one prompt; the briefing cache covers earlier runs.
+    prompts, waiting = {}, {}
+    for variant_key, variant in variants.items():
+        if variant["briefing_type"] in TEMPLATE_BRIEFING_TYPES:
+            variant.update(briefing_text=nodes.get_template_engine().render(variant), token_usage=token_usage(None))
+            continue
+        key = briefing_cache.fingerprint(variant)
+        cached = briefing_cache.get(key)
+        if cached is not None:
+            variant.update(briefing_text=cached, token_usage=token_usage(None))
+        else:
+            prompts.setdefault(key, nodes.briefing_prompt(variant))
+            waiting[variant_key] = key
+
+    keys = list(prompts)
+    generated = {}
+    if keys:
+        responses = await get_llm().abatch(
+            [[HumanMessage(content=prompts[key])] for key in keys],
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=True,
+        )
+        for key, response in zip(keys, responses):
+            if isinstance(response, Exception):
+                generated[key] = (None, response)
+            else:
+                briefing_cache.put(key, response.content)
+                generated[key] = (response.content, record_usage(response))
+
+    for variant_key, key in waiting.items():
+        variant = variants[variant_key]
+        text, outcome = generated[key]
+        if text is None:
+            variant["errors"].append(f"Briefing error: {outcome}")
+            variant.update(briefing_text=nodes.get_template_engine().render(variant), token_usage=token_usage(None))
+        else:
+            variant.update(briefing_text=text, token_usage=outcome)
+    for variant in variants.values():
+        variant["phase"] = "complete"
+
+    result = FanOutResult(llm_requests=len(keys))
+    for location in locations:
+        general = variants.get((location.name, "general"))
+        if general is None:
+            continue
+        result.states.append(general)
+        for subscriber in by_location.get(location.name, []):
+            variant = variants.get((location.name, subscriber.profile))
+            if variant is None:
+                print(f"[fanout] unknown profile {subscriber.profile!r} for subscriber {subscriber.id}")
+                continue
+            result.briefings.append({
+                "subscriber": subscriber.id,
+                "location": location.name,
+                "profile": subscriber.profile,
+                "timestamp": variant["timestamp"],
+                "risk_score": variant["risk_score"],
+                "risk_level": variant["risk_level"],
+                "briefing_text": variant["briefing_text"],
+                "action_plan": variant["action_plan"],
+            })
+
+    if result.states:
+        history.save_many(result.states)
+    if result.briefings:
+        history.save_subscriber_briefings(result.briefings)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=Path, default=SUBSCRIBERS_FILE, help="CSV with id,location,profile")
+    parser.add_argument("--location", action="append", choices=list(LOCATIONS), help="limit to these locations")
+    args = parser.parse_args()
+
+    subscribers = load_subscribers(args.subscribers)
+    locations = [LOCATIONS[name] for name in args.location] if args.location else None
+    result = asyncio.run(afan_out(subscribers, locations))
+    for state in result.states:
+        print(f"[fanout] {state['location'].name}: {state['risk_level']} ({state['risk_score']:.0f}/100)")
+    print(f"[fanout] {len(result.briefings)} subscriber briefings from {result.llm_requests} LLM requests")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
-from langgraph.graph import StateGraph, END
-from src.agents.state import UrbanHealthState, create_initial_state
-from src.agents.nodes import (
-    collect_data, analyze_risk, check_trends, skip_trends,
-    generate_actions, draft_briefing, should_check_trends
-)
-
-def build_health_guardian_graph():
+import asyncio
+import inspect
+import time
+import weakref
+from datetime import datetime
+from functools import lru_cache, wraps
+from typing import Optional
+
+# langgraph, the nodes and their clients are imported inside the functions below
+# so that importing this module does not pay for them until a graph is needed.
+
+def build_health_guardian_graph(use_async: bool = False, checkpointer=None):
     """
     Graph Structure:
     
@@ -18,22 +22,45 @@ def build_health_guardian_graph():
                                [draft_briefing]
                                           ↓
                                         [END]
+
+    With ``use_async`` the graph is built from the async node variants and must
+    be driven with ``ainvoke``. With a ``checkpointer`` every completed node
+    is saved under the run's thread id (see run_config).
     """
+    from langgraph.graph import StateGraph, END
+    from src.agents.state import UrbanHealthState
+    from src.agents import nodes
+
+    if use_async:
+        node_map = {
+            "collect_data": nodes.acollect_data,
+            "analyze_risk": nodes.aanalyze_risk,
+            "check_trends": nodes.acheck_trends,
+            "skip_trends": nodes.askip_trends,
+            "generate_actions": nodes.agenerate_actions,
+            "draft_briefing": nodes.adraft_briefing,
+        }
+    else:
+        node_map = {
+            "collect_data": nodes.collect_data,
+            "analyze_risk": nodes.analyze_risk,
+            "check_trends": nodes.check_trends,
+            "skip_trends": nodes.skip_trends,
+            "generate_actions": nodes.generate_actions,
+            "draft_briefing": nodes.draft_briefing,
+        }
+
     graph = StateGraph(UrbanHealthState)
     
-    graph.add_node("collect_data", collect_data)
-    graph.add_node("analyze_risk", analyze_risk)
-    graph.add_node("check_trends", check_trends)
-    graph.add_node("skip_trends", skip_trends)
-    graph.add_node("generate_actions", generate_actions)
-    graph.add_node("draft_briefing", draft_briefing)
+    for name, node in node_map.items():
+        graph.add_node(name, _timed(name, node))
     
     graph.set_entry_point("collect_data")
     graph.add_edge("collect_data", "analyze_risk")
     
     graph.add_conditional_edges(
         "analyze_risk",
-        should_check_trends,
+        nodes.should_check_trends,
         {"check_trends": "check_trends", "skip_trends": "skip_trends"}
     )
     
@@ -42,19 +69,121 @@ def build_health_guardian_graph():
     graph.add_edge("generate_actions", "draft_briefing")
     graph.add_edge("draft_briefing", END)
     
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
+
+def _timed(name: str, node):
+    """Wraps a node to record its latency and failures."""
+    from src.utils.metrics import NODE_LATENCY, NODE_ERRORS
+
+    if inspect.iscoroutinefunction(node):
+        @wraps(node)
+        async def async_wrapper(state):
+            start = time.perf_counter()
+            try:
+                return await node(state)
+            except Exception:
+                NODE_ERRORS.inc(node=name)
+                raise
+            finally:
+                NODE_LATENCY.observe(time.perf_counter() - start, node=name)
+        return async_wrapper
+
+    @wraps(node)
+    def wrapper(state):
+        start = time.perf_counter()
+        try:
+            return node(state)
+        except Exception:
+            NODE_ERRORS.inc(node=name)
+            raise
+        finally:
+            NODE_LATENCY.observe(time.perf_counter() - start, node=name)
+    return wrapper
+
+@lru_cache(maxsize=None)
+def get_agent(use_async: bool = False):
+    """Compiled graph, built on first use and shared afterwards."""
+    from src.agents.checkpoints import get_checkpointer
+
+    return build_health_guardian_graph(use_async=use_async, checkpointer=get_checkpointer())
+
+def run_config(run_id: str) -> dict:
+    return {"configurable": {"thread_id": run_id}}
+
+def _resumable(snapshot) -> bool:
+    """True if the checkpointed run stopped before END and is recent enough to finish."""
+    from src.config import RESUME_MAX_AGE
+
+    started = snapshot.values.get("timestamp")
+    return bool(snapshot.next) and started is not None and (datetime.now() - started).total_seconds() <= RESUME_MAX_AGE
+
+def prepare_run(agent, run_id: Optional[str] = None, location=None) -> tuple[Optional[dict], str]:
+    """Graph input and run id. The input is None when an unfinished ``run_id`` resumes from
+    its last completed node; a new or expired one starts from a fresh state. Abandoned runs
+    of any id are pruned along the way."""
+    from src.agents.state import create_initial_state
+
+    if agent.checkpointer is not None:
+        agent.checkpointer.prune_expired()
+    if run_id is not None and agent.checkpointer is not None:
+        snapshot = agent.get_state(run_config(run_id))
+        if _resumable(snapshot):
+            print(f"Resuming run {run_id} at {', '.join(snapshot.next)}")
+            return None, run_id
+        agent.checkpointer.delete_thread(run_id)
+    state = create_initial_state(location, run_id)
+    return state, state["run_id"]
+
+async def aprepare_run(agent, run_id: Optional[str] = None, location=None) -> tuple[Optional[dict], str]:
+    from src.agents.state import create_initial_state
+
+    if agent.checkpointer is not None:
+        await agent.checkpointer.aprune_expired()
+    if run_id is not None and agent.checkpointer is not None:
+        snapshot = await agent.aget_state(run_config(run_id))
+        if _resumable(snapshot):
+            print(f"Resuming run {run_id} at {', '.join(snapshot.next)}")
+            return None, run_id
+        await agent.checkpointer.adelete_thread(run_id)
+    state = create_initial_state(location, run_id)
+    return state, state["run_id"]
 
-health_guardian_agent = build_health_guardian_graph()
+def finish_run(agent, run_id: str):
+    """Drops a completed run's checkpoints; only unfinished runs are worth keeping."""
+    if agent.checkpointer is not None:
+        agent.checkpointer.delete_thread(run_id)
 
-def run_health_guardian() -> dict:
-    """Run the agent and return final state."""
-    initial_state = create_initial_state()
+async def afinish_run(agent, run_id: str):
+    if agent.checkpointer is not None:
+        await agent.checkpointer.adelete_thread(run_id)
+
+_run_limiters = weakref.WeakKeyDictionary()
+
+def _default_limiter() -> asyncio.Semaphore:
+    from src.config import MAX_CONCURRENT_RUNS
+
+    loop = asyncio.get_running_loop()
+    limiter = _run_limiters.get(loop)
+    if limiter is None:
+        limiter = asyncio.Semaphore(MAX_CONCURRENT_RUNS)
+        _run_limiters[loop] = limiter
+    return limiter
+
+def run_health_guardian(location=None, run_id: Optional[str] = None) -> dict:
+    """Run the agent and return final state.
+
+    Passing the ``run_id`` of a failed or interrupted run resumes it from its
+    last completed node instead of starting over.
+    """
+    agent = get_agent()
+    initial_state, run_id = prepare_run(agent, run_id, location)
     print(f"\n{'='*50}")
     print(f"Running Urban Health Guardian")
-    print(f"   Run ID: {initial_state['run_id']}")
+    print(f"   Run ID: {run_id}")
     print(f"{'='*50}\n")
     
-    final_state = health_guardian_agent.invoke(initial_state)
+    final_state = agent.invoke(initial_state, run_config(run_id))
+    finish_run(agent, run_id)
     
     print(f"\n{'='*50}")
     print(f"Complete!")
@@ -62,7 +191,66 @@ def run_health_guardian() -> dict:
     
     return final_state
 
+class BriefingStream:
+    """Runs the agent and iterates over briefing tokens as the LLM emits them.
+
+    Suitable for ``st.write_stream``. The final state is available on ``state``
+    once iteration finishes. Cached or non-LLM briefings arrive as one chunk.
+    A ``run_id`` that failed or was interrupted earlier is resumed.
+    """
+
+    def __init__(self, location=None, run_id: Optional[str] = None):
+        self.location = location
+        self.run_id = run_id
+        self.state = None
+
+    def __iter__(self):
+        agent = get_agent()
+        initial_state, self.run_id = prepare_run(agent, self.run_id, self.location)
+        print(f"Running Urban Health Guardian (streaming) - Run ID: {self.run_id}")
+        streamed = False
+        stream = agent.stream(initial_state, run_config(self.run_id), stream_mode=["messages", "values"])
+        for mode, payload in stream:
+            if mode == "values":
+                self.state = payload
+                continue
+            chunk, metadata = payload
+            if metadata.get("langgraph_node") == "draft_briefing" and chunk.content:
+                streamed = True
+                yield chunk.content
+        finish_run(agent, self.run_id)
+        if not streamed and self.state and self.state.get("briefing_text"):
+            yield self.state["briefing_text"]
+
+async def arun_health_guardian(
+    limiter: Optional[asyncio.Semaphore] = None, location=None, run_id: Optional[str] = None,
+) -> dict:
+    """Run the agent on the current event loop and return final state.
+
+    At most MAX_CONCURRENT_RUNS runs execute at once per loop unless a custom
+    ``limiter`` is supplied. An unfinished ``run_id`` is resumed as in
+    run_health_guardian.
+    """
+    agent = get_agent(use_async=True)
+    async with limiter or _default_limiter():
+        initial_state, run_id = await aprepare_run(agent, run_id, location)
+        print(f"Running Urban Health Guardian (async) - Run ID: {run_id}")
+        state = await agent.ainvoke(initial_state, run_config(run_id))
+        await afinish_run(agent, run_id)
+        return state
+
+async def arun_many(count: int, max_concurrency: Optional[int] = None) -> list:
+    """Run ``count`` agents concurrently; failed runs are returned as exceptions."""
+    if max_concurrency is None:
+        from src.config import MAX_CONCURRENT_RUNS
+        max_concurrency = MAX_CONCURRENT_RUNS
+    limiter = asyncio.Semaphore(max_concurrency)
+    return await asyncio.gather(
+        *(arun_health_guardian(limiter) for _ in range(count)),
+        return_exceptions=True,
+    )
+
 if __name__ == "__main__":
     result = run_health_guardian()
     print("BRIEFING:")
-    print(result.get("briefing_text"))
\ No newline at end of file
+    print(result.get("briefing_text"))
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import weakref
+from src.config import api_config, OPENAI_BASE_URL, LLM_TIMEOUT, LLM_REQUESTS_PER_SECOND
+
+BRIEFING_MODEL = "gpt-4o-mini"
+
+_clients = {}
+_loop_clients = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+_rate_limiter = None
+
+def get_llm(model: str = BRIEFING_MODEL):
+    """Process-wide chat client so runs share one connection pool instead of building a client per call.
+
+    Async callers get a client per event loop, because the async connection
+    pool cannot outlive the loop that created it.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    with _lock:
+        clients = _clients if loop is None else _loop_clients.setdefault(loop, {})
+        llm = clients.get(model)
+        if llm is None:
+            llm = _build_llm(model, use_loop_client=loop is not None)
+            clients[model] = llm
+    return llm
+
+def _build_llm(model: str, use_loop_client: bool):
+    from langchain_openai import ChatOpenAI
+    from src.data_ingestion.http import get_async_client
+
+    return ChatOpenAI(
+        model=model,
+        api_key=api_config.openai_api_key,
+        base_url=OPENAI_BASE_URL,
+        stream_usage=True,
+        timeout=LLM_TIMEOUT,
+        max_retries=2,
+        http_async_client=get_async_client() if use_loop_client else None,
+        rate_limiter=get_rate_limiter(),
+    )
+
+def get_rate_limiter():
+    """Token bucket shared by every chat client in the process, or None when unpaced."""
+    global _rate_limiter
+    if LLM_REQUESTS_PER_SECOND <= 0:
+        return None
+    if _rate_limiter is None:
+        from langchain_core.rate_limiters import InMemoryRateLimiter
+
+        _rate_limiter = InMemoryRateLimiter(
+            requests_per_second=LLM_REQUESTS_PER_SECOND,
+            check_every_n_seconds=0.05,
+            max_bucket_size=max(1, LLM_REQUESTS_PER_SECOND),
+        )
+    return _rate_limiter
+
+def token_usage(response) -> dict:
+    """Token counts reported by the provider, zeros when unavailable."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    return {
+        "input_tokens": usage.get("input_tokens", 0),
+        "output_tokens": usage.get("output_tokens", 0),
+        "total_tokens": usage.get("total_tokens", 0),
+    }
+
+def record_usage(response) -> dict:
+    """token_usage() for a live LLM response, also counted in the metrics registry."""
+    from src.utils.metrics import LLM_TOKENS
+
+    usage = token_usage(response)
+    LLM_TOKENS.inc(usage["input_tokens"], direction="input")
+    LLM_TOKENS.inc(usage["output_tokens"], direction="output")
+    return usage
@@ -1,45 +1,90 @@
-from langchain_openai import ChatOpenAI
+from functools import lru_cache
 from langchain_core.messages import SystemMessage, HumanMessage
+from src.agents.llm import get_llm, token_usage, record_usage
 from src.data_ingestion.weather_client import WeatherClient
 from src.data_ingestion.airquality_client import AirQualityClient
+from src.data_ingestion.collector import DataCollector, Provider
 from src.scoring.risk_calculator import RiskCalculator
 from src.scoring.action_generator import ActionGenerator
-from src.config import api_config
+from src.scoring.briefing_template import TemplateBriefingEngine
+from src.scoring.forecast import ForecastScorer, describe_windows
+from src.scoring.profiles import PROFILES, ProfileScorer
+from src.scoring.trends import TrendDetector
+from src.config import TEMPLATE_BRIEFING_TYPES, COLLECT_TIME_BUDGET, COLLECT_SOFT_DEADLINE
+from src.utils.cache import briefing_cache
+from src.utils.retry import time_budget
 
-weather_client = WeatherClient()
-aqi_client = AirQualityClient()
-calculator = RiskCalculator()
-generator = ActionGenerator()
+# Shared components are built on first use so importing this module stays cheap.
+@lru_cache(maxsize=None)
+def get_collector() -> DataCollector:
+    weather_client = WeatherClient()
+    aqi_client = AirQualityClient()
+    return DataCollector([
+        Provider("weather", "Weather", weather_client.get_current_weather, weather_client.aget_current_weather),
+        Provider("aqi", "AQI", aqi_client.get_current_aqi, aqi_client.aget_current_aqi),
+        Provider("weather_forecast", "Weather forecast", weather_client.get_forecast, weather_client.aget_forecast),
+        Provider("aqi_forecast", "AQI forecast", aqi_client.get_forecast, aqi_client.aget_forecast),
+    ])
+
+@lru_cache(maxsize=None)
+def get_calculator() -> RiskCalculator:
+    return RiskCalculator()
+
+@lru_cache(maxsize=None)
+def get_forecast_scorer() -> ForecastScorer:
+    return ForecastScorer(get_calculator())
+
+@lru_cache(maxsize=None)
+def get_profile_scorer() -> ProfileScorer:
+    return ProfileScorer(list(PROFILES.values()))
+
+@lru_cache(maxsize=None)
+def get_generator() -> ActionGenerator:
+    return ActionGenerator()
+
+@lru_cache(maxsize=None)
+def get_trend_detector() -> TrendDetector:
+    return TrendDetector()
+
+@lru_cache(maxsize=None)
+def get_template_engine() -> TemplateBriefingEngine:
+    return TemplateBriefingEngine()
 
 def collect_data(state):
     """Node: Collect environmental data."""
     print(f"[{state['run_id']}] Collecting data...")
+    with time_budget(COLLECT_TIME_BUDGET):
+        results, fetch_errors = get_collector().collect(*_coordinates(state), soft_deadline=COLLECT_SOFT_DEADLINE)
+    return _collected(state, results, fetch_errors)
+
+async def acollect_data(state):
+    """Async node: Collect environmental data."""
+    print(f"[{state['run_id']}] Collecting data...")
+    with time_budget(COLLECT_TIME_BUDGET):
+        results, fetch_errors = await get_collector().acollect(*_coordinates(state), soft_deadline=COLLECT_SOFT_DEADLINE)
+    return _collected(state, results, fetch_errors)
+
+def _coordinates(state) -> tuple:
+    location = state.get("location")
+    return (location.lat, location.lon) if location else ()
+
+# Current conditions drive the score and data completeness; forecasts only add the hourly curve.
+CURRENT_SOURCES = ("weather", "aqi")
+
+def _collected(state, results, fetch_errors):
     errors = list(state.get("errors", []))
-    weather_data = None
-    aqi_data = None
-    
-    try:
-        weather = weather_client.get_current_weather()
-        if weather:
-            weather_data = weather.model_dump()
-    except Exception as e:
-        errors.append(f"Weather error: {e}")
+    errors.extend(fetch_errors)
     
-    try:
-        aqi = aqi_client.get_current_aqi()
-        if aqi:
-            aqi_data = aqi.model_dump()
-    except Exception as e:
-        errors.append(f"AQI error: {e}")
-    
-    sources_available = sum([weather_data is not None, aqi_data is not None])
-    completeness = sources_available / 2
+    missing_sources = [key for key in CURRENT_SOURCES if results.get(key) is None]
+    completeness = 1 - len(missing_sources) / len(CURRENT_SOURCES)
     
     return {
         "phase": "collecting_data",
-        "weather_data": weather_data,
-        "air_quality_data": aqi_data,
-        "data_quality": {"completeness": completeness},
+        "weather_data": results.get("weather"),
+        "air_quality_data": results.get("aqi"),
+        "weather_forecast": results.get("weather_forecast"),
+        "aqi_forecast": results.get("aqi_forecast"),
+        "data_quality": {"completeness": completeness, "missing_sources": missing_sources},
         "errors": errors,
     }
 
@@ -47,62 +92,84 @@ def analyze_risk(state):
     """Node: Calculate risk score."""
     print(f"{state['run_id']} Analyzing risk...")
 
-    from src.data_ingestion.weather_client import WeatherData
-    from src.data_ingestion.airquality_client import AirQualityData
-
-    weather = WeatherData(**state["weather_data"]) if state.get("weather_data") else None
-    aqi = AirQualityData(**state["air_quality_data"]) if state.get("air_quality_data") else None
-
-    assessment = calculator.calculate(weather, aqi)
+    weather = state.get("weather_data")
+    aqi = state.get("air_quality_data")
+    assessment = get_calculator().calculate(weather, aqi)
+    assessment.confidence = adjusted_confidence(assessment.confidence, state.get("data_quality", {}))
+    errors = state.get("errors", [])
+    try:
+        risk_forecast = get_forecast_scorer().score(
+            state.get("weather_forecast"), state.get("aqi_forecast"), weather, aqi, state.get("timestamp"),
+        )
+    except Exception as e:
+        # The forecast is an add-on; today's score and briefing go ahead without it.
+        risk_forecast = None
+        errors = errors + [f"Forecast error: {e}"]
 
     return {
         "phase": "analyzing_risk",
+        "assessment": assessment,
         "risk_score": assessment.overall_score,
         "risk_level": assessment.risk_level.value,
         "confidence": assessment.confidence,
+        "risk_forecast": risk_forecast,
         "trend_check_needed": assessment.overall_score >= 50,
+        "errors": errors,
     }
 
+def adjusted_confidence(confidence: str, data_quality: dict) -> str:
+    """Caps the calculator's confidence when a source is missing, e.g. weather alone never rates "high"."""
+    if data_quality.get("missing_sources") and confidence == "high":
+        return "medium"
+    return confidence
+
 def check_trends(state):
     """Node: Check for anomalies (optional)."""
     print(f"[{state['run_id']}] Checking trends...")
+    alerts = _update_trends(state)
     return {
         "phase": "checking_trends",
-        "trend_alert": state.get("risk_score", 0) >= 70,
+        "trend_alert": bool(alerts) or state.get("risk_score", 0) >= 70,
+        "trend_alerts": alerts,
     }
 
 def skip_trends(state):
     """Node: Skip trend check for low risk."""
     print(f"[{state['run_id']}] Skipping trend check...")
+    # Still feed the statistics so they stay continuous; alerts are not reported at low risk.
+    _update_trends(state)
     return {
         "phase": "checking_trends",
         "trend_alert": False,
+        "trend_alerts": [],
     }
 
+def _update_trends(state) -> list[str]:
+    weather = state.get("weather_data")
+    aqi = state.get("air_quality_data")
+    # Provider observation times, so a cached reading served to many runs is folded in once.
+    observed = {"feels_like_f": weather.timestamp if weather else None, "aqi": aqi.timestamp if aqi else None}
+    observed["risk_score"] = max((t for t in observed.values() if t), default=None)
+    try:
+        return get_trend_detector().update(_location_name(state), state.get("timestamp"), {
+            "aqi": aqi.primary_aqi if aqi else None,
+            "feels_like_f": weather.feels_like_f if weather else None,
+            "risk_score": state.get("risk_score") if weather or aqi else None,
+        }, observed)
+    except Exception as e:
+        print(f"Trend update failed: {e}")
+        return []
+
 def generate_actions(state):
     """Node: Generate action plan."""
     print(f"[{state['run_id']}] Generating actions...")
 
-    from src.scoring.risk_calculator import RiskAssessment, RiskLevel
-
-    assessment = RiskAssessment(
-        overall_score=state["risk_score"],
-        risk_level=RiskLevel(state["risk_level"]),
-        confidence=state["confidence"],
-        primary_concerns=[],
-    )
-
-    plan = generator.generate(assessment)
+    plan = get_generator().generate(state["assessment"])
     briefing_type = "high_risk" if state["risk_score"] >= 70 else "moderate" if state["risk_score"] >= 40 else "short"
 
     return {
         "phase": "generating_actions",
-        "action_plan": {
-            "summary": plan.summary,
-            "actions": plan.actions,
-            "outdoor_exercise_safe": plan.outdoor_exercise_safe,
-            "mask_recommended": plan.mask_recommended,
-        },
+        "action_plan": plan,
         "briefing_type": briefing_type,
     }
 
@@ -110,35 +177,102 @@ def draft_briefing(state):
     """Node: Generate LLM briefing."""
     print(f"[{state['run_id']}] ✍️ Drafting briefing...")
     
-    llm = ChatOpenAI(model="gpt-4o-mini", api_key=api_config.openai_api_key)
+    if state.get("briefing_type") in TEMPLATE_BRIEFING_TYPES:
+        return _template_briefing(state)
     
+    key = briefing_cache.fingerprint(state)
+    cached = briefing_cache.get(key)
+    if cached is not None:
+        return {"phase": "complete", "briefing_text": cached, "token_usage": token_usage(None)}
+    
+    # When the graph is streamed with stream_mode="messages", this call streams tokens to the caller.
+    response = get_llm().invoke([HumanMessage(content=briefing_prompt(state))])
+    briefing_cache.put(key, response.content)
+    
+    return {
+        "phase": "complete",
+        "briefing_text": response.content,
+        "token_usage": record_usage(response),
+    }
+
+async def adraft_briefing(state):
+    """Async node: Generate LLM briefing."""
+    print(f"[{state['run_id']}] ✍️ Drafting briefing...")
+
+    if state.get("briefing_type") in TEMPLATE_BRIEFING_TYPES:
+        return _template_briefing(state)
+
+    key = briefing_cache.fingerprint(state)
+    cached = briefing_cache.get(key)
+    if cached is not None:
+        return {"phase": "complete", "briefing_text": cached, "token_usage": token_usage(None)}
+
+    response = await get_llm().ainvoke([HumanMessage(content=briefing_prompt(state))])
+    briefing_cache.put(key, response.content)
+
+    return {
+        "phase": "complete",
+        "briefing_text": response.content,
+        "token_usage": record_usage(response),
+    }
+
+def _template_briefing(state):
+    return {
+        "phase": "complete",
+        "briefing_text": get_template_engine().render(state),
+        "token_usage": token_usage(None),
+    }
+
+def briefing_prompt(state) -> str:
     weather_summary = "N/A"
     if state.get("weather_data"):
         w = state["weather_data"]
-        weather_summary = f"{w['temperature_f']}°F, {w['weather_description']}"
+        weather_summary = f"{w.temperature_f}°F, {w.weather_description}"
     
     aqi_summary = "N/A"
     if state.get("air_quality_data"):
         a = state["air_quality_data"]
-        aqi_summary = f"AQI {a['primary_aqi']} ({a['category']})"
+        aqi_summary = f"AQI {a.primary_aqi} ({a.category})"
     
-    prompt = f"""Generate a brief Boston health briefing:
+    return f"""Generate a brief {_location_name(state)} health briefing{_audience(state)}:
     
 Weather: {weather_summary}
 Air Quality: {aqi_summary}
 Risk Score: {state.get('risk_score', 0):.0f}/100 ({state.get('risk_level')})
-
+{_trend_lines(state)}{_window_lines(state)}
 {"HIGH RISK: Be urgent" if state.get('risk_score', 0) >= 70 else "Keep it brief and friendly."}
 Include 2-3 recommendations. Under 100 words."""
 
-    response = llm.invoke([HumanMessage(content=prompt)])
-    
-    return {
-        "phase": "complete",
-        "briefing_text": response.content,
-    }
+def _trend_lines(state) -> str:
+    alerts = state.get("trend_alerts") or []
+    return "".join(f"Trend alert: {alert}\n" for alert in alerts)
+
+def _window_lines(state) -> str:
+    return "".join(f"{line}\n" for line in describe_windows(state.get("risk_forecast")))
+
+def _audience(state) -> str:
+    profile = PROFILES.get(state.get("profile") or "general")
+    return f" for {profile.audience}" if profile and profile.name != "general" else ""
+
+def _location_name(state) -> str:
+    location = state.get("location")
+    return location.name if location else "Boston"
 
 def should_check_trends(state):
     if state.get("trend_check_needed", False):
         return "check_trends"
-    return "skip_trends"
\ No newline at end of file
+    return "skip_trends"
+
+# Scoring and routing nodes are CPU-only and cheap; the async graph runs them inline
+# on the event loop rather than in a worker thread.
+async def aanalyze_risk(state):
+    return analyze_risk(state)
+
+async def acheck_trends(state):
+    return check_trends(state)
+
+async def askip_trends(state):
+    return skip_trends(state)
+
+async def agenerate_actions(state):
+    return generate_actions(state)
@@ -2,6 +2,12 @@ from typing import TypedDict, Optional, Annotated
 from datetime import datetime
 from enum import Enum
 from langgraph.graph.message import add_messages
+from src.config import Location
+from src.data_ingestion.weather_client import WeatherData, WeatherForecast
+from src.data_ingestion.airquality_client import AirQualityData, AirQualityForecast
+from src.scoring.risk_calculator import RiskAssessment
+from src.scoring.action_generator import ActionPlan
+from src.scoring.forecast import RiskForecast
 
 class AgentPhase(str, Enum):
     COLLECTING_DATA = "collecting_data"
@@ -12,45 +18,68 @@ class AgentPhase(str, Enum):
     COMPLETE = "complete"
 
 class UrbanHealthState(TypedDict):
+    """Nodes pass the typed objects below to each other as-is; src.utils.records.to_record
+    turns a state into plain data where it is persisted or served."""
     run_id: str
     timestamp: datetime
+    location: Location
+    profile: str  # a src.scoring.profiles name; graph runs use "general"
     phase: AgentPhase
 
-    weather_data: Optional[dict]
-    air_quality_data: Optional[dict]
+    weather_data: Optional[WeatherData]
+    air_quality_data: Optional[AirQualityData]
+    weather_forecast: Optional[WeatherForecast]
+    aqi_forecast: Optional[AirQualityForecast]
     data_quality: dict
 
+    assessment: Optional[RiskAssessment]
     risk_score: float
     risk_level: str
     confidence: str
+    risk_forecast: Optional[RiskForecast]
 
     trend_check_needed: bool
     trend_alert: bool
+    trend_alerts: list[str]
 
-    action_plan: Optional[dict]
+    action_plan: Optional[ActionPlan]
     briefing_text: str
     briefing_type: str
+    token_usage: dict
 
     errors: list[str]
     messages: Annotated[list, add_messages]
 
-def create_initial_state() -> UrbanHealthState:
+def new_run_id() -> str:
     import uuid
+    return str(uuid.uuid4())[:8]
+
+def create_initial_state(location=None, run_id=None) -> UrbanHealthState:
+    """``location`` is a config.Location; defaults to the first configured location."""
+    from src.config import DEFAULT_LOCATION
     return UrbanHealthState(
-        run_id=str(uuid.uuid4())[:8],
+        run_id=run_id or new_run_id(),
         timestamp=datetime.now(),
+        location=location or DEFAULT_LOCATION,
+        profile="general",
         phase=AgentPhase.COLLECTING_DATA,
         weather_data=None,
         air_quality_data=None,
+        weather_forecast=None,
+        aqi_forecast=None,
         data_quality={},
+        assessment=None,
         risk_score=0.0,
         risk_level="unknown",
         confidence="unknown",
+        risk_forecast=None,
         trend_check_needed=False,
         trend_alert=False,
+        trend_alerts=[],
         action_plan=None,
         briefing_text="",
         briefing_type="short",
+        token_usage={},
         errors=[],
         messages=[],
     )
\ No newline at end of file
@@ -0,0 +1,241 @@
+"""HTTP API for risk scores, briefings and history.
+
+    python -m src.api                        # uvicorn on API_HOST:API_PORT
+    GET /risk?location=Boston                # or ?lat=42.36&lon=-71.06
+    GET /briefing?location=Boston            # configured locations only
+    GET /history?days=7&location=Boston
+    GET /metrics                             # Prometheus text format
+
+Risk scores are computed once per location and RISK_BUCKET_SECONDS bucket:
+concurrent identical requests share one computation and later ones are
+served from the encoded response until the bucket ends. Briefings come from
+the history store (see src.scheduler) and only run the graph when the stored
+one is older than the location's cadence. That run may call the LLM and is
+persisted, so briefings are limited to the configured LOCATIONS; arbitrary
+coordinates are served by /risk only. Responses carry Cache-Control and ETag
+headers; a matching If-None-Match gets a 304. Each risk response also scores
+the same snapshot for every profile in src.scoring.profiles.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from src.config import API_HOST, API_PORT, CACHE_COORD_PRECISION, LOCATIONS, RISK_BUCKET_SECONDS, Location
+from src.utils.metrics import CACHE_REQUESTS
+from src.utils.records import to_record
+from src.utils.singleflight import AsyncSingleFlight
+
+class APIError(Exception):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+class _Encoded:
+    """A response body encoded once and reused until it expires."""
+
+    __slots__ = ("body", "etag", "expires_at")
+
+    def __init__(self, payload: dict, expires_at: float):
+        self.body = json.dumps(payload, default=str).encode()
+        self.etag = '"' + hashlib.blake2b(self.body, digest_size=8).hexdigest() + '"'
+        self.expires_at = expires_at
+
+class RiskService:
+    """Computes and caches the API's responses; one instance per app."""
+
+    def __init__(self, history=None, bucket_seconds: int = RISK_BUCKET_SECONDS, max_entries: int = 1024):
+        if history is None:
+            from src.utils.cache import briefing_history
+            history = briefing_history
+        self.history = history
+        self.bucket_seconds = bucket_seconds
+        self.max_entries = max_entries
+        self._responses = OrderedDict()
+        self._flights = AsyncSingleFlight()
+        self._failed_runs = OrderedDict()  # location name -> run id to resume on the next attempt
+
+    @staticmethod
+    def resolve_location(params, coordinates: bool = True) -> Location:
+        """A configured location by name, or with ``coordinates`` an ad-hoc one from lat/lon."""
+        if "location" in params:
+            location = LOCATIONS.get(params["location"])
+            if location is None:
+                raise APIError(404, f"Unknown location '{params['location']}', expected one of {list(LOCATIONS)}")
+            return location
+        if not coordinates:
+            raise APIError(400, f"Pass ?location=<name>, one of {list(LOCATIONS)}")
+        try:
+            lat = round(float(params["lat"]), CACHE_COORD_PRECISION)
+            lon = round(float(params["lon"]), CACHE_COORD_PRECISION)
+        except (KeyError, ValueError):
+            raise APIError(400, "Pass ?location=<name> or numeric ?lat=&lon=")
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise APIError(400, "lat/lon out of range")
+        return Location(name=f"{lat},{lon}", lat=lat, lon=lon)
+
+    async def risk(self, location: Location) -> _Encoded:
+        now = time.time()
+        bucket = int(now // self.bucket_seconds)
+        key = ("risk", location.name)
+        cached = self._cached(key, now)
+        if cached is not None:
+            CACHE_REQUESTS.inc(cache="api_risk", result="hit")
+            return cached
+        CACHE_REQUESTS.inc(cache="api_risk", result="miss")
+
+        async def compute():
+            payload = await self._compute_risk(location)
+            return self._store(key, _Encoded(payload, (bucket + 1) * self.bucket_seconds))
+        return await self._flights.do((key, bucket), compute)
+
+    async def briefing(self, location: Location) -> _Encoded:
+        now = time.time()
+        key = ("briefing", location.name)
+        cached = self._cached(key, now)
+        if cached is not None:
+            CACHE_REQUESTS.inc(cache="api_briefing", result="hit")
+            return cached
+
+        max_age = location.interval_minutes * 60
+        stored = await asyncio.to_thread(self.history.latest, location.name)
+        if stored is None or now - stored[1].timestamp() >= max_age:
+            CACHE_REQUESTS.inc(cache="api_briefing", result="miss")
+            stored = await self._flights.do(key, lambda: self._run_briefing(location))
+        else:
+            CACHE_REQUESTS.inc(cache="api_briefing", result="stored")
+        state, generated_at = stored
+        return self._store(key, _Encoded(self._briefing_payload(state), generated_at.timestamp() + max_age))
+
+    async def recent(self, days: int, location: Optional[str]) -> _Encoded:
+        rows = await asyncio.to_thread(self.history.get_recent, days, location)
+        return _Encoded({"days": days, "location": location, "briefings": rows}, time.time() + 60)
+
+    async def _compute_risk(self, location: Location) -> dict:
+        from src.agents import nodes
+        from src.agents.state import create_initial_state
+
+        state = create_initial_state(location)
+        state.update(await nodes.acollect_data(state))
+        state.update(await nodes.aanalyze_risk(state))
+        record = to_record(state)
+        profiles = nodes.get_profile_scorer()
+        return {
+            "location": record["location"],
+            "risk_score": record["risk_score"],
+            "risk_level": record["risk_level"],
+            "confidence": record["confidence"],
+            "data_quality": record["data_quality"],
+            "weather": record["weather_data"],
+            "air_quality": record["air_quality_data"],
+            "errors": record["errors"],
+            "profiles": _profile_payload(profiles.names, profiles.score(state["weather_data"], state["air_quality_data"])),
+            "computed_at": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    async def _run_briefing(self, location: Location) -> tuple[dict, datetime]:
+        from src.agents.graph import arun_health_guardian
+        from src.agents.state import new_run_id
+
+        run_id = self._failed_runs.pop(location.name, None) or new_run_id()
+        try:
+            state = await arun_health_guardian(location=location, run_id=run_id)
+        except BaseException:
+            self._failed_runs[location.name] = run_id
+            while len(self._failed_runs) > self.max_entries:
+                self._failed_runs.popitem(last=False)
+            raise
+        await asyncio.to_thread(self.history.save, state)
+        return await asyncio.to_thread(self.history.latest, location.name)
+
+    @staticmethod
+    def _briefing_payload(state: dict) -> dict:
+        fields = ("location", "timestamp", "risk_score", "risk_level", "confidence",
+                  "briefing_text", "action_plan", "data_quality", "errors")
+        return {field: state.get(field) for field in fields}
+
+    def _cached(self, key, now: float) -> Optional[_Encoded]:
+        entry = self._responses.get(key)
+        if entry is None or entry.expires_at <= now:
+            return None
+        self._responses.move_to_end(key)
+        return entry
+
+    def _store(self, key, entry: _Encoded) -> _Encoded:
+        self._responses[key] = entry
+        self._responses.move_to_end(key)
+        while len(self._responses) > self.max_entries:
+            self._responses.popitem(last=False)
+        return entry
+
+def _profile_payload(names, batch) -> dict:
+    from src.scoring.risk_calculator import concern_names
+
+    return {
+        str(name): {
+            "risk_score": round(float(score), 1),
+            "risk_level": str(level),
+            "concerns": concern_names(codes),
+        }
+        for name, score, level, codes in zip(names, batch.overall_score, batch.risk_level, batch.concern_codes)
+    }
+
+def _respond(request: Request, entry: _Encoded) -> Response:
+    max_age = max(0, int(entry.expires_at - time.time()))
+    headers = {"Cache-Control": f"public, max-age={max_age}", "ETag": entry.etag}
+    if request.headers.get("if-none-match") == entry.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+def create_app(service: Optional[RiskService] = None) -> Starlette:
+    service = service or RiskService()
+
+    async def risk(request: Request):
+        return _respond(request, await service.risk(service.resolve_location(request.query_params)))
+
+    async def briefing(request: Request):
+        return _respond(request, await service.briefing(service.resolve_location(request.query_params, coordinates=False)))
+
+    async def history(request: Request):
+        try:
+            days = int(request.query_params.get("days", 7))
+        except ValueError:
+            raise APIError(400, "days must be an integer")
+        if not 1 <= days <= 365:
+            raise APIError(400, "days must be between 1 and 365")
+        return _respond(request, await service.recent(days, request.query_params.get("location")))
+
+    async def metrics(request: Request):
+        from src.utils.metrics import registry
+        return Response(registry.to_prometheus(), media_type="text/plain; version=0.0.4")
+
+    async def api_error(request: Request, exc: APIError):
+        return JSONResponse({"error": str(exc)}, status_code=exc.status_code)
+
+    app = Starlette(
+        routes=[
+            Route("/risk", risk),
+            Route("/briefing", briefing),
+            Route("/history", history),
+            Route("/metrics", metrics),
+        ],
+        exception_handlers={APIError: api_error},
+    )
+    app.state.service = service
+    return app
+
+app = create_app()
+
+def main():
+    import uvicorn
+
+    uvicorn.run("src.api:app", host=API_HOST, port=API_PORT, access_log=False)
+
+if __name__ == "__main__":
+    main()
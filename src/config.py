@@ -24,9 +24,106 @@ except Exception:
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# Columnar raw observations (see src/utils/observations.py), next to the response cache.
+OBSERVATIONS_DIR = CACHE_DIR.parent / "observations"
+
+# Streaming trend statistics per location and metric (see src/scoring/trends.py).
+TRENDS_DB = Path(os.getenv("TRENDS_DB", CACHE_DIR / "trends.db"))
+TREND_EWMA_ALPHA = float(os.getenv("TREND_EWMA_ALPHA", "0.1"))
+TREND_Z_THRESHOLD = float(os.getenv("TREND_Z_THRESHOLD", "3"))
+TREND_WARMUP = int(os.getenv("TREND_WARMUP", "12"))
+TREND_WINDOW_HOURS = float(os.getenv("TREND_WINDOW_HOURS", "3"))
+
+# Provider endpoints; overridable so benchmarks and tests can point at local stand-ins.
+OPENWEATHER_BASE_URL = os.getenv("OPENWEATHER_BASE_URL", "https://api.openweathermap.org/data/2.5")
+AIRNOW_BASE_URL = os.getenv("AIRNOW_BASE_URL", "https://www.airnowapi.org/aq")
+# Public hourly observation files for every AirNow station (no API key needed).
+AIRNOW_FILES_URL = os.getenv("AIRNOW_FILES_URL", "https://files.airnowtech.org/airnow")
+# Append every provider response to this cassette (gzip JSON lines) for offline replay.
+RECORD_CASSETTE = os.getenv("RECORD_CASSETTE", "")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+
 BOSTON_LAT = 42.3601
 BOSTON_LON = -71.0589
 
+class Location(BaseModel):
+    name: str
+    lat: float
+    lon: float
+    interval_minutes: int = int(os.getenv("SCHEDULE_INTERVAL_MINUTES", "30"))
+
+def parse_locations(value: str) -> dict[str, Location]:
+    """Parses "Boston=42.36,-71.06;Cambridge=42.37,-71.11@60" (optional @minutes cadence)."""
+    locations = {}
+    for entry in filter(None, (part.strip() for part in value.split(";"))):
+        name, _, rest = entry.partition("=")
+        coords, _, interval = rest.partition("@")
+        lat, lon = (float(c) for c in coords.split(","))
+        cadence = {"interval_minutes": int(interval)} if interval else {}
+        locations[name.strip()] = Location(name=name.strip(), lat=lat, lon=lon, **cadence)
+    return locations
+
+# Locations kept fresh by the scheduler (python -m src.scheduler); the first is the UI default.
+LOCATIONS = parse_locations(os.getenv("LOCATIONS", f"Boston={BOSTON_LAT},{BOSTON_LON}"))
+DEFAULT_LOCATION = next(iter(LOCATIONS.values()))
+# Scheduled runs land at this many minutes past each interval boundary. AirNow
+# publishes the previous hour's observations roughly 15-20 minutes past the hour
+# and OpenWeather refreshes every ~10 minutes, so :20 and :50 see fresh data.
+SCHEDULE_OFFSET_MINUTES = int(os.getenv("SCHEDULE_OFFSET_MINUTES", "20"))
+
+# Provider response cache (seconds). AirNow observations update hourly.
+WEATHER_CACHE_TTL = int(os.getenv("WEATHER_CACHE_TTL", "600"))
+AIRNOW_CACHE_TTL = int(os.getenv("AIRNOW_CACHE_TTL", "3600"))
+# Forecasts are fetched in bulk (all timesteps in one request) at most once an hour.
+FORECAST_CACHE_TTL = int(os.getenv("FORECAST_CACHE_TTL", "3600"))
+FORECAST_HOURS = int(os.getenv("FORECAST_HOURS", "24"))
+CACHE_MAX_STALE = int(os.getenv("CACHE_MAX_STALE", "21600"))
+CACHE_COORD_PRECISION = 2
+
+# LLM briefings reused for near-identical conditions (see BriefingCache).
+BRIEFING_CACHE_TTL = int(os.getenv("BRIEFING_CACHE_TTL", "10800"))
+BRIEFING_CACHE_SIZE = int(os.getenv("BRIEFING_CACHE_SIZE", "256"))
+
+# Briefing types rendered from a local template instead of the LLM ("" = always use the LLM).
+TEMPLATE_BRIEFING_TYPES = {t.strip() for t in os.getenv("TEMPLATE_BRIEFING_TYPES", "short").split(",") if t.strip()}
+
+# How long a finished run is reused by other UI sessions for the same location.
+SHARED_RESULT_TTL = int(os.getenv("SHARED_RESULT_TTL", "300"))
+
+# Provider resilience: retries use full-jitter backoff inside the collection budget,
+# and a provider's circuit opens after consecutive failures.
+COLLECT_TIME_BUDGET = float(os.getenv("COLLECT_TIME_BUDGET", "12"))
+PROVIDER_MAX_RETRIES = int(os.getenv("PROVIDER_MAX_RETRIES", "2"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+# collect_data proceeds with whatever arrived after the soft deadline. A duplicate
+# request is sent to a provider that is slower than its recent p95.
+COLLECT_SOFT_DEADLINE = float(os.getenv("COLLECT_SOFT_DEADLINE", "3"))
+HEDGE_REQUESTS = os.getenv("HEDGE_REQUESTS", "true").lower() == "true"
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+HEDGE_MIN_DELAY = float(os.getenv("HEDGE_MIN_DELAY", "0.05"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+
+# HTTP API (python -m src.api). Risk scores are computed once per location and
+# bucket; identical requests inside a bucket share the result.
+API_HOST = os.getenv("API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("API_PORT", "8000"))
+RISK_BUCKET_SECONDS = int(os.getenv("RISK_BUCKET_SECONDS", "300"))
+
+# Upper bound on agent runs in flight per event loop (see arun_health_guardian).
+MAX_CONCURRENT_RUNS = int(os.getenv("MAX_CONCURRENT_RUNS", "100"))
+
+# Subscriber fan-out (src.agents.fanout): a CSV of id,location,profile. LLM requests are
+# shared by all clients of the process and paced to LLM_REQUESTS_PER_SECOND (0 = unpaced).
+SUBSCRIBERS_FILE = Path(os.getenv("SUBSCRIBERS_FILE", str(CACHE_DIR.parent / "subscribers.csv")))
+LLM_REQUESTS_PER_SECOND = float(os.getenv("LLM_REQUESTS_PER_SECOND", "8"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+# Graph runs checkpoint every completed node here, keyed by run_id, so a failed run can
+# resume where it stopped (empty = no checkpoints). Older checkpoints are not resumed.
+CHECKPOINT_DB = os.getenv("CHECKPOINT_DB", str(CACHE_DIR / "checkpoints.db"))
+RESUME_MAX_AGE = int(os.getenv("RESUME_MAX_AGE", "1800"))
+
 class APIConfig(BaseModel):
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
     openweather_api_key: str = os.getenv("OPENWEATHER_API_KEY", "")
@@ -1,8 +1,17 @@
-import requests
-from datetime import datetime
+import time
+from datetime import date, datetime, timedelta, timezone
 from typing import Optional
+import requests
+import httpx
 from pydantic import BaseModel
-from src.config import api_config, BOSTON_LAT, BOSTON_LON
+from src.config import (
+    api_config, BOSTON_LAT, BOSTON_LON, AIRNOW_CACHE_TTL, FORECAST_CACHE_TTL, AIRNOW_BASE_URL, AIRNOW_FILES_URL,
+    PROVIDER_MAX_RETRIES,
+)
+from src.data_ingestion.http import get_session, get_async_client
+from src.data_ingestion.sources import ProviderRequest, get_source, uncached
+from src.utils.cache import response_cache
+from src.utils.retry import retry_with_backoff, request_timeout
 
 class AirQualityData(BaseModel):
     timestamp: datetime
@@ -11,46 +20,224 @@ class AirQualityData(BaseModel):
     category: str
     reporting_area: str
 
+# AirNow forecasts sometimes carry only a category (AQI -1); use the category's midpoint.
+CATEGORY_AQI = {1: 25, 2: 75, 3: 125, 4: 175, 5: 250, 6: 400}
+
+# AirNow reports observation hours in the reporting area's local time zone.
+UTC_OFFSETS = {
+    "EST": -5, "EDT": -4, "CST": -6, "CDT": -5, "MST": -7, "MDT": -6, "PST": -8, "PDT": -7,
+    "AKST": -9, "AKDT": -8, "HST": -10, "AST": -4, "SST": -11, "UTC": 0, "GMT": 0,
+}
+
+def observed_at(entry: dict) -> datetime:
+    """When AirNow measured ``entry``, as a naive local time like WeatherData.timestamp; now if unreported."""
+    try:
+        observed = datetime.strptime(entry["DateObserved"].strip(), "%Y-%m-%d") + timedelta(hours=int(entry["HourObserved"]))
+    except (KeyError, TypeError, ValueError):
+        return datetime.now()
+    offset = UTC_OFFSETS.get(entry.get("LocalTimeZone"))
+    if offset is None:
+        return observed
+    return observed.replace(tzinfo=timezone(timedelta(hours=offset))).astimezone().replace(tzinfo=None)
+
+class AirQualityForecast(BaseModel):
+    """AirNow daily forecast: the worst pollutant for each forecast date."""
+    dates: list[date]
+    aqi: list[int]
+    category: list[str]
+    pollutant: list[str]
+
 class AirQualityClient:
-    BASE_URL = "https://www.airnowapi.org/aq"
+    BASE_URL = AIRNOW_BASE_URL
+    # Endpoint name (as recorded) -> path under BASE_URL.
+    ENDPOINTS = {"observation": "observation/latLong/current/", "forecast": "forecast/latLong/"}
     
-    def __init__(self):
+    def __init__(self, cache=None):
         self.api_key = api_config.airnow_api_key
+        self.session = get_session()
+        self.cache = cache if cache is not None else response_cache
+        self._stations = None  # (fetched at, StationIndex)
     
     def get_current_aqi(self, lat: float = BOSTON_LAT, lon: float = BOSTON_LON) -> Optional[AirQualityData]:
         """Fetch current AQI. Returns None if no data available."""
+        self._check_key()
         
-        if not self.api_key:
+        data = self._responses().get_or_fetch(
+            "airnow", lat, lon,
+            lambda: self._dump(self._fetch_current_aqi(lat, lon)),
+            ttl=AIRNOW_CACHE_TTL,
+        )
+        return AirQualityData(**data) if data else None
+
+    async def aget_current_aqi(self, lat: float = BOSTON_LAT, lon: float = BOSTON_LON) -> Optional[AirQualityData]:
+        self._check_key()
+
+        async def fetch():
+            return self._dump(await self._afetch_current_aqi(lat, lon))
+
+        data = await self._responses().aget_or_fetch("airnow", lat, lon, fetch, ttl=AIRNOW_CACHE_TTL)
+        return AirQualityData(**data) if data else None
+
+    def get_forecast(self, lat: float = BOSTON_LAT, lon: float = BOSTON_LON) -> Optional[AirQualityForecast]:
+        """Every forecast day in one request, cached for an hour."""
+        self._check_key()
+
+        data = self._responses().get_or_fetch(
+            "airnow_forecast", lat, lon,
+            lambda: self._dump(self._fetch_forecast(lat, lon)),
+            ttl=FORECAST_CACHE_TTL,
+        )
+        return AirQualityForecast(**data) if data else None
+
+    async def aget_forecast(self, lat: float = BOSTON_LAT, lon: float = BOSTON_LON) -> Optional[AirQualityForecast]:
+        self._check_key()
+
+        async def fetch():
+            return self._dump(await self._afetch_forecast(lat, lon))
+
+        data = await self._responses().aget_or_fetch("airnow_forecast", lat, lon, fetch, ttl=FORECAST_CACHE_TTL)
+        return AirQualityForecast(**data) if data else None
+
+    def get_station_index(self):
+        """Latest readings of every AirNow station from one hourly file, kept for AIRNOW_CACHE_TTL.
+
+        Needs no API key. Look up any number of coordinates locally with the
+        returned src.data_ingestion.stations.StationIndex.
+        """
+        if self._stations is None or time.monotonic() - self._stations[0] > AIRNOW_CACHE_TTL:
+            index = None
+            for hour in self._recent_hours():
+                try:
+                    index = self._fetch_hourly_obs(hour)
+                    break
+                except requests.HTTPError as e:
+                    if e.response is None or e.response.status_code != 404:
+                        raise
+            if index is None:
+                return None
+            self._stations = (time.monotonic(), index)
+        return self._stations[1]
+
+    async def aget_station_index(self):
+        if self._stations is None or time.monotonic() - self._stations[0] > AIRNOW_CACHE_TTL:
+            index = None
+            for hour in self._recent_hours():
+                try:
+                    index = await self._afetch_hourly_obs(hour)
+                    break
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code != 404:
+                        raise
+            if index is None:
+                return None
+            self._stations = (time.monotonic(), index)
+        return self._stations[1]
+
+    @staticmethod
+    def _recent_hours() -> list[datetime]:
+        """The last completed UTC hour, then the one before in case its file is not published yet."""
+        hour = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) - timedelta(hours=1)
+        return [hour, hour - timedelta(hours=1)]
+
+    @retry_with_backoff(max_retries=PROVIDER_MAX_RETRIES, initial_delay=0.5, breaker="airnow")
+    def _fetch_hourly_obs(self, hour: datetime):
+        from src.data_ingestion.stations import parse_hourly_obs, hourly_obs_path
+
+        with self.session.get(f"{AIRNOW_FILES_URL}/{hourly_obs_path(hour)}", stream=True,
+                              timeout=request_timeout(30)) as response:
+            response.raise_for_status()
+            response.encoding = response.encoding or "utf-8"
+            return parse_hourly_obs(response.iter_lines(decode_unicode=True))
+
+    @retry_with_backoff(max_retries=PROVIDER_MAX_RETRIES, initial_delay=0.5, breaker="airnow")
+    async def _afetch_hourly_obs(self, hour: datetime):
+        import csv
+        from src.data_ingestion.stations import HourlyObsParser, hourly_obs_path
+
+        url = f"{AIRNOW_FILES_URL}/{hourly_obs_path(hour)}"
+        async with get_async_client().stream("GET", url, timeout=request_timeout(30)) as response:
+            response.raise_for_status()
+            parser = None
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                row = next(csv.reader([line]))
+                if parser is None:
+                    parser = HourlyObsParser(row)
+                else:
+                    parser.add(row)
+        return (parser or HourlyObsParser([])).index()
+
+    @staticmethod
+    def _dump(aqi: Optional[BaseModel]) -> Optional[dict]:
+        return aqi.model_dump(mode="json") if aqi else None
+
+    def _responses(self):
+        return self.cache if get_source().live else uncached
+
+    def _check_key(self):
+        # Replayed responses need no key.
+        if not self.api_key and get_source().live:
             raise ValueError("AirNow API key not configured")
+
+    def _request(self, endpoint: str, lat: float, lon: float) -> ProviderRequest:
+        return ProviderRequest("airnow", endpoint, lat, lon, f"{self.BASE_URL}/{self.ENDPOINTS[endpoint]}", {
+            "format": "application/json",
+            "latitude": lat,
+            "longitude": lon,
+            "distance": 25,
+            "API_KEY": self.api_key
+        })
+
+    @retry_with_backoff(max_retries=PROVIDER_MAX_RETRIES, initial_delay=0.5, breaker="airnow")
+    def _fetch_current_aqi(self, lat: float, lon: float) -> Optional[AirQualityData]:
+        return self._parse(get_source().get_json(self._request("observation", lat, lon), request_timeout(10)))
+
+    @retry_with_backoff(max_retries=PROVIDER_MAX_RETRIES, initial_delay=0.5, breaker="airnow")
+    async def _afetch_current_aqi(self, lat: float, lon: float) -> Optional[AirQualityData]:
+        return self._parse(await get_source().aget_json(self._request("observation", lat, lon), request_timeout(10)))
+
+    @retry_with_backoff(max_retries=PROVIDER_MAX_RETRIES, initial_delay=0.5, breaker="airnow")
+    def _fetch_forecast(self, lat: float, lon: float) -> Optional[AirQualityForecast]:
+        return self._parse_forecast(get_source().get_json(self._request("forecast", lat, lon), request_timeout(10)))
+
+    @retry_with_backoff(max_retries=PROVIDER_MAX_RETRIES, initial_delay=0.5, breaker="airnow")
+    async def _afetch_forecast(self, lat: float, lon: float) -> Optional[AirQualityForecast]:
+        return self._parse_forecast(await get_source().aget_json(self._request("forecast", lat, lon), request_timeout(10)))
+
+    @staticmethod
+    def _parse_forecast(data: list) -> Optional[AirQualityForecast]:
+        worst = {}
+        for entry in data:
+            aqi = entry.get("AQI", -1)
+            if aqi < 0:
+                aqi = CATEGORY_AQI.get(entry.get("Category", {}).get("Number"), -1)
+            if aqi < 0:
+                continue
+            day = date.fromisoformat(entry["DateForecast"].strip())
+            if day not in worst or aqi > worst[day][0]:
+                worst[day] = (aqi, entry.get("Category", {}).get("Name", "Unknown"), entry.get("ParameterName", "Unknown"))
+        if not worst:
+            return None
+        days = sorted(worst)
+        return AirQualityForecast(
+            dates=days,
+            aqi=[worst[d][0] for d in days],
+            category=[worst[d][1] for d in days],
+            pollutant=[worst[d][2] for d in days],
+        )
+
+    @staticmethod
+    def _parse(data: list) -> Optional[AirQualityData]:
+        if not data:
+            return None
         
-        try:
-            response = requests.get(
-                f"{self.BASE_URL}/observation/latLong/current/",
-                params={
-                    "format": "application/json",
-                    "latitude": lat,
-                    "longitude": lon,
-                    "distance": 25,
-                    "API_KEY": self.api_key
-                },
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            if not data:
-                return None
-            
-            primary = max(data, key=lambda x: x.get("AQI", 0))
-            
-            return AirQualityData(
-                timestamp=datetime.now(),
-                primary_aqi=primary.get("AQI", 0),
-                primary_pollutant=primary.get("ParameterName", "Unknown"),
-                category=primary.get("Category", {}).get("Name", "Unknown"),
-                reporting_area=primary.get("ReportingArea", "Unknown"),
-            )
+        primary = max(data, key=lambda x: x.get("AQI", 0))
         
-        except Exception as e:
-            print(f"AirQuality API error: {e}")
-            return None
\ No newline at end of file
+        return AirQualityData(
+            timestamp=observed_at(primary),
+            primary_aqi=primary.get("AQI", 0),
+            primary_pollutant=primary.get("ParameterName", "Unknown"),
+            category=primary.get("Category", {}).get("Name", "Unknown"),
+            reporting_area=primary.get("ReportingArea", "Unknown"),
+        )
@@ -0,0 +1,220 @@
+import asyncio
+import contextvars
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent import futures
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Awaitable, Callable, Optional
+from src.config import HEDGE_REQUESTS, HEDGE_MIN_SAMPLES, HEDGE_MIN_DELAY
+from src.utils.cache import trace_fetches
+from src.utils.metrics import PROVIDER_LATENCY, PROVIDER_ERRORS, PROVIDER_HEDGES, PROVIDER_LATE
+
+@dataclass
+class Provider:
+    key: str
+    label: str
+    fetch: Callable[..., Any]
+    afetch: Optional[Callable[..., Awaitable[Any]]] = None
+
+class LatencyWindow:
+    """Recent upstream latencies for one provider; p95() drives request hedging."""
+
+    def __init__(self, size: int = 200):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def p95(self) -> Optional[float]:
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+class _Race:
+    """The primary request for one provider plus at most one hedged duplicate."""
+
+    def __init__(self, provider: Provider, first, hedge_at: Optional[float]):
+        self.provider = provider
+        self.attempts = [first]
+        self.hedge_at = hedge_at
+
+    def outcome(self):
+        """(done, result, error): the first success wins, an error only once every attempt failed."""
+        for attempt in self.attempts:
+            if attempt.done() and not attempt.cancelled() and attempt.exception() is None:
+                return True, attempt.result(), None
+        if all(attempt.done() for attempt in self.attempts):
+            return True, None, self.attempts[0].exception()
+        return False, None, None
+
+    def should_hedge(self, now: float) -> bool:
+        return self.hedge_at is not None and len(self.attempts) == 1 and now >= self.hedge_at
+
+class DataCollector:
+    """Fetches every registered provider in parallel.
+
+    Latency is bounded by the slowest provider instead of the sum of all of
+    them, and by ``soft_deadline`` when one is given: providers still pending
+    then are reported as missing and the run carries on without them. A
+    provider slower than its recent upstream p95 (cache hits are not counted)
+    gets one hedged duplicate request; whichever answer arrives first is used.
+    """
+
+    def __init__(
+        self,
+        providers: list[Provider],
+        max_workers: int = 16,
+        hedge: bool = HEDGE_REQUESTS,
+        hedge_min_samples: int = HEDGE_MIN_SAMPLES,
+    ):
+        self.providers = providers
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.latency = defaultdict(LatencyWindow)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="collector")
+
+    def hedge_delay(self, provider: Provider) -> Optional[float]:
+        """Seconds to wait before hedging, or None while hedging is off or history is too short."""
+        window = self.latency[provider.key]
+        if not self.hedge or len(window) < self.hedge_min_samples:
+            return None
+        return max(HEDGE_MIN_DELAY, window.p95())
+
+    def collect(self, *args, soft_deadline: Optional[float] = None) -> tuple[dict[str, Any], list[str]]:
+        """Returns results keyed by provider (None on failure) and error strings in provider order.
+
+        ``args`` (e.g. lat, lon) are passed to every provider's fetch.
+        """
+        start = time.monotonic()
+        submit = partial(self._submit, args=args)
+        races = {p.key: _Race(p, submit(p), self._hedge_at(p, start)) for p in self.providers}
+        settled = {}
+        while (step := self._advance(races, settled, start, soft_deadline, submit)) is not None:
+            pending, timeout = step
+            futures.wait(pending, timeout=timeout, return_when=futures.FIRST_COMPLETED)
+        return self._report(races, settled, soft_deadline)
+
+    async def acollect(self, *args, soft_deadline: Optional[float] = None) -> tuple[dict[str, Any], list[str]]:
+        """Async variant of collect(); providers without ``afetch`` run in a worker thread.
+
+        Unlike threads, requests still pending at the soft deadline are cancelled.
+        """
+        start = time.monotonic()
+        spawn = partial(self._spawn, args=args)
+        races = {p.key: _Race(p, spawn(p), self._hedge_at(p, start)) for p in self.providers}
+        settled = {}
+        try:
+            while (step := self._advance(races, settled, start, soft_deadline, spawn)) is not None:
+                pending, timeout = step
+                await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for race in races.values():
+                for attempt in race.attempts:
+                    attempt.cancel()
+        return self._report(races, settled, soft_deadline)
+
+    @staticmethod
+    def _advance(races: dict, settled: dict, start: float, soft_deadline: Optional[float], launch):
+        """Settles finished races and launches due hedges.
+
+        Returns the attempts to wait on and for how long, or None once every
+        provider settled or the soft deadline passed.
+        """
+        now = time.monotonic()
+        for key, race in races.items():
+            if key in settled:
+                continue
+            done, result, error = race.outcome()
+            if done:
+                settled[key] = (result, error)
+            elif race.should_hedge(now):
+                PROVIDER_HEDGES.inc(provider=key)
+                race.attempts.append(launch(race.provider))
+        open_races = [race for key, race in races.items() if key not in settled]
+        if not open_races:
+            return None
+        wake = [race.hedge_at for race in open_races if len(race.attempts) == 1 and race.hedge_at is not None]
+        if soft_deadline is not None:
+            if now >= start + soft_deadline:
+                return None
+            wake.append(start + soft_deadline)
+        pending = [attempt for race in open_races for attempt in race.attempts if not attempt.done()]
+        return pending, max(0.0, min(wake) - now) if wake else None
+
+    def _submit(self, provider: Provider, args: tuple = ()) -> futures.Future:
+        # Each worker gets a copy of the caller's context so the run's time budget applies there too.
+        return self._executor.submit(contextvars.copy_context().run, self._timed, provider, args)
+
+    def _spawn(self, provider: Provider, args: tuple = ()) -> asyncio.Task:
+        task = asyncio.ensure_future(self._atimed(provider, args))
+        # A losing or late attempt may fail after nobody is waiting for it.
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    def _hedge_at(self, provider: Provider, start: float) -> Optional[float]:
+        delay = self.hedge_delay(provider)
+        return None if delay is None else start + delay
+
+    @staticmethod
+    def _report(races: dict, settled: dict, soft_deadline: Optional[float]) -> tuple[dict[str, Any], list[str]]:
+        results = {}
+        errors = []
+        for key, race in races.items():
+            if key not in settled:
+                PROVIDER_LATE.inc(provider=key)
+                results[key] = None
+                errors.append(f"{race.provider.label} error: no response within {soft_deadline:g}s")
+                continue
+            result, error = settled[key]
+            results[key] = result
+            if error is not None:
+                errors.append(f"{race.provider.label} error: {error}")
+        return results, errors
+
+    def _timed(self, provider: Provider, args: tuple = ()) -> Any:
+        start = time.perf_counter()
+        try:
+            with trace_fetches() as trace:
+                result = provider.fetch(*args)
+        except Exception:
+            PROVIDER_ERRORS.inc(provider=provider.key)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            PROVIDER_LATENCY.observe(elapsed, provider=provider.key)
+        self._record(provider, elapsed, trace)
+        return result
+
+    async def _atimed(self, provider: Provider, args: tuple = ()) -> Any:
+        start = time.perf_counter()
+        try:
+            with trace_fetches() as trace:
+                if provider.afetch:
+                    result = await provider.afetch(*args)
+                else:
+                    result = await asyncio.to_thread(provider.fetch, *args)
+        except Exception:
+            PROVIDER_ERRORS.inc(provider=provider.key)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            PROVIDER_LATENCY.observe(elapsed, provider=provider.key)
+        self._record(provider, elapsed, trace)
+        return result
+
+    def _record(self, provider: Provider, elapsed: float, trace):
+        # Hedging only pays off upstream: cache hits would drag p95 to the HEDGE_MIN_DELAY floor
+        # and duplicate every cold miss. Providers without a ResponseCache count their whole call.
+        window = self.latency[provider.key]
+        for seconds in trace.upstream if trace.upstream or trace.cached else [elapsed]:
+            window.add(seconds)
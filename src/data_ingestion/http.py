@@ -0,0 +1,35 @@
+import asyncio
+import threading
+import weakref
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+POOL_SIZE = 10
+
+_session = None
+_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """Process-wide session so provider calls reuse keep-alive connections."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+_async_clients = weakref.WeakKeyDictionary()
+
+def get_async_client() -> httpx.AsyncClient:
+    """Pooled async client for the running event loop (httpx clients are loop-bound)."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(limits=httpx.Limits(max_connections=POOL_SIZE * 10, max_keepalive_connections=POOL_SIZE))
+        _async_clients[loop] = client
+    return client
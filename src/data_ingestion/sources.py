@@ -0,0 +1,173 @@
+"""Where provider clients get their raw responses: live APIs, recorded or replayed.
+
+Clients describe each call as a ProviderRequest and ask the process-wide
+source (get_source) for the decoded JSON body:
+
+- LiveSource calls the API.
+- RecordingSource calls the API and appends every response to a cassette
+  (set RECORD_CASSETTE to record whatever the UI, API or scheduler fetch).
+- ReplaySource answers from a cassette at a movable point in time; see
+  src.replay for driving the pipeline through a recording.
+
+A cassette is gzip-compressed JSON lines, one response per line:
+``{"t": <unix time>, "provider": ..., "endpoint": ..., "lat": ..., "lon": ..., "body": ...}``.
+API keys and other query parameters are not recorded.
+"""
+import asyncio
+import bisect
+import gzip
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+from src.config import RECORD_CASSETTE
+
+COORD_DECIMALS = 4
+
+@dataclass(frozen=True, slots=True)
+class ProviderRequest:
+    provider: str  # "openweather" or "airnow"
+    endpoint: str  # e.g. "weather", "forecast", "observation"
+    lat: float
+    lon: float
+    url: str
+    params: dict = field(default_factory=dict)
+
+    def key(self) -> tuple:
+        return self.provider, self.endpoint, round(self.lat, COORD_DECIMALS), round(self.lon, COORD_DECIMALS)
+
+class LiveSource:
+    live = True  # responses are current, so they may be cached
+
+    def get_json(self, request: ProviderRequest, timeout: float) -> Any:
+        from src.data_ingestion.http import get_session
+
+        response = get_session().get(request.url, params=request.params, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    async def aget_json(self, request: ProviderRequest, timeout: float) -> Any:
+        from src.data_ingestion.http import get_async_client
+
+        response = await get_async_client().get(request.url, params=request.params, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+class RecordingSource:
+    """Fetches through ``inner`` and appends each successful response to ``path``."""
+
+    live = True
+
+    def __init__(self, path, inner=None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.inner = inner or LiveSource()
+        self._lock = threading.Lock()
+
+    def get_json(self, request: ProviderRequest, timeout: float) -> Any:
+        body = self.inner.get_json(request, timeout)
+        self._append(request, body, time.time())
+        return body
+
+    async def aget_json(self, request: ProviderRequest, timeout: float) -> Any:
+        body = await self.inner.aget_json(request, timeout)
+        await asyncio.to_thread(self._append, request, body, time.time())
+        return body
+
+    def _append(self, request: ProviderRequest, body: Any, t: float):
+        line = json.dumps({
+            "t": round(t, 3), "provider": request.provider, "endpoint": request.endpoint,
+            "lat": request.lat, "lon": request.lon, "body": body,
+        }, separators=(",", ":"))
+        # Each append is its own gzip member, so a crash never corrupts earlier records.
+        with self._lock, gzip.open(self.path, "at", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+def read_cassette(path) -> list[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+class ReplaySource:
+    """Serves the latest recorded response at or before ``now`` (unix time) for each request.
+
+    Nothing is fetched or cached; a request with no recording raises LookupError.
+    """
+
+    live = False
+
+    def __init__(self, records: list[dict]):
+        self._tracks = {}
+        for record in sorted(records, key=lambda r: r["t"]):
+            request = ProviderRequest(record["provider"], record["endpoint"], record["lat"], record["lon"], "")
+            times, bodies = self._tracks.setdefault(request.key(), ([], []))
+            times.append(record["t"])
+            bodies.append(record["body"])
+        self.times = sorted(t for times, _ in self._tracks.values() for t in times)
+        self.now = self.times[0] if self.times else 0.0
+
+    @classmethod
+    def from_cassette(cls, path) -> "ReplaySource":
+        return cls(read_cassette(path))
+
+    def frames(self, gap: float = 60) -> list[float]:
+        """One time per recorded collection: responses less than ``gap`` seconds apart belong together.
+
+        Each frame is the time of its last response, so every response of the
+        collection is visible from there.
+        """
+        frames = []
+        for t in self.times:
+            if frames and t - frames[-1] < gap:
+                frames[-1] = t
+            else:
+                frames.append(t)
+        return frames
+
+    def get_json(self, request: ProviderRequest, timeout: Optional[float] = None) -> Any:
+        times, bodies = self._tracks.get(request.key(), ((), ()))
+        i = bisect.bisect_right(times, self.now) - 1
+        if i < 0:
+            raise LookupError(f"No recorded {request.provider} {request.endpoint} response at "
+                              f"{request.lat}, {request.lon} before {self.now}")
+        return bodies[i]
+
+    async def aget_json(self, request: ProviderRequest, timeout: Optional[float] = None) -> Any:
+        return self.get_json(request, timeout)
+
+class _Uncached:
+    """ResponseCache stand-in that always fetches; replayed responses must not be cached."""
+
+    def get_or_fetch(self, provider, lat, lon, fetch, ttl):
+        return fetch()
+
+    async def aget_or_fetch(self, provider, lat, lon, fetch, ttl):
+        return await fetch()
+
+uncached = _Uncached()
+
+_source = None
+_lock = threading.Lock()
+
+def get_source():
+    """The source every provider client uses: live, recorded to RECORD_CASSETTE when set."""
+    global _source
+    with _lock:
+        if _source is None:
+            _source = RecordingSource(RECORD_CASSETTE) if RECORD_CASSETTE else LiveSource()
+        return _source
+
+@contextmanager
+def use_source(source):
+    """Routes every provider client in the process through ``source`` until exit."""
+    global _source
+    previous = get_source()
+    with _lock:
+        _source = source
+    try:
+        yield source
+    finally:
+        with _lock:
+            _source = previous
@@ -0,0 +1,224 @@
+"""AirNow's hourly observation file as an in-memory index of reporting stations.
+
+AirNow publishes one ``HourlyAQObs_YYYYMMDDHH.dat`` per hour (UTC) with the
+latest per-pollutant AQI of every station. parse_hourly_obs reads it line by
+line into columns, and StationIndex buckets the stations on a lat/lon grid so
+nearest-station and radius lookups for any number of coordinates are answered
+locally. One download covers every neighborhood of a metro area.
+"""
+import csv
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+import numpy as np
+from src.data_ingestion.airquality_client import AirQualityData
+
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE = 2 * math.pi * EARTH_RADIUS_MILES / 360
+CELL_DEGREES = 0.25  # about 17 miles of latitude
+# File column -> pollutant name as the AirNow API reports it.
+AQI_COLUMNS = {"OZONE_AQI": "O3", "PM25_AQI": "PM2.5", "PM10_AQI": "PM10", "NO2_AQI": "NO2"}
+POLLUTANTS = tuple(AQI_COLUMNS.values())
+# Upper AQI bound of each category.
+AQI_CATEGORIES = ((50, "Good"), (100, "Moderate"), (150, "Unhealthy for Sensitive Groups"),
+                  (200, "Unhealthy"), (300, "Very Unhealthy"))
+
+def aqi_category(aqi: int) -> str:
+    for upper, name in AQI_CATEGORIES:
+        if aqi <= upper:
+            return name
+    return "Hazardous"
+
+def hourly_obs_path(hour: datetime) -> str:
+    """File for ``hour`` (UTC), relative to AIRNOW_FILES_URL."""
+    return f"{hour:%Y}/{hour:%Y%m%d}/HourlyAQObs_{hour:%Y%m%d%H}.dat"
+
+@dataclass(slots=True)
+class Station:
+    aqsid: str
+    name: str
+    lat: float
+    lon: float
+    reporting_area: str
+    valid_at: Optional[datetime]
+    aqi: dict[str, int] = field(default_factory=dict)  # pollutant -> AQI, reported pollutants only
+    distance_miles: Optional[float] = None
+
+def _number(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
+
+def _valid_at(day: str, time: str) -> Optional[datetime]:
+    for fmt in ("%m/%d/%y %H:%M", "%m/%d/%Y %H:%M"):
+        try:
+            return datetime.strptime(f"{day} {time}", fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    return None
+
+class HourlyObsParser:
+    """Collects HourlyAQObs rows into columns as they arrive; ``index()`` builds the StationIndex.
+
+    Rows without coordinates or without any pollutant AQI are skipped.
+    """
+
+    def __init__(self, header: list[str]):
+        columns = {name: i for i, name in enumerate(header)}
+        if "Latitude" not in columns:
+            raise ValueError("Not an AirNow HourlyAQObs file")
+        self.width = len(columns)
+        self.columns = [columns[c] for c in ("AQSID", "SiteName", "ReportingArea_PipeDelimited", "Latitude",
+                                              "Longitude", "ValidDate", "ValidTime")]
+        self.aqi_columns = [columns[c] for c in AQI_COLUMNS]
+        self.ids, self.names, self.areas, self.lats, self.lons, self.aqi, self.valid_at = [], [], [], [], [], [], []
+        self._times = {}
+
+    def add(self, row: list[str]):
+        if len(row) < self.width:
+            return
+        aqsid, site, area, lat, lon, day, time = (row[c] for c in self.columns)
+        readings = [_number(row[c]) for c in self.aqi_columns]
+        lat, lon = _number(lat), _number(lon)
+        if math.isnan(lat) or math.isnan(lon) or all(math.isnan(r) or r < 0 for r in readings):
+            return
+        self.ids.append(aqsid)
+        self.names.append(site)
+        self.areas.append(area.split("|")[0])
+        self.lats.append(lat)
+        self.lons.append(lon)
+        self.aqi.append(readings)
+        if (day, time) not in self._times:
+            self._times[day, time] = _valid_at(day, time)
+        self.valid_at.append(self._times[day, time])
+
+    def index(self) -> "StationIndex":
+        aqi = np.array(self.aqi, dtype=np.float64).reshape(-1, len(AQI_COLUMNS))
+        aqi[aqi < 0] = np.nan
+        return StationIndex(
+            aqsid=np.array(self.ids), name=np.array(self.names), reporting_area=np.array(self.areas),
+            lat=self.lats, lon=self.lons, aqi=aqi, valid_at=self.valid_at,
+        )
+
+def parse_hourly_obs(lines: Iterable[str]) -> "StationIndex":
+    """StationIndex from the lines of an HourlyAQObs file, read one row at a time."""
+    rows = csv.reader(lines)
+    parser = HourlyObsParser(next(rows, []))
+    for row in rows:
+        parser.add(row)
+    return parser.index()
+
+def haversine_miles(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+class StationIndex:
+    """Station columns plus a grid of CELL_DEGREES cells, each holding its station rows.
+
+    Lookups only measure distances to stations in the cells a search radius
+    can reach, and queries that fall in the same cell share one vectorized
+    distance computation.
+    """
+
+    def __init__(self, aqsid, name, reporting_area, lat, lon, aqi, valid_at):
+        self.aqsid = aqsid
+        self.name = name
+        self.reporting_area = reporting_area
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.aqi = aqi  # one row per station, one column per POLLUTANTS entry, NaN if not reported
+        self.valid_at = valid_at
+        cells = self._cells(self.lat, self.lon)
+        order = np.lexsort((cells[:, 1], cells[:, 0]))
+        keys, starts = np.unique(cells[order], axis=0, return_index=True)
+        self._grid = {tuple(key): rows for key, rows in zip(keys.tolist(), np.split(order, starts[1:]))}
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    @staticmethod
+    def _cells(lat, lon) -> np.ndarray:
+        return np.stack([np.floor(np.asarray(lat) / CELL_DEGREES), np.floor(np.asarray(lon) / CELL_DEGREES)],
+                        axis=-1).astype(np.int64).reshape(-1, 2)
+
+    def _candidates(self, cell: tuple[int, int], miles: float) -> np.ndarray:
+        """Rows of every station within ``miles`` of any point in ``cell``."""
+        lat_span = math.ceil(miles / MILES_PER_DEGREE / CELL_DEGREES)
+        poleward = min(89.0, max(abs(cell[0]), abs(cell[0] + 1)) * CELL_DEGREES + lat_span * CELL_DEGREES)
+        lon_span = math.ceil(miles / (MILES_PER_DEGREE * math.cos(math.radians(poleward))) / CELL_DEGREES)
+        found = [
+            self._grid[key]
+            for i in range(cell[0] - lat_span, cell[0] + lat_span + 1)
+            for j in range(cell[1] - lon_span, cell[1] + lon_span + 1)
+            if (key := (i, j)) in self._grid
+        ]
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def nearest(self, lats, lons, max_miles: float = 25) -> tuple[np.ndarray, np.ndarray]:
+        """Row of the nearest station within ``max_miles`` of each point (-1 if none) and its distance."""
+        lats, lons = np.atleast_1d(np.asarray(lats, dtype=np.float64)), np.atleast_1d(np.asarray(lons, dtype=np.float64))
+        rows = np.full(len(lats), -1, dtype=np.int64)
+        distances = np.full(len(lats), np.nan)
+        cells = self._cells(lats, lons)
+        if len(cells) == 1:
+            keys, groups = cells, [np.zeros(1, dtype=np.int64)]
+        else:
+            keys, inverse = np.unique(cells, axis=0, return_inverse=True)
+            order = np.argsort(inverse.ravel(), kind="stable")
+            groups = np.split(order, np.flatnonzero(np.diff(inverse.ravel()[order])) + 1)
+        for key, points in zip(keys.tolist(), groups):
+            candidates = self._candidates(tuple(key), max_miles)
+            if not len(candidates):
+                continue
+            d = haversine_miles(lats[points, None], lons[points, None], self.lat[candidates], self.lon[candidates])
+            best = d.argmin(axis=1)
+            best_d = d[np.arange(len(points)), best]
+            hit = best_d <= max_miles
+            rows[points[hit]] = candidates[best[hit]]
+            distances[points[hit]] = best_d[hit]
+        return rows, distances
+
+    def within(self, lat: float, lon: float, miles: float) -> np.ndarray:
+        """Rows of every station within ``miles``, nearest first."""
+        candidates = self._candidates(tuple(self._cells(lat, lon)[0].tolist()), miles)
+        d = haversine_miles(lat, lon, self.lat[candidates], self.lon[candidates])
+        order = np.argsort(d)
+        return candidates[order[d[order] <= miles]]
+
+    def station(self, row: int, distance_miles: Optional[float] = None) -> Station:
+        return Station(
+            aqsid=str(self.aqsid[row]),
+            name=str(self.name[row]),
+            lat=float(self.lat[row]),
+            lon=float(self.lon[row]),
+            reporting_area=str(self.reporting_area[row]),
+            valid_at=self.valid_at[row],
+            aqi={p: int(v) for p, v in zip(POLLUTANTS, self.aqi[row]) if not np.isnan(v)},
+            distance_miles=distance_miles,
+        )
+
+    def worst_aqi(self, rows: np.ndarray) -> np.ndarray:
+        """Highest pollutant AQI of each station row, NaN where the row is -1."""
+        rows = np.asarray(rows)
+        worst = np.full(len(rows), np.nan)
+        found = rows >= 0
+        worst[found] = np.nanmax(self.aqi[rows[found]], axis=1)
+        return worst
+
+    def observation(self, lat: float, lon: float, max_miles: float = 25) -> Optional[AirQualityData]:
+        """The nearest station's worst pollutant, as AirQualityClient.get_current_aqi reports it."""
+        rows, _ = self.nearest(lat, lon, max_miles)
+        if rows[0] < 0:
+            return None
+        station = self.station(int(rows[0]))
+        pollutant, aqi = max(station.aqi.items(), key=lambda item: item[1])
+        return AirQualityData(
+            timestamp=station.valid_at.astimezone().replace(tzinfo=None) if station.valid_at else datetime.now(),
+            primary_aqi=aqi,
+            primary_pollutant=pollutant,
+            category=aqi_category(aqi),
+            reporting_area=station.reporting_area,
+        )
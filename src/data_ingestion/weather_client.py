@@ -1,7 +1,11 @@
-import requests
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pydantic import BaseModel
-from src.config import api_config, BOSTON_LAT, BOSTON_LON
+from src.config import (
+    api_config, BOSTON_LAT, BOSTON_LON, WEATHER_CACHE_TTL, FORECAST_CACHE_TTL, OPENWEATHER_BASE_URL, PROVIDER_MAX_RETRIES,
+)
+from src.data_ingestion.sources import ProviderRequest, get_source, uncached
+from src.utils.cache import response_cache
+from src.utils.retry import retry_with_backoff, request_timeout
 
 class WeatherData(BaseModel):
     timestamp: datetime
@@ -15,21 +19,95 @@ class WeatherData(BaseModel):
     visibility_miles: float
     pressure_hpa: int
 
+class WeatherForecast(BaseModel):
+    """OpenWeather 5 day / 3 hour forecast, one list per field (columnar)."""
+    times: list[datetime]
+    temperature_f: list[float]
+    feels_like_f: list[float]
+    wind_speed_mph: list[float]
+    visibility_miles: list[float]
+    weather_description: list[str]
+
 class WeatherClient:
-    BASE_URL = "https://api.openweathermap.org/data/2.5"
+    BASE_URL = OPENWEATHER_BASE_URL
 
-    def __init__(self):
+    def __init__(self, cache=None):
         self.api_key = api_config.openweather_api_key
+        self.cache = cache if cache is not None else response_cache
     
     def get_current_weather(self, lat=BOSTON_LAT, lon=BOSTON_LON) -> WeatherData:
-        response = requests.get(
-            f"{self.BASE_URL}/weather",
-            params={"lat": lat, "lon": lon, "appid": self.api_key, "units": "imperial"},
-            timeout=10
+        data = self._responses().get_or_fetch(
+            "openweather", lat, lon,
+            lambda: self._fetch_current_weather(lat, lon).model_dump(mode="json"),
+            ttl=WEATHER_CACHE_TTL,
+        )
+        return WeatherData(**data)
+
+    async def aget_current_weather(self, lat=BOSTON_LAT, lon=BOSTON_LON) -> WeatherData:
+        async def fetch():
+            return (await self._afetch_current_weather(lat, lon)).model_dump(mode="json")
+
+        data = await self._responses().aget_or_fetch("openweather", lat, lon, fetch, ttl=WEATHER_CACHE_TTL)
+        return WeatherData(**data)
+
+    def get_forecast(self, lat=BOSTON_LAT, lon=BOSTON_LON) -> WeatherForecast:
+        """All forecast timesteps in one request, cached for an hour."""
+        data = self._responses().get_or_fetch(
+            "openweather_forecast", lat, lon,
+            lambda: self._fetch_forecast(lat, lon).model_dump(mode="json"),
+            ttl=FORECAST_CACHE_TTL,
         )
-        response.raise_for_status()
-        data = response.json()
+        return WeatherForecast(**data)
 
+    async def aget_forecast(self, lat=BOSTON_LAT, lon=BOSTON_LON) -> WeatherForecast:
+        async def fetch():
+            return (await self._afetch_forecast(lat, lon)).model_dump(mode="json")
+
+        data = await self._responses().aget_or_fetch("openweather_forecast", lat, lon, fetch, ttl=FORECAST_CACHE_TTL)
+        return WeatherForecast(**data)
+
+    def _responses(self):
+        return self.cache if get_source().live else uncached
+
+    def _request(self, endpoint, lat, lon) -> ProviderRequest:
+        return ProviderRequest(
+            "openweather", endpoint, lat, lon, f"{self.BASE_URL}/{endpoint}",
+            {"lat": lat, "lon": lon, "appid": self.api_key, "units": "imperial"},
+        )
+
+    @retry_with_backoff(max_retries=PROVIDER_MAX_RETRIES, initial_delay=0.5, breaker="openweather")
+    def _fetch_current_weather(self, lat, lon) -> WeatherData:
+        return self._parse(get_source().get_json(self._request("weather", lat, lon), request_timeout(10)))
+
+    @retry_with_backoff(max_retries=PROVIDER_MAX_RETRIES, initial_delay=0.5, breaker="openweather")
+    async def _afetch_current_weather(self, lat, lon) -> WeatherData:
+        return self._parse(await get_source().aget_json(self._request("weather", lat, lon), request_timeout(10)))
+
+    @retry_with_backoff(max_retries=PROVIDER_MAX_RETRIES, initial_delay=0.5, breaker="openweather")
+    def _fetch_forecast(self, lat, lon) -> WeatherForecast:
+        return self._parse_forecast(get_source().get_json(self._request("forecast", lat, lon), request_timeout(10)))
+
+    @retry_with_backoff(max_retries=PROVIDER_MAX_RETRIES, initial_delay=0.5, breaker="openweather")
+    async def _afetch_forecast(self, lat, lon) -> WeatherForecast:
+        return self._parse_forecast(await get_source().aget_json(self._request("forecast", lat, lon), request_timeout(10)))
+
+    @staticmethod
+    def _parse_forecast(data: dict) -> WeatherForecast:
+        steps = data["list"]
+        # Times in the location's own UTC offset, so hour-of-day windows mean local hours wherever we run.
+        offset = (data.get("city") or {}).get("timezone")
+        tz = timezone(timedelta(seconds=offset)) if offset is not None else None
+        return WeatherForecast(
+            times=[datetime.fromtimestamp(step["dt"], tz) for step in steps],
+            temperature_f=[step["main"]["temp"] for step in steps],
+            feels_like_f=[step["main"]["feels_like"] for step in steps],
+            wind_speed_mph=[step["wind"]["speed"] for step in steps],
+            visibility_miles=[step.get("visibility", 10000) / 1609.34 for step in steps],
+            weather_description=[step["weather"][0]["description"] for step in steps],
+        )
+
+    @staticmethod
+    def _parse(data: dict) -> WeatherData:
         return WeatherData(
             timestamp=datetime.fromtimestamp(data["dt"]),
             temperature_f=data["main"]["temp"],
@@ -41,4 +119,4 @@ class WeatherClient:
             cloud_coverage=data["clouds"]["all"],
             visibility_miles=data.get("visibility", 10000) / 1609.34,
             pressure_hpa=data["main"]["pressure"],
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,110 @@
+"""Runs the pipeline offline over recorded provider responses (see src.data_ingestion.sources).
+
+    RECORD_CASSETTE=data/boston.jsonl.gz python -m src.scheduler   # record while running live
+    python -m src.replay data/boston.jsonl.gz --speed 60            # a minute of recording per second
+    python -m src.replay data/boston.jsonl.gz --speed max           # as fast as possible
+
+Each recorded collection becomes one run at its original time: collect_data
+reads the cassette instead of the APIs, and the risk, forecast, trend and
+action stages run as usual. Briefings come from the template engine so
+nothing goes online, and nothing is written to the briefing history. Trend
+statistics go to TRENDS_DB; the command line points it at a scratch file.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import math
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+@dataclass(slots=True)
+class ReplayResult:
+    # One summary per run, in recording order.
+    runs: list[dict] = field(default_factory=list)
+    elapsed: float = 0.0
+    recorded_seconds: float = 0.0
+    max_lag: float = 0.0  # furthest a run started behind its paced time
+
+async def _replay_run(location, at: float) -> dict:
+    from src.agents import nodes
+    from src.agents.state import create_initial_state
+
+    state = create_initial_state(location)
+    state["timestamp"] = datetime.fromtimestamp(at)
+    state.update(await nodes.acollect_data(state))
+    state.update(await nodes.aanalyze_risk(state))
+    check = nodes.check_trends if nodes.should_check_trends(state) == "check_trends" else nodes.skip_trends
+    state.update(check(state))
+    state.update(nodes.generate_actions(state))
+    state["briefing_text"] = nodes.get_template_engine().render(state)
+    return {
+        "location": location.name,
+        "timestamp": state["timestamp"],
+        "risk_score": state["risk_score"],
+        "risk_level": state["risk_level"],
+        "trend_alerts": state["trend_alerts"],
+        "errors": state["errors"],
+    }
+
+async def areplay(source, locations: Optional[list] = None, speed: float = 1.0) -> ReplayResult:
+    """Runs every location once per recorded collection of ``source`` (a ReplaySource).
+
+    ``speed`` is a multiple of real time; ``math.inf`` runs as fast as possible.
+    """
+    from src.config import DEFAULT_LOCATION
+    from src.data_ingestion.sources import use_source
+
+    locations = locations or [DEFAULT_LOCATION]
+    frames = source.frames()
+    result = ReplayResult(recorded_seconds=frames[-1] - frames[0] if frames else 0.0)
+    start = time.monotonic()
+    with use_source(source):
+        for at in frames:
+            if math.isfinite(speed):
+                delay = start + (at - frames[0]) / speed - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    result.max_lag = max(result.max_lag, -delay)
+            source.now = at
+            result.runs.extend(await asyncio.gather(*(_replay_run(location, at) for location in locations)))
+    result.elapsed = time.monotonic() - start
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cassette", type=Path)
+    parser.add_argument("--speed", default="1", help="multiple of real time, or 'max'")
+    parser.add_argument("--location", action="append", help="configured location(s); default: the first")
+    args = parser.parse_args()
+
+    # Replayed readings must not feed the live trend statistics.
+    os.environ.setdefault("TRENDS_DB", str(Path(tempfile.mkdtemp()) / "trends.db"))
+    from src.config import LOCATIONS
+    from src.data_ingestion.sources import ReplaySource
+
+    source = ReplaySource.from_cassette(args.cassette)
+    speed = math.inf if args.speed == "max" else float(args.speed)
+    locations = [LOCATIONS[name] for name in args.location] if args.location else None
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = asyncio.run(areplay(source, locations, speed))
+
+    runs = result.runs
+    if not runs:
+        print("[replay] cassette has no recordings")
+        return
+    scores = [run["risk_score"] for run in runs]
+    print(f"[replay] {len(runs)} runs covering {result.recorded_seconds / 3600:.1f} h in {result.elapsed:.2f} s "
+          f"({len(runs) / result.elapsed:.0f} runs/s, max lag {result.max_lag:.2f} s)")
+    print(f"[replay] risk {min(scores):.0f}-{max(scores):.0f}, "
+          f"{sum(bool(run['trend_alerts']) for run in runs)} runs with trend alerts, "
+          f"{sum(bool(run['errors']) for run in runs)} with errors")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Keeps a fresh briefing in the history store for every configured location.
+
+    python -m src.scheduler            # run until interrupted
+    python -m src.scheduler --once     # one pass over every location, then exit
+
+Runs are aligned to provider update times rather than to when the process
+started: each location runs every ``interval_minutes`` at
+SCHEDULE_OFFSET_MINUTES past the boundary (by default :20 and :50). The UI
+reads the newest stored result, so provider calls no longer scale with the
+number of open browser tabs. When SUBSCRIBERS_FILE lists subscribers, each
+pass also briefs them through src.agents.fanout.
+"""
+import argparse
+import asyncio
+import time
+from typing import Callable, Optional
+from src.config import LOCATIONS, SCHEDULE_OFFSET_MINUTES, Location
+
+def next_run(after: float, interval_minutes: int, offset_minutes: int = SCHEDULE_OFFSET_MINUTES) -> float:
+    """First slot strictly after ``after`` (epoch seconds) on the grid offset + k * interval."""
+    interval, offset = interval_minutes * 60, offset_minutes * 60
+    return ((after - offset) // interval + 1) * interval + offset
+
+class Scheduler:
+    def __init__(
+        self,
+        locations: Optional[list[Location]] = None,
+        offset_minutes: int = SCHEDULE_OFFSET_MINUTES,
+        history=None,
+        clock: Callable[[], float] = time.time,
+        subscribers: Optional[list] = None,
+    ):
+        if history is None:
+            from src.utils.cache import briefing_history
+            history = briefing_history
+        self.locations = locations or list(LOCATIONS.values())
+        self.offset_minutes = offset_minutes
+        self.history = history
+        self.clock = clock
+        # With subscribers (src.agents.fanout.Subscriber) each pass also briefs them from the same collection.
+        self.subscribers = subscribers or []
+        # Everything is due at startup so the UI has something to serve right away.
+        self.due_at = {location.name: 0.0 for location in self.locations}
+
+    def due(self) -> list[Location]:
+        now = self.clock()
+        return [location for location in self.locations if self.due_at[location.name] <= now]
+
+    def seconds_until_next(self) -> float:
+        return max(0.0, min(self.due_at.values()) - self.clock())
+
+    async def run_due(self) -> list[dict]:
+        """Runs every due location concurrently, stores the results and schedules the next slot."""
+        due = self.due()
+        if self.subscribers:
+            return await self._fan_out(due)
+
+        from src.agents.graph import arun_health_guardian
+
+        outcomes = await asyncio.gather(
+            *(arun_health_guardian(location=location) for location in due),
+            return_exceptions=True,
+        )
+        now = self.clock()
+        states = []
+        for location, outcome in zip(due, outcomes):
+            self.due_at[location.name] = next_run(now, location.interval_minutes, self.offset_minutes)
+            if isinstance(outcome, Exception):
+                print(f"[scheduler] {location.name} failed: {outcome}")
+                continue
+            states.append(outcome)
+            print(f"[scheduler] {location.name}: {outcome['risk_level']} ({outcome['risk_score']:.0f}/100)")
+        if states:
+            self.history.save_many(states)
+        return states
+
+    async def _fan_out(self, due: list[Location]) -> list[dict]:
+        from src.agents.fanout import afan_out
+
+        try:
+            result = await afan_out(self.subscribers, locations=due, history=self.history)
+        except Exception as e:
+            print(f"[scheduler] fan-out for {', '.join(l.name for l in due)} failed: {e}")
+            return []
+        finally:
+            now = self.clock()
+            for location in due:
+                self.due_at[location.name] = next_run(now, location.interval_minutes, self.offset_minutes)
+        for state in result.states:
+            print(f"[scheduler] {state['location'].name}: {state['risk_level']} ({state['risk_score']:.0f}/100)")
+        print(f"[scheduler] {len(result.briefings)} subscriber briefings from {result.llm_requests} LLM requests")
+        return result.states
+
+    async def run_forever(self):
+        while True:
+            await asyncio.sleep(self.seconds_until_next())
+            await self.run_due()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--once", action="store_true", help="run every location once and exit")
+    parser.add_argument("--location", action="append", choices=list(LOCATIONS), help="limit to these locations")
+    args = parser.parse_args()
+
+    from src.agents.fanout import load_subscribers
+
+    locations = [LOCATIONS[name] for name in args.location] if args.location else None
+    scheduler = Scheduler(locations, subscribers=load_subscribers())
+    try:
+        asyncio.run(scheduler.run_due() if args.once else scheduler.run_forever())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
+from src.scoring.risk_calculator import AQI_CONCERNS, HEAT_CONCERNS
 
-@dataclass
+@dataclass(slots=True)
 class ActionPlan:
     summary: str
     actions: list[dict]
@@ -19,12 +20,11 @@ class ActionGenerator:
         elif assessment.overall_score >= 50:
             actions.append({"priority": "high", "action": "Limit outdoor exposure."})
 
-        for concern in assessment.primary_concerns:
-            if "AQI" in concern:
-                mask_needed = True
-                actions.append({"priority": "high", "action": "Wear N95 mask outdoors."})
-            if "heat" in concern.lower():
-                actions.append({"priority": "medium", "action": "Stay hydrated"})
+        if assessment.concern_codes & AQI_CONCERNS:
+            mask_needed = True
+            actions.append({"priority": "high", "action": "Wear N95 mask outdoors."})
+        if assessment.concern_codes & HEAT_CONCERNS:
+            actions.append({"priority": "medium", "action": "Stay hydrated"})
         
         summary = f"{'🔴' if assessment.overall_score >= 70 else '🟡' if assessment.overall_score >= 40 else '🟢'} Risk: {assessment.overall_score:.0f}/100"
 
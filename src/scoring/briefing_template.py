@@ -0,0 +1,48 @@
+from datetime import datetime
+from src.scoring.forecast import describe_windows
+
+OPENINGS = {
+    "low": "Low-risk conditions",
+    "moderate": "Moderate-risk conditions",
+    "high": "High-risk conditions",
+    "very_high": "Very high-risk conditions",
+}
+
+class TemplateBriefingEngine:
+    """Renders briefings locally from the risk level, weather, AQI and the action plan.
+
+    Used for TEMPLATE_BRIEFING_TYPES and whenever the LLM fails, so any risk level can reach it.
+    """
+
+    def render(self, state: dict) -> str:
+        location = state.get("location")
+        place = location.name if location else "Boston"
+        lines = [self._opening(state.get("timestamp"), place, state.get("risk_level"))]
+
+        conditions = []
+        w = state.get("weather_data")
+        if w:
+            conditions.append(f"{w.temperature_f:.0f}°F, {w.weather_description}")
+        a = state.get("air_quality_data")
+        if a:
+            conditions.append(f"AQI {a.primary_aqi} ({a.category})")
+        lines.append(" | ".join(conditions) if conditions else "Live conditions are unavailable right now.")
+
+        plan = state.get("action_plan")
+        advice = [
+            "Great for outdoor exercise" if not plan or plan.outdoor_exercise_safe else "Keep outdoor exercise light",
+            "Mask recommended outdoors" if plan and plan.mask_recommended else "No mask needed",
+        ]
+        lines.append(" | ".join(advice))
+        lines.extend(f"- {action['action']}" for action in (plan.actions if plan else []))
+        lines.extend(describe_windows(state.get("risk_forecast")))
+        return "\n".join(lines)
+
+    @staticmethod
+    def _opening(timestamp, place: str, risk_level=None) -> str:
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        hour = (timestamp or datetime.now()).hour
+        greeting = "Good morning" if hour < 12 else "Good afternoon" if hour < 18 else "Good evening"
+        level = getattr(risk_level, "value", risk_level)
+        return f"{greeting}! {OPENINGS.get(level, 'Current conditions')} in {place} today."
@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+import numpy as np
+from src.config import FORECAST_HOURS
+from src.scoring.risk_calculator import RiskCalculator
+
+# Named windows as (first hour, end hour, length in hours), local time.
+WINDOWS = {
+    "morning_commute": (6, 10, 1),
+    "evening_commute": (16, 20, 1),
+    "exercise": (6, 21, 1),
+}
+WINDOW_LABELS = {"morning_commute": "morning commute", "evening_commute": "evening commute", "exercise": "exercise"}
+
+@dataclass(slots=True)
+class OutdoorWindow:
+    start: datetime
+    end: datetime
+    risk_score: float
+
+@dataclass(slots=True)
+class RiskForecast:
+    times: list[datetime]
+    risk_scores: np.ndarray
+    risk_levels: np.ndarray
+    windows: dict[str, Optional[OutdoorWindow]]
+
+class ForecastScorer:
+    """Turns bulk forecasts into an hourly risk curve scored in one calculate_batch call.
+
+    OpenWeather's 3-hourly steps (anchored at the current observation when
+    available) are interpolated to hours; AirNow's daily AQI applies to every
+    hour of its date, falling back to the current observation for today.
+    """
+
+    def __init__(self, calculator: Optional[RiskCalculator] = None, hours: int = FORECAST_HOURS, windows: dict = WINDOWS):
+        self.calculator = calculator or RiskCalculator()
+        self.hours = hours
+        self.windows = windows
+
+    def hourly_inputs(self, weather_forecast, aqi_forecast, current_weather=None, current_aqi=None, now=None) -> dict:
+        weather_forecast = _non_empty(weather_forecast)
+        now = now or datetime.now()
+        tz = weather_forecast.times[0].tzinfo if weather_forecast else None
+        if tz is not None:
+            now = now.astimezone(tz)  # hours and dates on the grid are the location's own
+        start = now.replace(minute=0, second=0, microsecond=0)
+        times = [start + timedelta(hours=h) for h in range(self.hours)]
+        t = np.array([ts.timestamp() for ts in times])
+        missing = np.full(len(times), np.nan)
+
+        inputs = {"times": times, "feels_like_f": missing, "wind_speed_mph": missing, "visibility_miles": missing}
+        if weather_forecast:
+            xp = [ts.timestamp() for ts in weather_forecast.times]
+            series = {key: list(getattr(weather_forecast, key)) for key in ("feels_like_f", "wind_speed_mph", "visibility_miles")}
+            if current_weather and current_weather.timestamp.timestamp() < xp[0]:
+                xp.insert(0, current_weather.timestamp.timestamp())
+                for key in series:
+                    series[key].insert(0, getattr(current_weather, key))
+            for key, fp in series.items():
+                inputs[key] = np.interp(t, xp, fp)
+
+        daily = {}
+        if _non_empty(aqi_forecast):
+            daily = dict(zip(aqi_forecast.dates, aqi_forecast.aqi))
+        if current_aqi:
+            daily.setdefault(now.date(), current_aqi.primary_aqi)
+        inputs["aqi"] = np.array([daily.get(ts.date(), np.nan) for ts in times], dtype=np.float64)
+        return inputs
+
+    def score(self, weather_forecast, aqi_forecast, current_weather=None, current_aqi=None, now=None) -> Optional[RiskForecast]:
+        """Hourly curve plus the lowest-risk window of each kind, or None without any forecast."""
+        if not _non_empty(weather_forecast) and not _non_empty(aqi_forecast):
+            return None
+        inputs = self.hourly_inputs(weather_forecast, aqi_forecast, current_weather, current_aqi, now)
+        batch = self.calculator.calculate_batch(
+            inputs["feels_like_f"], inputs["wind_speed_mph"], inputs["visibility_miles"], inputs["aqi"],
+        )
+        times = inputs["times"]
+        return RiskForecast(
+            times=times,
+            risk_scores=np.round(batch.overall_score, 1),
+            risk_levels=batch.risk_level,
+            windows={name: self.best_window(times, batch.overall_score, *spec) for name, spec in self.windows.items()},
+        )
+
+    @staticmethod
+    def best_window(times: list, scores: np.ndarray, first_hour: int, end_hour: int, length: int) -> Optional[OutdoorWindow]:
+        """Lowest mean risk over ``length`` consecutive hours inside [first_hour, end_hour) on the next day that has room."""
+        if len(times) < length:
+            return None
+        means = np.convolve(scores, np.ones(length) / length, mode="valid")
+        hours = np.array([ts.hour for ts in times[:len(means)]])
+        days = np.array([ts.toordinal() for ts in times[:len(means)]])
+        eligible = (hours >= first_hour) & (hours + length <= end_hour)
+        if not eligible.any():
+            return None
+        eligible &= days == days[eligible.argmax()]
+        candidates = np.flatnonzero(eligible)
+        best = candidates[means[candidates].argmin()]
+        return OutdoorWindow(times[best], times[best] + timedelta(hours=length), round(float(means[best]), 1))
+
+def _non_empty(forecast):
+    """``forecast`` if it has any steps; an empty one counts as missing."""
+    if forecast is None:
+        return None
+    return forecast if (forecast.times if hasattr(forecast, "times") else forecast.dates) else None
+
+def describe_windows(risk_forecast: Optional[RiskForecast]) -> list[str]:
+    """One line per best window, e.g. "Best time for exercise: 7am-8am (risk 12)"."""
+    if risk_forecast is None:
+        return []
+    return [_describe(name, w.start, w.end, w.risk_score) for name, w in risk_forecast.windows.items() if w]
+
+def describe_window_records(forecast_record: Optional[dict]) -> list[str]:
+    """describe_windows for a RiskForecast that went through to_record (stored history, the UI)."""
+    if not forecast_record:
+        return []
+    return [
+        _describe(name, datetime.fromisoformat(w["start"]), datetime.fromisoformat(w["end"]), w["risk_score"])
+        for name, w in forecast_record["windows"].items() if w
+    ]
+
+def _describe(name: str, start: datetime, end: datetime, risk_score: float) -> str:
+    return f"Best time for {WINDOW_LABELS.get(name, name)}: {_clock(start)}-{_clock(end)} (risk {risk_score:.0f})"
+
+def _clock(ts: datetime) -> str:
+    return f"{ts.hour % 12 or 12}{'am' if ts.hour < 12 else 'pm'}"
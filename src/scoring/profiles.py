@@ -0,0 +1,130 @@
+from dataclasses import dataclass, field
+import numpy as np
+from src.scoring.risk_calculator import (
+    BatchAssessment, Concern, RiskCalculator, LEVEL_BREAKPOINTS, LEVEL_VALUES,
+)
+
+WEIGHT_KEYS = ("air_quality", "temperature", "wind", "visibility")
+
+@dataclass(frozen=True, slots=True)
+class RiskProfile:
+    """Weights and breakpoints for one group; the defaults reproduce RiskCalculator."""
+    name: str
+    audience: str = "commuters"  # who the briefing addresses
+    weights: dict = field(default_factory=lambda: {key: RiskCalculator.WEIGHTS[key] for key in WEIGHT_KEYS})
+    aqi_breakpoints: tuple = (50, 100, 150)  # top of Good, Moderate, Unhealthy for Sensitive Groups
+    cold_f: tuple = (20, 32)  # very cold, freezing
+    heat_f: tuple = (80, 90, 100)  # warm, hot, extreme heat
+    comfort_f: float = 70
+    wind_mph: tuple = (20, 30)  # breezy, high wind
+    visibility_miles: tuple = (1, 3)  # low, reduced
+    level_breakpoints: tuple = tuple(LEVEL_BREAKPOINTS.tolist())
+
+PROFILES = {
+    "general": RiskProfile("general"),
+    # Airways react to moderate pollution and cold air.
+    "asthma": RiskProfile(
+        "asthma", "people with asthma",
+        weights={"air_quality": 0.5, "temperature": 0.2, "wind": 0.1, "visibility": 0.1},
+        aqi_breakpoints=(35, 75, 100), cold_f=(25, 40), level_breakpoints=(25, 40, 60),
+    ),
+    # Weaker thermoregulation in both directions.
+    "elderly": RiskProfile(
+        "elderly", "older adults",
+        weights={"air_quality": 0.35, "temperature": 0.35, "wind": 0.1, "visibility": 0.15},
+        cold_f=(25, 35), heat_f=(78, 85, 95), level_breakpoints=(25, 45, 65),
+    ),
+    # Hours of exposure and exertion rather than a commute.
+    "outdoor_worker": RiskProfile(
+        "outdoor_worker", "people working outdoors",
+        weights={"air_quality": 0.35, "temperature": 0.35, "wind": 0.15, "visibility": 0.15},
+        heat_f=(80, 88, 98), wind_mph=(15, 25),
+    ),
+    # High ventilation rate; heat builds quickly.
+    "runner": RiskProfile(
+        "runner", "runners",
+        weights={"air_quality": 0.45, "temperature": 0.3, "wind": 0.1, "visibility": 0.15},
+        aqi_breakpoints=(40, 80, 120), heat_f=(75, 85, 95), level_breakpoints=(25, 45, 65),
+    ),
+}
+
+class ProfileScorer:
+    """Scores one environmental snapshot against many profiles in a single vectorized pass.
+
+    Profile parameters are packed into columns once at construction, so
+    scoring a snapshot costs a few array operations regardless of how many
+    users share it. Row ``i`` of the result belongs to ``profiles[i]``.
+    """
+
+    def __init__(self, profiles: list[RiskProfile]):
+        self.names = np.array([p.name for p in profiles])
+        self.weights = np.array([[p.weights.get(key, 0.0) for key in WEIGHT_KEYS] for p in profiles], dtype=np.float64)
+        aqi = np.array([p.aqi_breakpoints for p in profiles], dtype=np.float64)
+        self.aqi_bands = aqi.T
+        # Piecewise-linear AQI score: 0-20, 20-50, 50-80 across the bands, then the first band's slope
+        # (RiskCalculator's 0.4 per point above 150 is 20/50).
+        self.aqi_slopes = np.stack([20 / aqi[:, 0], 30 / (aqi[:, 1] - aqi[:, 0]), 30 / (aqi[:, 2] - aqi[:, 1])])
+        self.cold = np.array([p.cold_f for p in profiles], dtype=np.float64).T
+        self.heat = np.array([p.heat_f for p in profiles], dtype=np.float64).T
+        self.comfort = np.array([p.comfort_f for p in profiles], dtype=np.float64)
+        self.wind = np.array([p.wind_mph for p in profiles], dtype=np.float64).T
+        self.visibility = np.array([p.visibility_miles for p in profiles], dtype=np.float64).T
+        self.levels = np.array([p.level_breakpoints for p in profiles], dtype=np.float64).T
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def score(self, weather, air_quality) -> BatchAssessment:
+        """``weather`` and ``air_quality`` are the provider models (or None), as in RiskCalculator.calculate."""
+        n = len(self)
+        codes = np.zeros(n, dtype=np.uint16)
+        numerator = np.zeros(n)
+        total_weight = np.zeros(n)
+        n_scores = 0
+
+        if air_quality is not None:
+            aqi = float(air_quality.primary_aqi)
+            b1, b2, b3 = self.aqi_bands
+            s1, s2, s3 = self.aqi_slopes
+            bands = [aqi <= b1, aqi <= b2, aqi <= b3]
+            aqi_score = np.minimum(np.select(bands, [aqi * s1, 20 + (aqi - b1) * s2, 50 + (aqi - b2) * s3],
+                                             80 + (aqi - b3) * s1), 100)
+            codes |= np.select(bands, [Concern.NONE, Concern.AQI_MODERATE, Concern.AQI_SENSITIVE],
+                               Concern.AQI_UNHEALTHY).astype(np.uint16)
+            numerator = numerator + aqi_score * self.weights[:, 0]
+            total_weight = total_weight + self.weights[:, 0]
+            n_scores += 1
+
+        if weather is not None:
+            temp = float(weather.feels_like_f)
+            very_cold, freezing = self.cold
+            warm, hot, extreme = self.heat
+            bands = [temp < very_cold, temp < freezing, temp > extreme, temp > hot, temp > warm]
+            temp_score = np.minimum(np.select(bands, [70, 50, 90, 60, 30], np.abs(temp - self.comfort) * 2), 100)
+            codes |= np.select(bands, [Concern.VERY_COLD, Concern.FREEZING, Concern.EXTREME_HEAT, Concern.HOT, Concern.NONE],
+                               Concern.NONE).astype(np.uint16)
+
+            wind = float(weather.wind_speed_mph)
+            breezy, high = self.wind
+            wind_score = np.minimum(np.select([wind > high, wind > breezy], [60, 30], wind), 100)
+            codes |= np.where(wind > high, Concern.HIGH_WIND, Concern.NONE).astype(np.uint16)
+
+            visibility = float(weather.visibility_miles)
+            low, reduced = self.visibility
+            vis_score = np.select([visibility < low, visibility < reduced], [70, 40], 0)
+            codes |= np.where(visibility < low, Concern.LOW_VISIBILITY, Concern.NONE).astype(np.uint16)
+
+            for column, score in ((1, temp_score), (2, wind_score), (3, vis_score)):
+                numerator = numerator + score * self.weights[:, column]
+                total_weight = total_weight + self.weights[:, column]
+            n_scores += 3
+
+        overall = np.divide(numerator, total_weight, out=np.zeros(n), where=total_weight > 0)
+        level_index = (overall[None, :] >= self.levels).sum(axis=0)
+        confidence = "high" if n_scores >= 3 else "medium" if n_scores >= 1 else "low"
+        return BatchAssessment(
+            overall_score=overall,
+            risk_level=LEVEL_VALUES[level_index],
+            confidence=np.full(n, confidence),
+            concern_codes=codes,
+        )
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
-from enum import Enum
+from enum import Enum, IntFlag
 from typing import Optional
+import numpy as np
 
 class RiskLevel(str, Enum):
     LOW = "low"
@@ -8,12 +9,58 @@ class RiskLevel(str, Enum):
     HIGH = "high"
     VERY_HIGH = "very_high"
 
-@dataclass
+class Concern(IntFlag):
+    NONE = 0
+    AQI_MODERATE = 1
+    AQI_SENSITIVE = 2
+    AQI_UNHEALTHY = 4
+    VERY_COLD = 8
+    FREEZING = 16
+    EXTREME_HEAT = 32
+    HOT = 64
+    HIGH_WIND = 128
+    LOW_VISIBILITY = 256
+
+AQI_CONCERNS = Concern.AQI_MODERATE | Concern.AQI_SENSITIVE | Concern.AQI_UNHEALTHY
+HEAT_CONCERNS = Concern.HOT | Concern.EXTREME_HEAT
+
+def concern_names(codes) -> list[str]:
+    """["aqi_moderate", "hot", ...] for a Concern value or a uint16 code from a batch."""
+    codes = Concern(int(codes))
+    return [concern.name.lower() for concern in Concern if concern in codes]
+
+LEVEL_VALUES = np.array([level.value for level in RiskLevel])
+LEVEL_BREAKPOINTS = np.array([30, 50, 70])
+
+@dataclass(slots=True)
 class RiskAssessment:
     overall_score: float
     risk_level: RiskLevel
     confidence: str
     primary_concerns: list[str]
+    concern_codes: Concern = Concern.NONE
+
+@dataclass
+class BatchAssessment:
+    """Columnar result of RiskCalculator.calculate_batch, one entry per row."""
+    overall_score: np.ndarray
+    risk_level: np.ndarray
+    confidence: np.ndarray
+    concern_codes: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.overall_score)
+
+    def at(self, i: int) -> RiskAssessment:
+        """Row ``i`` as a scalar assessment, e.g. to feed ActionGenerator for one user."""
+        codes = Concern(int(self.concern_codes[i]))
+        return RiskAssessment(
+            overall_score=float(self.overall_score[i]),
+            risk_level=RiskLevel(self.risk_level[i]),
+            confidence=str(self.confidence[i]),
+            primary_concerns=concern_names(codes),
+            concern_codes=codes,
+        )
 
 class RiskCalculator:
     WEIGHTS = {
@@ -27,6 +74,7 @@ class RiskCalculator:
     def calculate(self, weather, air_quality) -> RiskAssessment:
         scores = []
         concerns = []
+        codes = Concern.NONE
         
         if air_quality is not None:
             aqi = air_quality.primary_aqi
@@ -35,12 +83,15 @@ class RiskCalculator:
             elif aqi <= 100:
                 aqi_score = 20 + (aqi - 50) * 0.6
                 concerns.append(f"AQI moderate ({aqi})")
+                codes |= Concern.AQI_MODERATE
             elif aqi <= 150:
                 aqi_score = 50 + (aqi - 100) * 0.6
                 concerns.append(f"AQI unhealthy for sensitive groups ({aqi})")
+                codes |= Concern.AQI_SENSITIVE
             else:
                 aqi_score = 80 + (aqi - 150) * 0.4
                 concerns.append(f"AQI unhealthy ({aqi})")
+                codes |= Concern.AQI_UNHEALTHY
             scores.append(("air_quality", min(aqi_score, 100)))
         
         if weather is not None:
@@ -49,15 +100,19 @@ class RiskCalculator:
             if temp < 20:
                 temp_score = 70
                 concerns.append(f"Very cold ({temp:.0f}°F)")
+                codes |= Concern.VERY_COLD
             elif temp < 32:
                 temp_score = 50
                 concerns.append(f"Freezing ({temp:.0f}°F)")
+                codes |= Concern.FREEZING
             elif temp > 100:
                 temp_score = 90
                 concerns.append(f"Extreme heat ({temp:.0f}°F)")
+                codes |= Concern.EXTREME_HEAT
             elif temp > 90:
                 temp_score = 60
                 concerns.append(f"Hot weather ({temp:.0f}°F)")
+                codes |= Concern.HOT
             elif temp > 80:
                 temp_score = 30
             else:
@@ -68,6 +123,7 @@ class RiskCalculator:
             if wind > 30:
                 wind_score = 60
                 concerns.append(f"High winds ({wind:.0f} mph)")
+                codes |= Concern.HIGH_WIND
             elif wind > 20:
                 wind_score = 30
             else:
@@ -78,6 +134,7 @@ class RiskCalculator:
             if visibility < 1:
                 vis_score = 70
                 concerns.append(f"Low visibility ({visibility:.1f} mi)")
+                codes |= Concern.LOW_VISIBILITY
             elif visibility < 3:
                 vis_score = 40
             else:
@@ -99,6 +156,77 @@ class RiskCalculator:
             risk_level=level,
             confidence=confidence,
             primary_concerns=concerns[:5],
+            concern_codes=codes,
+        )
+
+    def calculate_batch(self, feels_like_f, wind_speed_mph, visibility_miles, aqi) -> BatchAssessment:
+        """Vectorized equivalent of calculate() over columnar inputs.
+
+        Accepts NumPy arrays or pandas Series of equal length. A NaN feels-like
+        temperature marks a row without weather data and a NaN AQI marks a row
+        without air quality data, mirroring the ``None`` inputs of calculate().
+        Results are bit-for-bit identical to the scalar path.
+        """
+        temp = np.asarray(feels_like_f, dtype=np.float64)
+        wind = np.asarray(wind_speed_mph, dtype=np.float64)
+        visibility = np.asarray(visibility_miles, dtype=np.float64)
+        aqi = np.asarray(aqi, dtype=np.float64)
+
+        has_aqi = ~np.isnan(aqi)
+        has_weather = ~np.isnan(temp)
+        codes = np.zeros(aqi.shape, dtype=np.uint16)
+
+        with np.errstate(invalid="ignore"):
+            aqi_bands = [aqi <= 50, aqi <= 100, aqi <= 150]
+            aqi_score = np.minimum(np.select(
+                aqi_bands,
+                [aqi * 0.4, 20 + (aqi - 50) * 0.6, 50 + (aqi - 100) * 0.6],
+                80 + (aqi - 150) * 0.4,
+            ), 100)
+            aqi_codes = np.select(
+                aqi_bands,
+                [Concern.NONE, Concern.AQI_MODERATE, Concern.AQI_SENSITIVE],
+                Concern.AQI_UNHEALTHY,
+            )
+            codes |= np.where(has_aqi, aqi_codes, 0).astype(np.uint16)
+
+            temp_bands = [temp < 20, temp < 32, temp > 100, temp > 90, temp > 80]
+            temp_score = np.minimum(np.select(
+                temp_bands, [70, 50, 90, 60, 30], np.abs(temp - 70) * 2,
+            ), 100)
+            temp_codes = np.select(
+                temp_bands,
+                [Concern.VERY_COLD, Concern.FREEZING, Concern.EXTREME_HEAT, Concern.HOT, Concern.NONE],
+                Concern.NONE,
+            )
+
+            wind_score = np.minimum(np.select([wind > 30, wind > 20], [60, 30], wind), 100)
+            wind_codes = np.where(wind > 30, Concern.HIGH_WIND, Concern.NONE)
+
+            vis_score = np.select([visibility < 1, visibility < 3], [70, 40], 0)
+            vis_codes = np.where(visibility < 1, Concern.LOW_VISIBILITY, Concern.NONE)
+
+            codes |= np.where(has_weather, temp_codes | wind_codes | vis_codes, 0).astype(np.uint16)
+
+        # Accumulate in the same order as the scalar path so float rounding matches.
+        w = self.WEIGHTS
+        aqi_weight = np.where(has_aqi, w["air_quality"], 0.0)
+        weather_weights = [(temp_score, w["temperature"]), (wind_score, w["wind"]), (vis_score, w["visibility"])]
+        numerator = np.where(has_aqi, aqi_score * w["air_quality"], 0.0)
+        total_weight = aqi_weight
+        for score, weight in weather_weights:
+            numerator = numerator + np.where(has_weather, score * weight, 0.0)
+            total_weight = total_weight + np.where(has_weather, weight, 0.0)
+
+        n_scores = has_aqi.astype(np.int8) + has_weather.astype(np.int8) * 3
+        with np.errstate(invalid="ignore", divide="ignore"):
+            overall = np.where(n_scores > 0, numerator / total_weight, 0.0)
+
+        return BatchAssessment(
+            overall_score=overall,
+            risk_level=LEVEL_VALUES[np.digitize(overall, LEVEL_BREAKPOINTS)],
+            confidence=np.select([n_scores >= 3, n_scores >= 1], ["high", "medium"], "low"),
+            concern_codes=codes,
         )
     
     def _get_level(self, score: float) -> RiskLevel:
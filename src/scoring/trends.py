@@ -0,0 +1,162 @@
+import json
+import math
+import sqlite3
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from src.config import (
+    TRENDS_DB, TREND_EWMA_ALPHA, TREND_Z_THRESHOLD, TREND_WARMUP, TREND_WINDOW_HOURS,
+)
+
+LABELS = {"aqi": "AQI", "feels_like_f": "feels-like temperature", "risk_score": "risk score"}
+
+# Rapid-change rules over the last TREND_WINDOW_HOURS: ("ratio", factor, floor) fires when
+# the value reaches factor x the window minimum and at least floor; ("delta", amount) on
+# an absolute rise or fall.
+RAPID_CHANGE = {
+    "aqi": ("ratio", 2.0, 50),
+    "feels_like_f": ("delta", 15.0),
+    "risk_score": ("delta", 25.0),
+}
+
+@dataclass
+class MetricStats:
+    """Streaming statistics for one location and metric; each update is O(1)."""
+    count: int = 0
+    mean: float = 0.0
+    var: float = 0.0
+    cusum_pos: float = 0.0
+    cusum_neg: float = 0.0
+    last_ts: float = 0.0
+    # (timestamp, value) pairs inside the rapid-change window; one per new provider observation.
+    window: list = field(default_factory=list)
+
+def _epoch(timestamp) -> float:
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    return (timestamp or datetime.now()).timestamp()
+
+class TrendDetector:
+    """EWMA z-score, two-sided CUSUM and rapid-change rules per location and metric.
+
+    State lives in SQLite and each update is a read-modify-write of one row per
+    metric inside a single transaction, so runs never rescan history and
+    separate processes (UI, scheduler, API) share the same statistics.
+    """
+
+    CUSUM_K = 0.5
+    CUSUM_H = 5.0
+
+    def __init__(
+        self,
+        db_path: Path = TRENDS_DB,
+        alpha: float = TREND_EWMA_ALPHA,
+        z_threshold: float = TREND_Z_THRESHOLD,
+        warmup: int = TREND_WARMUP,
+        window_hours: float = TREND_WINDOW_HOURS,
+    ):
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.warmup = warmup
+        self.window_seconds = window_hours * 3600
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(Path(db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS trend_state "
+            "(location TEXT NOT NULL, metric TEXT NOT NULL, state TEXT NOT NULL, PRIMARY KEY (location, metric))"
+        )
+
+    def update(self, location: str, timestamp, values: dict, observed: Optional[dict] = None) -> list[str]:
+        """Folds one observation per metric into the stored statistics and returns alert messages.
+
+        ``observed`` maps metrics to their own observation times, overriding
+        ``timestamp``. Missing values and observations not newer than the last
+        one are ignored.
+        """
+        observed = observed or {}
+        alerts = []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for metric, value in values.items():
+                    if value is None or (isinstance(value, float) and math.isnan(value)):
+                        continue
+                    ts = _epoch(observed.get(metric) or timestamp)
+                    stats = self._load(location, metric)
+                    if stats.count and ts <= stats.last_ts:
+                        continue
+                    alerts.extend(self._update(metric, stats, ts, float(value)))
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO trend_state (location, metric, state) VALUES (?, ?, ?)",
+                        (location, metric, json.dumps(asdict(stats))),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return alerts
+
+    def stats(self, location: str, metric: str) -> MetricStats:
+        with self._lock:
+            return self._load(location, metric)
+
+    def _load(self, location: str, metric: str) -> MetricStats:
+        row = self._conn.execute(
+            "SELECT state FROM trend_state WHERE location = ? AND metric = ?", (location, metric)
+        ).fetchone()
+        return MetricStats(**json.loads(row[0])) if row else MetricStats()
+
+    def _update(self, metric: str, stats: MetricStats, ts: float, value: float) -> list[str]:
+        label = LABELS.get(metric, metric)
+        alerts = []
+
+        stats.window = [(t, v) for t, v in stats.window if ts - t <= self.window_seconds]
+        rapid = self._rapid_change(metric, stats.window, value)
+        if rapid:
+            alerts.append(f"Rapid change in {label}: {rapid}")
+        stats.window.append((ts, value))
+
+        if stats.count == 0:
+            stats.mean = value
+        else:
+            diff = value - stats.mean
+            if stats.count >= self.warmup and stats.var > 0:
+                z = diff / math.sqrt(stats.var)
+                if abs(z) >= self.z_threshold:
+                    direction = "high" if z > 0 else "low"
+                    alerts.append(f"Unusually {direction} {label}: {value:.0f} vs typical {stats.mean:.0f} (z={z:+.1f})")
+                stats.cusum_pos = max(0.0, stats.cusum_pos + z - self.CUSUM_K)
+                stats.cusum_neg = max(0.0, stats.cusum_neg - z - self.CUSUM_K)
+                if stats.cusum_pos > self.CUSUM_H:
+                    alerts.append(f"Sustained rise in {label}")
+                    stats.cusum_pos = 0.0
+                if stats.cusum_neg > self.CUSUM_H:
+                    alerts.append(f"Sustained drop in {label}")
+                    stats.cusum_neg = 0.0
+            stats.mean += self.alpha * diff
+            stats.var = (1 - self.alpha) * (stats.var + self.alpha * diff * diff)
+        stats.count += 1
+        stats.last_ts = ts
+        return alerts
+
+    def _rapid_change(self, metric: str, window: list, value: float) -> Optional[str]:
+        rule = RAPID_CHANGE.get(metric)
+        if not rule or not window:
+            return None
+        hours = self.window_seconds / 3600
+        values = [v for _, v in window]
+        if rule[0] == "ratio":
+            _, factor, floor = rule
+            low = min(values)
+            if value >= floor and low > 0 and value >= factor * low:
+                return f"{low:.0f} → {value:.0f} within {hours:g}h"
+            return None
+        _, amount = rule
+        low, high = min(values), max(values)
+        if value - low >= amount:
+            return f"up {value - low:.0f} within {hours:g}h ({low:.0f} → {value:.0f})"
+        if high - value >= amount:
+            return f"down {high - value:.0f} within {hours:g}h ({high:.0f} → {value:.0f})"
+        return None
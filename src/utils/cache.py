@@ -1,42 +1,481 @@
+import asyncio
+import contextvars
 import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from src.config import CACHE_DIR, OUTPUT_DIR
+from typing import Any, Awaitable, Callable, Optional
+from collections import OrderedDict
+from src.config import (
+    CACHE_DIR, OUTPUT_DIR, CACHE_COORD_PRECISION, CACHE_MAX_STALE,
+    BRIEFING_CACHE_TTL, BRIEFING_CACHE_SIZE,
+)
+from src.utils.metrics import CACHE_REQUESTS
+from src.utils.observations import observation_store
+from src.utils.records import to_record
+
+class FetchTrace:
+    """What one provider call did underneath: lookups served from cache and seconds spent upstream."""
+
+    __slots__ = ("cached", "upstream")
 
-class BriefingHistory:
     def __init__(self):
-        self.output_dir = OUTPUT_DIR
-    
-    def save(self, state: dict) -> Path:
-        timestamp = state.get("timestamp", datetime.now())
-        if isinstance(timestamp, str):
-            timestamp = datetime.fromisoformat(timestamp)
-        
-        filename = f"briefing_{timestamp.strftime('%Y%m%d_%H%M%S')}.json"
-        filepath = self.output_dir / filename
-        
-        record = {
-            "timestamp": timestamp.isoformat(),
-            "risk_score": state.get("risk_score"),
-            "risk_level": state.get("risk_level"),
-            "briefing_text": state.get("briefing_text"),
-        }
-        
-        with open(filepath, "w") as f:
-            json.dump(record, f, indent=2)
-        
-        return filepath
-    
-    def get_recent(self, days=7) -> list[dict]:
-        cutoff = datetime.now() - timedelta(days=days)
-        briefings = []
-        
-        for fp in sorted(self.output_dir.glob("briefing_*.json"), reverse=True):
-            with open(fp) as f:
-                record = json.load(f)
-            if datetime.fromisoformat(record["timestamp"]) >= cutoff:
-                briefings.append(record)
-        
-        return briefings
-
-briefing_history = BriefingHistory()
\ No newline at end of file
+        self.cached = 0
+        self.upstream = []
+
+_trace = contextvars.ContextVar("fetch_trace", default=None)
+
+@contextmanager
+def trace_fetches():
+    """Collects a FetchTrace of the ResponseCache lookups made inside the block, worker threads included."""
+    trace = FetchTrace()
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+class ResponseCache:
+    """Disk-backed TTL cache for provider responses, keyed by quantized lat/lon.
+
+    Entries younger than ``ttl`` are served directly. Entries past ``ttl`` but
+    within ``max_stale`` are served immediately while a background thread
+    refreshes them. Anything older is fetched synchronously.
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, precision: int = CACHE_COORD_PRECISION, max_stale: int = CACHE_MAX_STALE):
+        self.cache_dir = Path(cache_dir)
+        self.precision = precision
+        self.max_stale = max_stale
+        self._memory = {}
+        self._refreshing = set()
+        self._tasks = set()
+        self._lock = threading.Lock()
+
+    def key(self, provider: str, lat: float, lon: float) -> str:
+        return f"{provider}_{lat:.{self.precision}f}_{lon:.{self.precision}f}"
+
+    def get_or_fetch(self, provider: str, lat: float, lon: float, fetch: Callable[[], Any], ttl: int) -> Any:
+        key = self.key(provider, lat, lon)
+        entry = self._read(key)
+        if entry is not None:
+            age = time.time() - entry["fetched_at"]
+            if age < ttl:
+                CACHE_REQUESTS.inc(cache=provider, result="hit")
+                return self._served(entry)
+            if age < ttl + self.max_stale:
+                CACHE_REQUESTS.inc(cache=provider, result="stale")
+                self._refresh_in_background(key, fetch)
+                return self._served(entry)
+        CACHE_REQUESTS.inc(cache=provider, result="miss")
+        start = time.perf_counter()
+        value = self._fetch_and_store(key, fetch)
+        self._fetched(time.perf_counter() - start)
+        return value
+
+    async def aget_or_fetch(self, provider: str, lat: float, lon: float, fetch: Callable[[], Awaitable[Any]], ttl: int) -> Any:
+        """Async variant of get_or_fetch; refreshes run as tasks on the current loop."""
+        key = self.key(provider, lat, lon)
+        entry = self._read(key)
+        if entry is not None:
+            age = time.time() - entry["fetched_at"]
+            if age < ttl:
+                CACHE_REQUESTS.inc(cache=provider, result="hit")
+                return self._served(entry)
+            if age < ttl + self.max_stale:
+                CACHE_REQUESTS.inc(cache=provider, result="stale")
+                self._arefresh_in_background(key, fetch)
+                return self._served(entry)
+        CACHE_REQUESTS.inc(cache=provider, result="miss")
+        start = time.perf_counter()
+        value = await self._afetch_and_store(key, fetch)
+        self._fetched(time.perf_counter() - start)
+        return value
+
+    @staticmethod
+    def _served(entry: dict) -> Any:
+        trace = _trace.get()
+        if trace is not None:
+            trace.cached += 1
+        return entry["value"]
+
+    @staticmethod
+    def _fetched(seconds: float):
+        trace = _trace.get()
+        if trace is not None:
+            trace.upstream.append(seconds)
+
+    def _fetch_and_store(self, key: str, fetch: Callable[[], Any]) -> Any:
+        value = fetch()
+        if value is not None:
+            self._write(key, {"fetched_at": time.time(), "value": value})
+        return value
+
+    def _refresh_in_background(self, key: str, fetch: Callable[[], Any]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._fetch_and_store(key, fetch)
+            except Exception as e:
+                print(f"Cache refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    async def _afetch_and_store(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        value = await fetch()
+        if value is not None:
+            self._write(key, {"fetched_at": time.time(), "value": value})
+        return value
+
+    def _arefresh_in_background(self, key: str, fetch: Callable[[], Awaitable[Any]]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        async def refresh():
+            try:
+                await self._afetch_and_store(key, fetch)
+            except Exception as e:
+                print(f"Cache refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _read(self, key: str) -> Optional[dict]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            return entry
+        try:
+            with open(self.cache_dir / f"{key}.json") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._memory[key] = entry
+        return entry
+
+    def _write(self, key: str, entry: dict):
+        self._memory[key] = entry
+        path = self.cache_dir / f"{key}.json"
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(entry, f, default=str)
+        os.replace(tmp, path)
+
+class LatestResultCache:
+    """Most recent run result per key, shared across sessions for ``ttl`` seconds."""
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[tuple[Any, datetime]]:
+        with self._lock:
+            entry = self._results.get(key)
+        if entry is None or (datetime.now() - entry[1]).total_seconds() >= self.ttl:
+            return None
+        return entry
+
+    def put(self, key: str, result: Any) -> datetime:
+        produced_at = datetime.now()
+        with self._lock:
+            self._results[key] = (result, produced_at)
+        return produced_at
+
+class BriefingCache:
+    """LRU + TTL cache of LLM briefings keyed by a quantized fingerprint of the prompt inputs.
+
+    Entries live in memory and in a small SQLite file so they survive restarts.
+    """
+
+    TEMP_BAND_F = 5
+
+    def __init__(self, db_path: Path = CACHE_DIR / "briefings.db", ttl: int = BRIEFING_CACHE_TTL, max_entries: int = BRIEFING_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(Path(db_path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS briefing_cache "
+                "(key TEXT PRIMARY KEY, created_at REAL NOT NULL, last_used REAL NOT NULL, text TEXT NOT NULL)"
+            )
+
+    @classmethod
+    def fingerprint(cls, state: dict) -> str:
+        """Conditions that would produce an equivalent briefing map to the same key."""
+        weather = state.get("weather_data")
+        aqi = state.get("air_quality_data")
+        temp_band = "na"
+        condition = "na"
+        if weather:
+            temp_band = int(weather.temperature_f // cls.TEMP_BAND_F * cls.TEMP_BAND_F)
+            condition = weather.weather_description
+        category = aqi.category if aqi else "na"
+        urgent = state.get("risk_score", 0) >= 70
+        location = state.get("location")
+        place = location.name if location else ""
+        trends = "+".join(sorted(state.get("trend_alerts") or [])) or "-"
+        forecast = state.get("risk_forecast")
+        windows = sorted(forecast.windows.items()) if forecast else []
+        best = "+".join(f"{name}@{w.start.hour}" for name, w in windows if w) or "-"
+        profile = state.get("profile") or "general"
+        return f"{place}|{profile}|{state.get('risk_level')}|{category}|{temp_band}|{condition}|{int(urgent)}|{trends}|{best}"
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._conn:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._conn.execute(
+                    "SELECT created_at, text FROM briefing_cache WHERE key = ?", (key,)
+                ).fetchone()
+            if entry is None:
+                CACHE_REQUESTS.inc(cache="briefing", result="miss")
+                return None
+            created_at, text = entry
+            if now - created_at >= self.ttl:
+                self._entries.pop(key, None)
+                CACHE_REQUESTS.inc(cache="briefing", result="miss")
+                return None
+            CACHE_REQUESTS.inc(cache="briefing", result="hit")
+            self._entries[key] = (created_at, text)
+            self._entries.move_to_end(key)
+            self._evict()
+            self._conn.execute("UPDATE briefing_cache SET last_used = ? WHERE key = ?", (now, key))
+            return text
+
+    def put(self, key: str, text: str):
+        now = time.time()
+        with self._lock, self._conn:
+            self._entries[key] = (now, text)
+            self._entries.move_to_end(key)
+            self._evict()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO briefing_cache (key, created_at, last_used, text) VALUES (?, ?, ?, ?)",
+                (key, now, now, text),
+            )
+            self._conn.execute("DELETE FROM briefing_cache WHERE created_at < ?", (now - self.ttl,))
+            self._conn.execute(
+                "DELETE FROM briefing_cache WHERE key NOT IN "
+                "(SELECT key FROM briefing_cache ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+class BriefingHistory:
+    """Briefing history in SQLite with an index on timestamp.
+
+    Range queries are an index seek plus the matching rows, writes are
+    appended with autoincrement ids so runs in the same second never collide,
+    and ``save_many`` commits a whole batch in one transaction. Each row also
+    keeps its location and the full final state as JSON, so ``latest`` can serve
+    a precomputed briefing without running the pipeline. Legacy
+    ``briefing_*.json`` files in ``legacy_dir`` are imported once on startup.
+    """
+
+    INSERT = (
+        "INSERT INTO briefings (timestamp, risk_score, risk_level, briefing_text, location, payload) "
+        "VALUES (?, ?, ?, ?, ?, ?)"
+    )
+    INSERT_SUBSCRIBER = (
+        "INSERT INTO subscriber_briefings "
+        "(timestamp, subscriber, location, profile, risk_score, risk_level, briefing_text, action_plan) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+
+    def __init__(self, db_path: Path = OUTPUT_DIR / "history.db", legacy_dir: Path = OUTPUT_DIR, observations=None):
+        self.db_path = Path(db_path)
+        self.legacy_dir = Path(legacy_dir)
+        # Optional ObservationStore that also receives the raw readings of every saved run.
+        self.observations = observations
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS briefings ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "timestamp TEXT NOT NULL, "
+                "risk_score REAL, "
+                "risk_level TEXT, "
+                "briefing_text TEXT)"
+            )
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(briefings)")}
+            for column in ("location", "payload"):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE briefings ADD COLUMN {column} TEXT")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_briefings_timestamp ON briefings (timestamp)")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_briefings_location_timestamp ON briefings (location, timestamp)"
+            )
+            # Per-subscriber fan-out results; kept apart so location history, stats and latest() are unaffected.
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS subscriber_briefings ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, subscriber TEXT NOT NULL, "
+                "location TEXT, profile TEXT, risk_score REAL, risk_level TEXT, briefing_text TEXT, action_plan TEXT)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_subscriber_briefings_subscriber_timestamp "
+                "ON subscriber_briefings (subscriber, timestamp)"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.migrate_json_files()
+
+    @staticmethod
+    def _timestamp(value) -> str:
+        if value is None:
+            value = datetime.now()
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        # Fixed-width ISO strings sort chronologically, which the index relies on.
+        return value.isoformat(timespec="microseconds")
+
+    def _row(self, record: dict) -> tuple:
+        location = record.get("location") or {}
+        return (
+            self._timestamp(record.get("timestamp")),
+            record.get("risk_score"),
+            record.get("risk_level"),
+            record.get("briefing_text"),
+            location.get("name"),
+            json.dumps(record, default=str),
+        )
+
+    def save(self, state: dict) -> int:
+        """Append one briefing and return its id."""
+        record = to_record(state)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(self.INSERT, self._row(record))
+        self._record_observations([record])
+        return cursor.lastrowid
+
+    def save_many(self, states: list[dict]) -> int:
+        """Append a batch of briefings in a single transaction."""
+        records = [to_record(state) for state in states]
+        rows = [self._row(record) for record in records]
+        with self._lock, self._conn:
+            self._conn.executemany(self.INSERT, rows)
+        self._record_observations(records)
+        return len(rows)
+
+    def save_subscriber_briefings(self, records: list[dict]) -> int:
+        """Append fan-out briefings (see src.agents.fanout) in a single transaction."""
+        rows = []
+        for record in map(to_record, records):
+            rows.append((
+                self._timestamp(record.get("timestamp")),
+                record["subscriber"],
+                record.get("location"),
+                record.get("profile"),
+                record.get("risk_score"),
+                record.get("risk_level"),
+                record.get("briefing_text"),
+                json.dumps(record.get("action_plan"), default=str),
+            ))
+        with self._lock, self._conn:
+            self._conn.executemany(self.INSERT_SUBSCRIBER, rows)
+        return len(rows)
+
+    def latest_for_subscriber(self, subscriber: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT timestamp, subscriber, location, profile, risk_score, risk_level, briefing_text, action_plan "
+                "FROM subscriber_briefings WHERE subscriber = ? ORDER BY timestamp DESC, id DESC LIMIT 1",
+                (subscriber,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {**dict(row), "action_plan": json.loads(row["action_plan"])}
+
+    def _record_observations(self, records: list[dict]):
+        if self.observations is None:
+            return
+        try:
+            self.observations.append(records)
+        except OSError as e:
+            print(f"Observation store error: {e}")
+
+    def get_recent(self, days=7, location: Optional[str] = None) -> list[dict]:
+        cutoff = self._timestamp(datetime.now() - timedelta(days=days))
+        where, params = "timestamp >= ?", (cutoff,)
+        if location is not None:
+            where, params = "location = ? AND timestamp >= ?", (location, cutoff)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT timestamp, risk_score, risk_level, briefing_text FROM briefings "
+                f"WHERE {where} ORDER BY timestamp DESC, id DESC",
+                params,
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def latest(self, location: str) -> Optional[tuple[dict, datetime]]:
+        """Most recent full state stored for ``location`` and when it was generated."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT timestamp, payload FROM briefings WHERE location = ? AND payload IS NOT NULL "
+                "ORDER BY timestamp DESC, id DESC LIMIT 1",
+                (location,),
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row["payload"]), datetime.fromisoformat(row["timestamp"])
+
+    def stats(self, days=7) -> dict:
+        """Count and average risk score over the window, computed in SQLite."""
+        cutoff = self._timestamp(datetime.now() - timedelta(days=days))
+        with self._lock:
+            count, avg = self._conn.execute(
+                "SELECT COUNT(*), AVG(risk_score) FROM briefings WHERE timestamp >= ?", (cutoff,)
+            ).fetchone()
+        return {"count": count, "avg_risk_score": avg}
+
+    def migrate_json_files(self) -> int:
+        """Import legacy per-run JSON files once. Returns the number imported."""
+        with self._lock:
+            done = self._conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+        if done:
+            return 0
+
+        states = []
+        for fp in sorted(self.legacy_dir.glob("briefing_*.json")):
+            try:
+                with open(fp) as f:
+                    states.append(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"Skipping unreadable briefing {fp.name}: {e}")
+
+        rows = [self._row(state) for state in states]
+        try:
+            with self._lock, self._conn:
+                # Claiming the flag first makes a concurrent migration roll back instead of duplicating rows.
+                self._conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)", (self._timestamp(None),))
+                self._conn.executemany(self.INSERT, rows)
+        except sqlite3.IntegrityError:
+            return 0
+        return len(rows)
+
+response_cache = ResponseCache()
+briefing_cache = BriefingCache()
+briefing_history = BriefingHistory(observations=observation_store)
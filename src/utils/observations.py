@@ -0,0 +1,167 @@
+"""Append-only columnar store for raw weather and AQI observations.
+
+Layout: ``<root>/<location>/<YYYY-MM-DD>/<column>.bin``. Each column is a raw
+little-endian array (see COLUMNS), so a range scan memory-maps only the
+columns it asks for and slices them without copying. The timestamp column is
+written last and defines how many rows are committed; a partially written row
+from a crash is truncated away by the next append.
+"""
+import re
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterator, Optional
+from src.config import OBSERVATIONS_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within one process
+    fcntl = None
+
+COLUMNS = {
+    "timestamp": "<f8",  # epoch seconds of the run
+    "temperature_f": "<f4",
+    "feels_like_f": "<f4",
+    "humidity": "<f4",
+    "wind_speed_mph": "<f4",
+    "cloud_coverage": "<f4",
+    "visibility_miles": "<f4",
+    "pressure_hpa": "<f4",
+    "aqi": "<f4",
+    "aqi_category": "<i1",  # index into AQI_CATEGORIES, -1 unknown
+    "aqi_pollutant": "<i1",  # index into POLLUTANTS, -1 unknown
+    "risk_score": "<f4",
+}
+WEATHER_COLUMNS = ("temperature_f", "feels_like_f", "humidity", "wind_speed_mph",
+                   "cloud_coverage", "visibility_miles", "pressure_hpa")
+AQI_CATEGORIES = ("Good", "Moderate", "Unhealthy for Sensitive Groups", "Unhealthy", "Very Unhealthy", "Hazardous")
+POLLUTANTS = ("O3", "PM2.5", "PM10", "CO", "NO2", "SO2")
+UNSORTED_MARKER = "_unsorted"
+
+def _code(values: tuple, value) -> int:
+    return values.index(value) if value in values else -1
+
+def _epoch(value) -> float:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return (value or datetime.now()).timestamp()
+
+class ObservationStore:
+    def __init__(self, root: Path = OBSERVATIONS_DIR):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _slug(location: str) -> str:
+        return re.sub(r"[^A-Za-z0-9.,-]+", "_", location)
+
+    def row(self, record: dict) -> dict:
+        """One observation per run record (see src.utils.records); missing readings are NaN (or -1 for codes)."""
+        weather = record.get("weather_data") or {}
+        aqi = record.get("air_quality_data") or {}
+        row = {"timestamp": _epoch(record.get("timestamp")), "risk_score": record.get("risk_score")}
+        for column in WEATHER_COLUMNS:
+            row[column] = weather.get(column)
+        row["aqi"] = aqi.get("primary_aqi")
+        row["aqi_category"] = _code(AQI_CATEGORIES, aqi.get("category"))
+        row["aqi_pollutant"] = _code(POLLUTANTS, aqi.get("primary_pollutant"))
+        return {column: float("nan") if value is None else value for column, value in row.items()}
+
+    def append(self, records: list[dict]) -> int:
+        """Appends one row per run record to its location/day partition. Returns rows written."""
+        import numpy as np
+
+        partitions = {}
+        for record in records:
+            location = (record.get("location") or {}).get("name") or "default"
+            row = self.row(record)
+            day = datetime.fromtimestamp(row["timestamp"]).date()
+            partitions.setdefault((location, day), []).append(row)
+
+        for (location, day), rows in partitions.items():
+            path = self.root / self._slug(location) / day.isoformat()
+            path.mkdir(parents=True, exist_ok=True)
+            columns = {name: np.array([r[name] for r in rows], dtype=dtype) for name, dtype in COLUMNS.items()}
+            with self._lock, open(path / ".lock", "w") as lock:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                committed = self._committed_rows(path)
+                if committed and (self._last_timestamp(path, committed) > columns["timestamp"][0]
+                                  or np.any(np.diff(columns["timestamp"]) < 0)):
+                    (path / UNSORTED_MARKER).touch()
+                # Timestamp goes last: it is the commit record for the whole row.
+                for name in [n for n in COLUMNS if n != "timestamp"] + ["timestamp"]:
+                    with open(path / f"{name}.bin", "ab") as f:
+                        f.truncate(committed * np.dtype(COLUMNS[name]).itemsize)
+                        f.write(columns[name].tobytes())
+        return len(records)
+
+    def locations(self) -> list[str]:
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir()) if self.root.exists() else []
+
+    def scan_partitions(
+        self,
+        location: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        columns: tuple = ("timestamp", "aqi", "risk_score"),
+    ) -> Iterator[dict]:
+        """Yields one dict of column arrays per day partition, restricted to [start, end).
+
+        Arrays are read-only memory-mapped views unless the partition was
+        appended out of order, in which case the filter has to copy.
+        """
+        import numpy as np
+
+        first = start.date() if start else date.min
+        last = end.date() if end else date.max
+        t0 = start.timestamp() if start else -np.inf
+        t1 = end.timestamp() if end else np.inf
+        base = self.root / self._slug(location)
+        days = sorted(p for p in base.iterdir() if p.is_dir()) if base.exists() else []
+        for path in days:
+            if not first <= date.fromisoformat(path.name) <= last:
+                continue
+            rows = self._committed_rows(path)
+            if not rows:
+                continue
+            timestamp = self._map(path, "timestamp", rows)
+            if (path / UNSORTED_MARKER).exists():
+                selector = (timestamp >= t0) & (timestamp < t1)
+            else:
+                selector = slice(np.searchsorted(timestamp, t0, "left"), np.searchsorted(timestamp, t1, "left"))
+            yield {name: self._map(path, name, rows)[selector] for name in columns}
+
+    def scan(self, location: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+             columns: tuple = ("timestamp", "aqi", "risk_score")) -> dict:
+        """Like scan_partitions but concatenated into one array per column."""
+        import numpy as np
+
+        parts = list(self.scan_partitions(location, start, end, columns))
+        return {name: np.concatenate([p[name] for p in parts]) if parts else np.empty(0, COLUMNS[name])
+                for name in columns}
+
+    def describe(self) -> dict:
+        """Row counts per location and day, for diagnostics."""
+        summary = {}
+        for location in self.locations():
+            days = sorted(p for p in (self.root / location).iterdir() if p.is_dir())
+            summary[location] = {p.name: self._committed_rows(p) for p in days}
+        return summary
+
+    @staticmethod
+    def _committed_rows(path: Path) -> int:
+        ts = path / "timestamp.bin"
+        return ts.stat().st_size // 8 if ts.exists() else 0
+
+    @staticmethod
+    def _last_timestamp(path: Path, rows: int) -> float:
+        import numpy as np
+        return float(np.fromfile(path / "timestamp.bin", dtype=COLUMNS["timestamp"], count=1, offset=(rows - 1) * 8)[0])
+
+    @staticmethod
+    def _map(path: Path, name: str, rows: int):
+        import numpy as np
+        return np.memmap(path / f"{name}.bin", dtype=COLUMNS[name], mode="r", shape=(rows,))
+
+observation_store = ObservationStore()
@@ -0,0 +1,32 @@
+"""Conversion of in-memory agent state into plain, JSON-ready records.
+
+Nodes pass typed objects (provider models, slotted dataclasses, NumPy arrays)
+to each other unchanged; only persistence and presentation boundaries (history,
+the HTTP API, the UI) turn a state into a record with ``to_record``.
+"""
+from dataclasses import fields, is_dataclass
+from datetime import date
+from enum import Enum
+
+def to_record(state: dict) -> dict:
+    """Plain-data copy of a state without its LLM message log."""
+    return {key: _plain(value) for key, value in state.items() if key != "messages"}
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, date):
+        return value.isoformat()
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if is_dataclass(value):
+        return {f.name: _plain(getattr(value, f.name)) for f in fields(value)}
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if hasattr(value, "tolist"):  # NumPy arrays and scalars
+        return value.tolist()
+    return value
@@ -1,19 +1,206 @@
+import asyncio
+import contextvars
+import inspect
+import random
+import threading
 import time
+from contextlib import contextmanager
 from functools import wraps
+from typing import Callable, Optional
+import httpx
+import requests
+from src.config import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS
+from src.utils.metrics import RETRIES
 
-def retry_with_backoff(max_retries=3, initial_delay=1.0):
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the provider while its circuit breaker is open."""
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the run's time budget is spent before a call can start."""
+
+class Deadline:
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("deadline", default=None)
+
+@contextmanager
+def time_budget(seconds: float):
+    """Bounds every retrying call made in this context (threads need copy_context to inherit it)."""
+    token = _deadline.set(Deadline(seconds))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def current_deadline() -> Optional[Deadline]:
+    return _deadline.get()
+
+def request_timeout(default: float) -> float:
+    """Per-request timeout clipped to what is left of the run's budget."""
+    deadline = current_deadline()
+    if deadline is None:
+        return default
+    if deadline.expired:
+        raise DeadlineExceeded("run time budget exhausted")
+    return min(default, deadline.remaining())
+
+def is_retryable(exc: BaseException) -> bool:
+    """Transient transport failures and retryable HTTP status codes only."""
+    if isinstance(exc, (CircuitOpenError, DeadlineExceeded)):
+        return False
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code in RETRYABLE_STATUS
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout, httpx.TransportError))
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures and fails fast for
+    ``reset_timeout`` seconds, then lets a single trial call through (half-open)."""
+
+    def __init__(self, name: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, reset_timeout: float = CIRCUIT_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self):
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+            raise CircuitOpenError(f"{self.name} circuit open, retry in {retry_in:.0f}s")
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def release(self):
+        """Ends a call that says nothing about the provider's health."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(name: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+def _backoff(attempt: int, initial_delay: float, max_delay: float) -> float:
+    """Full jitter: uniform between zero and the capped exponential delay."""
+    return random.uniform(0, min(max_delay, initial_delay * 2 ** attempt))
+
+def retry_with_backoff(
+    max_retries=3,
+    initial_delay=1.0,
+    max_delay=10.0,
+    retry_on: Callable[[BaseException], bool] = is_retryable,
+    breaker: Optional[str] = None,
+):
+    """Retries sync or async callables with full-jitter backoff.
+
+    Only failures accepted by ``retry_on`` are retried, no sleep may run past
+    the current time budget, and with ``breaker`` every attempt goes through
+    that provider's circuit breaker.
+    """
     def decorator(func):
+        def attempt_failed(e: BaseException, attempt: int) -> float:
+            retryable = retry_on(e)
+            if breaker:
+                if retryable:
+                    get_breaker(breaker).record_failure()
+                elif isinstance(e, DeadlineExceeded):
+                    get_breaker(breaker).release()
+                else:
+                    # The provider answered (e.g. 401/404); it is up even though the call failed.
+                    get_breaker(breaker).record_success()
+            if not retryable or attempt == max_retries:
+                raise e
+            delay = _backoff(attempt, initial_delay, max_delay)
+            deadline = current_deadline()
+            if deadline is not None and deadline.remaining() <= delay:
+                raise e
+            RETRIES.inc(func=func.__name__)
+            print(f"  Retry {attempt + 1}/{max_retries} in {delay:.2f}s")
+            return delay
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                for attempt in range(max_retries + 1):
+                    if breaker:
+                        get_breaker(breaker).before_call()
+                    try:
+                        result = await func(*args, **kwargs)
+                    except Exception as e:
+                        delay = attempt_failed(e, attempt)
+                        await asyncio.sleep(delay)
+                        continue
+                    except BaseException:
+                        # Cancelled (e.g. at a soft deadline): a half-open trial must not stay in flight.
+                        if breaker:
+                            get_breaker(breaker).release()
+                        raise
+                    if breaker:
+                        get_breaker(breaker).record_success()
+                    return result
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            delay = initial_delay
             for attempt in range(max_retries + 1):
+                if breaker:
+                    get_breaker(breaker).before_call()
                 try:
-                    return func(*args, **kwargs)
+                    result = func(*args, **kwargs)
                 except Exception as e:
-                    if attempt == max_retries:
-                        raise
-                    print(f"  Retry {attempt + 1}/{max_retries} in {delay}s")
+                    delay = attempt_failed(e, attempt)
                     time.sleep(delay)
-                    delay *= 2
+                    continue
+                except BaseException:
+                    if breaker:
+                        get_breaker(breaker).release()
+                    raise
+                if breaker:
+                    get_breaker(breaker).record_success()
+                return result
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
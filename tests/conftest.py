@@ -0,0 +1,16 @@
+import os
+import tempfile
+
+# Graph runs in tests checkpoint to a throwaway database (src.config reads this on import).
+os.environ.setdefault("CHECKPOINT_DB", os.path.join(tempfile.mkdtemp(), "checkpoints.db"))
+
+import pytest
+from src.agents import nodes
+from src.scoring.trends import TrendDetector
+
+@pytest.fixture(autouse=True)
+def isolated_trend_state(monkeypatch, tmp_path):
+    """Graph runs in tests must not feed the real per-location trend statistics."""
+    detector = TrendDetector(db_path=tmp_path / "trends.db")
+    monkeypatch.setattr(nodes, "get_trend_detector", lambda: detector)
+    return detector
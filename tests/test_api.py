@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime
+import httpx
+from src import api
+from src.agents import nodes
+from src.data_ingestion.collector import Provider
+from src.utils.cache import BriefingHistory
+
+def _client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+def test_concurrent_risk_requests_share_one_computation(monkeypatch, tmp_path):
+    calls = []
+
+    async def aweather(lat, lon):
+        calls.append((lat, lon))
+        await asyncio.sleep(0.05)
+        return None
+
+    async def aqi(lat, lon):
+        return None
+
+    monkeypatch.setattr(nodes.get_collector(), "providers", [
+        Provider("weather", "Weather", None, aweather),
+        Provider("aqi", "AQI", None, aqi),
+    ])
+    service = api.RiskService(history=BriefingHistory(db_path=tmp_path / "history.db", legacy_dir=tmp_path))
+    app = api.create_app(service)
+
+    async def scenario():
+        async with _client(app) as client:
+            responses = await asyncio.gather(*(client.get("/risk", params={"location": "Boston"}) for _ in range(20)))
+            cached = await client.get("/risk", params={"location": "Boston"})
+            revalidated = await client.get(
+                "/risk", params={"location": "Boston"}, headers={"If-None-Match": cached.headers["etag"]},
+            )
+            return responses, cached, revalidated
+
+    responses, cached, revalidated = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert {r.status_code for r in responses} == {200}
+    assert len({r.content for r in responses + [cached]}) == 1
+    assert cached.json()["location"]["name"] == "Boston"
+    max_age = int(cached.headers["cache-control"].split("max-age=")[1])
+    assert 0 <= max_age <= service.bucket_seconds
+    assert revalidated.status_code == 304
+
+def test_bad_locations_are_rejected(tmp_path):
+    service = api.RiskService(history=BriefingHistory(db_path=tmp_path / "history.db", legacy_dir=tmp_path))
+    app = api.create_app(service)
+
+    async def scenario():
+        async with _client(app) as client:
+            return (
+                await client.get("/risk", params={"location": "Atlantis"}),
+                await client.get("/risk", params={"lat": "north", "lon": "1"}),
+                await client.get("/history", params={"days": "0"}),
+                await client.get("/briefing", params={"lat": "42.36", "lon": "-71.06"}),
+            )
+
+    unknown, malformed, bad_days, ad_hoc_briefing = asyncio.run(scenario())
+    assert unknown.status_code == 404
+    assert malformed.status_code == 400
+    assert bad_days.status_code == 400
+    # Briefings may call the LLM and are persisted, so arbitrary coordinates only get /risk.
+    assert ad_hoc_briefing.status_code == 400
+
+def test_briefing_and_history_are_served_from_the_store(monkeypatch, tmp_path):
+    history = BriefingHistory(db_path=tmp_path / "history.db", legacy_dir=tmp_path)
+    history.save({
+        "timestamp": datetime.now(), "location": {"name": "Boston"},
+        "risk_score": 12.0, "risk_level": "low", "briefing_text": "Precomputed.",
+    })
+    monkeypatch.setattr(api.RiskService, "_run_briefing", None)  # must not run the graph
+    app = api.create_app(api.RiskService(history=history))
+
+    async def scenario():
+        async with _client(app) as client:
+            return (
+                await client.get("/briefing", params={"location": "Boston"}),
+                await client.get("/history", params={"days": "1", "location": "Boston"}),
+            )
+
+    briefing, recent = asyncio.run(scenario())
+    assert briefing.json()["briefing_text"] == "Precomputed."
+    assert "max-age=" in briefing.headers["cache-control"]
+    assert [row["briefing_text"] for row in recent.json()["briefings"]] == ["Precomputed."]
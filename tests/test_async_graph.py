@@ -0,0 +1,49 @@
+import asyncio
+from types import SimpleNamespace
+from src.agents import graph, nodes
+from src.data_ingestion.collector import Provider
+from src.utils.cache import BriefingCache
+
+class FakeLLM:
+    async def ainvoke(self, messages):
+        await asyncio.sleep(0)
+        return SimpleNamespace(content="Stay safe.")
+
+def test_arun_many_completes_runs_with_partial_data(monkeypatch, tmp_path):
+    async def afailing(lat, lon):
+        raise RuntimeError("down")
+
+    async def aempty(lat, lon):
+        return None
+
+    monkeypatch.setattr(nodes.get_collector(), "providers", [
+        Provider("weather", "Weather", None, afailing),
+        Provider("aqi", "AQI", None, aempty),
+    ])
+    monkeypatch.setattr(nodes, "get_llm", FakeLLM)
+    monkeypatch.setattr(nodes, "TEMPLATE_BRIEFING_TYPES", set())
+    monkeypatch.setattr(nodes, "briefing_cache", BriefingCache(db_path=tmp_path / "briefings.db"))
+
+    results = asyncio.run(graph.arun_many(5, max_concurrency=2))
+
+    assert len(results) == 5
+    for result in results:
+        assert result["phase"] == "complete"
+        assert result["briefing_text"] == "Stay safe."
+        assert result["data_quality"] == {"completeness": 0, "missing_sources": ["weather", "aqi"]}
+        assert result["confidence"] == "low"
+        assert result["errors"] == ["Weather error: down"]
+
+def test_async_llm_clients_are_scoped_to_their_event_loop(monkeypatch):
+    from src.agents.llm import get_llm
+    from src.config import api_config
+
+    monkeypatch.setattr(api_config, "openai_api_key", "test")
+
+    async def pair():
+        return get_llm(), get_llm()
+
+    first, same_loop = asyncio.run(pair())
+    second, _ = asyncio.run(pair())
+    assert first is same_loop
+    assert first is not second
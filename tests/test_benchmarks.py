@@ -0,0 +1,19 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+def test_offline_benchmark_suite_writes_report(tmp_path):
+    output = tmp_path / "report.json"
+    subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--quick", "--latency", "--output", str(output)],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True, timeout=120,
+    )
+    report = json.loads(output.read_text())
+
+    results = report["results"]
+    assert set(results) == {"pipeline", "memory", "throughput", "batch_scoring", "profiles", "stations", "replay", "history", "observations", "api"}
+    assert set(results["pipeline"]["nodes"]) >= {"collect_data", "analyze_risk", "generate_actions", "draft_briefing"}
+    assert all(count > 0 for count in report["provider_requests"].values())
@@ -0,0 +1,39 @@
+from datetime import datetime
+from src.agents import nodes
+from src.data_ingestion.airquality_client import AirQualityData
+from src.data_ingestion.weather_client import WeatherData
+from src.scoring.action_generator import ActionPlan
+from src.scoring.briefing_template import TemplateBriefingEngine
+
+STATE = {
+    "run_id": "test",
+    "timestamp": datetime(2026, 6, 1, 7, 30),
+    "weather_data": WeatherData.model_construct(temperature_f=72.4, weather_description="clear sky"),
+    "air_quality_data": AirQualityData.model_construct(primary_aqi=35, category="Good"),
+    "action_plan": ActionPlan(summary="", actions=[], outdoor_exercise_safe=True, mask_recommended=False),
+    "risk_score": 12.0,
+    "risk_level": "low",
+    "briefing_type": "short",
+}
+
+def test_template_renders_conditions_and_advice():
+    text = TemplateBriefingEngine().render(STATE)
+    assert text.startswith("Good morning!")
+    assert "72°F, clear sky | AQI 35 (Good)" in text
+    assert "No mask needed" in text
+    assert len(text.split()) < 100
+
+def test_template_opening_follows_the_risk_level():
+    # "short" covers every score below 40, which includes the low end of "moderate".
+    text = TemplateBriefingEngine().render({**STATE, "risk_score": 35.0, "risk_level": "moderate"})
+    assert text.startswith("Good morning! Moderate-risk conditions")
+    assert "Low-risk" not in text
+
+def test_short_briefings_skip_the_llm(monkeypatch):
+    def no_llm():
+        raise AssertionError("LLM should not be called for short briefings")
+
+    monkeypatch.setattr(nodes, "get_llm", no_llm)
+    result = nodes.draft_briefing(STATE)
+    assert result["phase"] == "complete"
+    assert result["token_usage"]["total_tokens"] == 0
@@ -0,0 +1,117 @@
+import time
+from src.utils.cache import ResponseCache
+
+def test_response_cache_serves_fresh_entries_and_survives_restart(tmp_path):
+    calls = []
+    def fetch():
+        calls.append(1)
+        return {"aqi": 42}
+
+    cache = ResponseCache(cache_dir=tmp_path)
+    assert cache.get_or_fetch("airnow", 42.3601, -71.0589, fetch, ttl=60) == {"aqi": 42}
+    assert cache.get_or_fetch("airnow", 42.3649, -71.0612, fetch, ttl=60) == {"aqi": 42}
+
+    restarted = ResponseCache(cache_dir=tmp_path)
+    assert restarted.get_or_fetch("airnow", 42.36, -71.06, fetch, ttl=60) == {"aqi": 42}
+    assert len(calls) == 1
+
+def test_response_cache_serves_stale_while_revalidating(tmp_path):
+    cache = ResponseCache(cache_dir=tmp_path, max_stale=60)
+    cache.get_or_fetch("openweather", 42.36, -71.06, lambda: {"temp": 1}, ttl=0)
+
+    assert cache.get_or_fetch("openweather", 42.36, -71.06, lambda: {"temp": 2}, ttl=0) == {"temp": 1}
+    for _ in range(50):
+        if cache._read(cache.key("openweather", 42.36, -71.06))["value"] == {"temp": 2}:
+            break
+        time.sleep(0.01)
+    assert cache.get_or_fetch("openweather", 42.36, -71.06, lambda: {"temp": 3}, ttl=60) == {"temp": 2}
+
+def test_briefing_history_range_query_and_same_second_writes(tmp_path):
+    from datetime import datetime, timedelta
+    from src.utils.cache import BriefingHistory
+
+    now = datetime.now().replace(microsecond=0)
+    history = BriefingHistory(db_path=tmp_path / "history.db", legacy_dir=tmp_path)
+    history.save({"timestamp": now, "risk_score": 10.0, "risk_level": "low", "briefing_text": "a"})
+    history.save({"timestamp": now, "risk_score": 20.0, "risk_level": "low", "briefing_text": "b"})
+    history.save_many([
+        {"timestamp": now - timedelta(days=10), "risk_score": 90.0, "risk_level": "very_high", "briefing_text": "old"},
+        {"timestamp": (now - timedelta(hours=1)).isoformat(), "risk_score": 30.0, "risk_level": "moderate", "briefing_text": "c"},
+    ])
+
+    recent = history.get_recent(days=7)
+    assert [r["briefing_text"] for r in recent] == ["b", "a", "c"]
+
+def test_briefing_history_imports_legacy_json_once(tmp_path):
+    import json
+    from datetime import datetime
+    from src.utils.cache import BriefingHistory
+
+    record = {"timestamp": datetime.now().isoformat(), "risk_score": 12.0, "risk_level": "low", "briefing_text": "legacy"}
+    (tmp_path / "briefing_20260101_080000.json").write_text(json.dumps(record))
+
+    BriefingHistory(db_path=tmp_path / "history.db", legacy_dir=tmp_path)
+    history = BriefingHistory(db_path=tmp_path / "history.db", legacy_dir=tmp_path)
+
+    assert [r["briefing_text"] for r in history.get_recent()] == ["legacy"]
+
+def test_briefing_history_latest_per_location_after_schema_upgrade(tmp_path):
+    import sqlite3
+    from datetime import datetime, timedelta
+    from src.utils.cache import BriefingHistory
+
+    with sqlite3.connect(tmp_path / "history.db") as conn:
+        conn.execute(
+            "CREATE TABLE briefings (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, "
+            "risk_score REAL, risk_level TEXT, briefing_text TEXT)"
+        )
+        conn.execute("INSERT INTO briefings (timestamp, risk_score) VALUES (?, 5.0)", (datetime.now().isoformat(),))
+
+    history = BriefingHistory(db_path=tmp_path / "history.db", legacy_dir=tmp_path)
+    now = datetime.now()
+    boston = {"name": "Boston", "lat": 42.36, "lon": -71.06}
+    history.save_many([
+        {"timestamp": now - timedelta(hours=1), "location": boston, "risk_score": 10.0, "briefing_text": "old"},
+        {"timestamp": now, "location": boston, "risk_score": 20.0, "briefing_text": "new", "messages": [object()]},
+        {"timestamp": now, "location": {"name": "Cambridge"}, "risk_score": 30.0, "briefing_text": "other"},
+    ])
+
+    state, generated_at = history.latest("Boston")
+    assert state["briefing_text"] == "new"
+    assert state["location"] == boston
+    assert "messages" not in state
+    assert generated_at == now
+    assert history.latest("Worcester") is None
+    assert history.stats()["count"] == 4
+
+def _briefing_state(temp, category="Good", level="low", score=12.0):
+    from src.data_ingestion.airquality_client import AirQualityData
+    from src.data_ingestion.weather_client import WeatherData
+
+    return {
+        "weather_data": WeatherData.model_construct(temperature_f=temp, weather_description="clear sky"),
+        "air_quality_data": AirQualityData.model_construct(category=category),
+        "risk_level": level,
+        "risk_score": score,
+    }
+
+def test_briefing_cache_fingerprint_quantizes_inputs():
+    from src.utils.cache import BriefingCache
+
+    assert BriefingCache.fingerprint(_briefing_state(71.2)) == BriefingCache.fingerprint(_briefing_state(74.9))
+    assert BriefingCache.fingerprint(_briefing_state(71.2)) != BriefingCache.fingerprint(_briefing_state(75.1))
+    assert BriefingCache.fingerprint(_briefing_state(71.2)) != BriefingCache.fingerprint(_briefing_state(71.2, category="Moderate"))
+
+def test_briefing_cache_lru_ttl_and_persistence(tmp_path):
+    from src.utils.cache import BriefingCache
+
+    cache = BriefingCache(db_path=tmp_path / "briefings.db", max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+
+    reopened = BriefingCache(db_path=tmp_path / "briefings.db", max_entries=2)
+    assert reopened.get("c") == "C"
+    assert reopened.get("b") is None
+    assert BriefingCache(db_path=tmp_path / "briefings.db", ttl=0).get("c") is None
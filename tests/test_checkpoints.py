@@ -0,0 +1,122 @@
+import asyncio
+import time
+import warnings
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from src.agents import graph, nodes
+from src.agents.checkpoints import open_checkpointer
+from src.data_ingestion.airquality_client import AirQualityData
+from src.data_ingestion.collector import Provider
+from src.data_ingestion.weather_client import WeatherData
+from src.utils.cache import BriefingCache
+
+class FlakyLLM:
+    def __init__(self):
+        self.calls = 0
+
+    def _respond(self):
+        self.calls += 1
+        if self.calls == 1:
+            raise TimeoutError("LLM timed out")
+        return SimpleNamespace(content="Stay safe.", usage_metadata=None)
+
+    def invoke(self, messages):
+        return self._respond()
+
+    async def ainvoke(self, messages):
+        return self._respond()
+
+@pytest.fixture
+def flaky_run(monkeypatch, tmp_path):
+    now = datetime.now()
+    calls = []
+
+    def weather(lat, lon):
+        calls.append("weather")
+        return WeatherData(
+            timestamp=now, temperature_f=70.0, feels_like_f=70.0, humidity=50, wind_speed_mph=5.0,
+            weather_condition="Clear", weather_description="clear sky", cloud_coverage=0,
+            visibility_miles=10.0, pressure_hpa=1015,
+        )
+
+    def aqi(lat, lon):
+        calls.append("aqi")
+        return AirQualityData(timestamp=now, primary_aqi=42, primary_pollutant="O3", category="Good",
+                              reporting_area="Boston")
+
+    async def aweather(lat, lon):
+        return weather(lat, lon)
+
+    async def aaqi(lat, lon):
+        return aqi(lat, lon)
+
+    llm = FlakyLLM()
+    monkeypatch.setattr(nodes.get_collector(), "providers", [
+        Provider("weather", "Weather", weather, aweather),
+        Provider("aqi", "AQI", aqi, aaqi),
+    ])
+    monkeypatch.setattr(nodes, "get_llm", lambda: llm)
+    monkeypatch.setattr(nodes, "TEMPLATE_BRIEFING_TYPES", set())
+    monkeypatch.setattr(nodes, "briefing_cache", BriefingCache(db_path=tmp_path / "briefings.db"))
+    checkpointer = open_checkpointer(tmp_path / "checkpoints.db")
+    agents = {
+        use_async: graph.build_health_guardian_graph(use_async, checkpointer=checkpointer)
+        for use_async in (False, True)
+    }
+    monkeypatch.setattr(graph, "get_agent", lambda use_async=False: agents[use_async])
+    return SimpleNamespace(calls=calls, llm=llm, agent=agents[False], checkpointer=checkpointer)
+
+def test_failed_run_resumes_at_the_failed_node(flaky_run):
+    with pytest.raises(TimeoutError):
+        graph.run_health_guardian(run_id="retry-me")
+    assert flaky_run.calls == ["weather", "aqi"]
+    assert flaky_run.agent.get_state(graph.run_config("retry-me")).next == ("draft_briefing",)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # every state type must be on the checkpoint allowlist
+        state = graph.run_health_guardian(run_id="retry-me")
+
+    assert flaky_run.calls == ["weather", "aqi"]
+    assert flaky_run.llm.calls == 2
+    assert state["run_id"] == "retry-me" and state["briefing_text"] == "Stay safe."
+    assert state["assessment"].risk_level.value == state["risk_level"]
+    # Completed runs leave no checkpoints behind.
+    assert flaky_run.checkpointer.get_tuple(graph.run_config("retry-me")) is None
+
+def test_async_run_resumes_and_expired_runs_start_over(flaky_run, monkeypatch, tmp_path):
+    async def attempt(run_id):
+        return await graph.arun_health_guardian(run_id=run_id)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(attempt("async-run"))
+    assert asyncio.run(attempt("async-run"))["briefing_text"] == "Stay safe."
+    assert flaky_run.calls == ["weather", "aqi"]
+
+    flaky_run.llm.calls = 0
+    monkeypatch.setattr(nodes, "briefing_cache", BriefingCache(db_path=tmp_path / "fresh.db"))
+    with pytest.raises(TimeoutError):
+        graph.run_health_guardian(run_id="stale")
+    monkeypatch.setattr(graph, "datetime", SimpleNamespace(now=lambda: datetime.now() + timedelta(hours=1)))
+    graph.run_health_guardian(run_id="stale")
+    assert flaky_run.calls == ["weather", "aqi"] * 3
+
+def test_abandoned_runs_are_pruned(flaky_run, monkeypatch, tmp_path):
+    from src.agents import checkpoints
+
+    with pytest.raises(TimeoutError):
+        graph.run_health_guardian(run_id="abandoned")
+    assert flaky_run.checkpointer.get_tuple(graph.run_config("abandoned")) is not None
+
+    later = time.time() + flaky_run.checkpointer.max_age + 60
+    monkeypatch.setattr(checkpoints, "time", SimpleNamespace(time=lambda: later))
+    graph.run_health_guardian(run_id="next")
+    assert flaky_run.checkpointer.get_tuple(graph.run_config("abandoned")) is None
+
+    # Reopening the database prunes as well, e.g. after a scheduler restart.
+    flaky_run.llm.calls = 0
+    monkeypatch.setattr(nodes, "briefing_cache", BriefingCache(db_path=tmp_path / "fresh.db"))
+    with pytest.raises(TimeoutError):
+        graph.run_health_guardian(run_id="left-behind")
+    later += flaky_run.checkpointer.max_age + 60
+    assert open_checkpointer(tmp_path / "checkpoints.db").get_tuple(graph.run_config("left-behind")) is None
@@ -0,0 +1,126 @@
+import time
+from src.data_ingestion.collector import DataCollector, Provider
+
+def _slow(value, delay=0.2):
+    def fetch():
+        time.sleep(delay)
+        return value
+    return fetch
+
+def _failing():
+    raise RuntimeError("boom")
+
+def test_collect_runs_providers_in_parallel():
+    collector = DataCollector([
+        Provider("weather", "Weather", _slow("w")),
+        Provider("aqi", "AQI", _slow("a")),
+    ])
+    start = time.perf_counter()
+    results, errors = collector.collect()
+    elapsed = time.perf_counter() - start
+    assert results == {"weather": "w", "aqi": "a"}
+    assert errors == []
+    assert elapsed < 0.35
+
+def test_collect_reports_errors_in_provider_order():
+    collector = DataCollector([
+        Provider("weather", "Weather", _failing),
+        Provider("aqi", "AQI", _failing),
+    ])
+    results, errors = collector.collect()
+    assert results == {"weather": None, "aqi": None}
+    assert errors == ["Weather error: boom", "AQI error: boom"]
+
+def test_soft_deadline_returns_partial_results():
+    collector = DataCollector([
+        Provider("weather", "Weather", _slow("w", 0.01)),
+        Provider("aqi", "AQI", _slow("a", 1.0)),
+    ])
+    start = time.perf_counter()
+    results, errors = collector.collect(soft_deadline=0.2)
+    assert time.perf_counter() - start < 0.5
+    assert results == {"weather": "w", "aqi": None}
+    assert errors == ["AQI error: no response within 0.2s"]
+
+def test_slow_request_is_hedged():
+    delays = iter([1.0])
+
+    def fetch():
+        time.sleep(next(delays, 0.01))  # the first call stalls, the hedge is fast
+        return "a"
+
+    collector = DataCollector([Provider("aqi", "AQI", fetch)], hedge_min_samples=5)
+    for _ in range(5):
+        collector.latency["aqi"].add(0.02)
+    start = time.perf_counter()
+    results, errors = collector.collect(soft_deadline=2)
+    assert results == {"aqi": "a"}
+    assert errors == []
+    assert time.perf_counter() - start < 0.5
+
+def test_async_soft_deadline_and_hedge():
+    import asyncio
+
+    calls = []
+
+    async def afetch():
+        calls.append(1)
+        await asyncio.sleep(1.0 if len(calls) == 1 else 0.01)
+        return "a"
+
+    async def stalled():
+        await asyncio.sleep(5)
+
+    collector = DataCollector([
+        Provider("aqi", "AQI", None, afetch),
+        Provider("weather", "Weather", None, stalled),
+    ], hedge_min_samples=5)
+    for _ in range(5):
+        collector.latency["aqi"].add(0.02)
+    results, errors = asyncio.run(collector.acollect(soft_deadline=0.3))
+    assert results == {"aqi": "a", "weather": None}
+    assert errors == ["Weather error: no response within 0.3s"]
+    assert len(calls) == 2
+
+def test_hedge_delay_learns_from_upstream_fetches_only(tmp_path):
+    import asyncio
+    from src.utils.cache import ResponseCache
+
+    cache = ResponseCache(cache_dir=tmp_path)
+    fetch = _slow("w", 0.1)
+
+    async def afetch():
+        return await cache.aget_or_fetch("weather", 42.36, -71.06, lambda: asyncio.to_thread(fetch), ttl=600)
+
+    collector = DataCollector([
+        Provider("weather", "Weather", lambda: cache.get_or_fetch("weather", 42.36, -71.06, fetch, ttl=600), afetch),
+    ], hedge_min_samples=1)
+    for _ in range(10):
+        assert collector.collect() == ({"weather": "w"}, [])
+        assert asyncio.run(collector.acollect()) == ({"weather": "w"}, [])
+
+    # Only the one cold miss was timed, so a later miss is hedged at upstream p95, not at the floor.
+    assert len(collector.latency["weather"]) == 1
+    assert collector.hedge_delay(collector.providers[0]) >= 0.1
+
+def test_half_open_probe_cancelled_at_soft_deadline_is_retried_next_run(monkeypatch):
+    import asyncio
+    from src.utils import retry
+
+    monkeypatch.setattr(retry, "_breakers", {})
+    breaker = retry.get_breaker("aqi")
+    breaker.reset_timeout = 0.0
+    breaker.failures, breaker.opened_at = breaker.failure_threshold, time.monotonic()
+    delays = iter([1.0, 0.01])
+    calls = []
+
+    @retry.retry_with_backoff(max_retries=0, breaker="aqi")
+    async def afetch():
+        calls.append(1)
+        await asyncio.sleep(next(delays))
+        return "a"
+
+    collector = DataCollector([Provider("aqi", "AQI", None, afetch)], hedge=False)
+    assert asyncio.run(collector.acollect(soft_deadline=0.1)) == ({"aqi": None}, ["AQI error: no response within 0.1s"])
+    assert asyncio.run(collector.acollect(soft_deadline=0.5)) == ({"aqi": "a"}, [])
+    assert len(calls) == 2 and breaker.state == "closed"
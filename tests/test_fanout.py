@@ -0,0 +1,93 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from src.agents import fanout, llm, nodes
+from src.config import Location
+from src.data_ingestion.airquality_client import AirQualityData
+from src.data_ingestion.collector import Provider
+from src.data_ingestion.weather_client import WeatherData
+from src.utils import cache
+from src.utils.cache import BriefingCache, BriefingHistory
+
+BOSTON = Location(name="Boston", lat=42.36, lon=-71.06)
+PROFILES = ["general", "asthma", "elderly", "runner"]
+
+class BatchLLM:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    async def abatch(self, inputs, config=None, return_exceptions=False):
+        self.batches.append((inputs, config))
+        if self.fail:
+            return [RuntimeError("rate limited")] * len(inputs)
+        return [SimpleNamespace(content=f"Briefing {i}", usage_metadata=None) for i in range(len(inputs))]
+
+@pytest.fixture
+def fan_out_env(monkeypatch, tmp_path):
+    now = datetime.now()
+
+    async def aweather(lat, lon):
+        return WeatherData(
+            timestamp=now, temperature_f=93.0, feels_like_f=95.0, humidity=60, wind_speed_mph=4.0,
+            weather_condition="Clear", weather_description="clear sky", cloud_coverage=0,
+            visibility_miles=10.0, pressure_hpa=1010,
+        )
+
+    async def aaqi(lat, lon):
+        return AirQualityData(timestamp=now, primary_aqi=95, primary_pollutant="O3", category="Moderate",
+                              reporting_area="Boston")
+
+    monkeypatch.setattr(nodes.get_collector(), "providers", [
+        Provider("weather", "Weather", None, aweather),
+        Provider("aqi", "AQI", None, aaqi),
+    ])
+    monkeypatch.setattr(fanout, "TEMPLATE_BRIEFING_TYPES", set())
+    monkeypatch.setattr(cache, "briefing_cache", BriefingCache(db_path=tmp_path / "briefings.db"))
+    return BriefingHistory(db_path=tmp_path / "history.db", legacy_dir=tmp_path)
+
+def test_subscribers_share_one_collection_and_one_llm_batch(monkeypatch, fan_out_env):
+    fake = BatchLLM()
+    monkeypatch.setattr(llm, "get_llm", lambda: fake)
+    subscribers = [fanout.Subscriber(f"u{i}", "Boston", PROFILES[i % len(PROFILES)]) for i in range(2000)]
+
+    result = asyncio.run(fanout.afan_out(subscribers, [BOSTON], history=fan_out_env, max_concurrency=3))
+
+    # One prompt per distinct profile, not per subscriber, sent as a single bounded batch.
+    assert len(fake.batches) == 1
+    prompts, config = fake.batches[0]
+    assert len(prompts) == result.llm_requests == len(PROFILES)
+    assert config == {"max_concurrency": 3}
+    assert any("for people with asthma" in p[0].content for p in prompts)
+
+    assert len(result.briefings) == 2000
+    assert [state["profile"] for state in result.states] == ["general"]
+    assert fan_out_env.latest("Boston")[0]["profile"] == "general"
+    asthma = fan_out_env.latest_for_subscriber("u1")
+    assert asthma["profile"] == "asthma" and asthma["briefing_text"].startswith("Briefing")
+    assert asthma["risk_score"] > fan_out_env.latest_for_subscriber("u0")["risk_score"]
+    assert asthma["action_plan"]["mask_recommended"]
+
+    # A second pass with unchanged conditions is served from the briefing cache.
+    again = asyncio.run(fanout.afan_out(subscribers, [BOSTON], history=fan_out_env))
+    assert again.llm_requests == 0 and len(fake.batches) == 1
+
+def test_failed_generations_fall_back_to_the_template(monkeypatch, fan_out_env):
+    monkeypatch.setattr(llm, "get_llm", lambda: BatchLLM(fail=True))
+
+    result = asyncio.run(fanout.afan_out([fanout.Subscriber("u1", "Boston", "runner")], [BOSTON], history=fan_out_env))
+
+    runner = fan_out_env.latest_for_subscriber("u1")
+    assert runner["risk_level"] == "high"
+    assert runner["briefing_text"].startswith("Good")
+    assert "High-risk conditions" in runner["briefing_text"] and "Low-risk" not in runner["briefing_text"]
+    assert result.states[0]["errors"] == ["Briefing error: rate limited"]
+
+def test_load_subscribers(tmp_path):
+    path = tmp_path / "subscribers.csv"
+    path.write_text("id,location,profile\na,Boston,asthma\nb,Cambridge,\n")
+    assert fanout.load_subscribers(path) == [
+        fanout.Subscriber("a", "Boston", "asthma"), fanout.Subscriber("b", "Cambridge", "general"),
+    ]
+    assert fanout.load_subscribers(tmp_path / "missing.csv") == []
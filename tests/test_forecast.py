@@ -0,0 +1,112 @@
+from datetime import date, datetime, timedelta, timezone
+import numpy as np
+from src.data_ingestion.airquality_client import AirQualityClient, AirQualityData, AirQualityForecast
+from src.data_ingestion.weather_client import WeatherClient, WeatherData, WeatherForecast
+from src.scoring.forecast import ForecastScorer, describe_window_records, describe_windows
+from src.scoring.risk_calculator import RiskCalculator
+from src.utils.records import to_record
+
+NOW = datetime(2026, 6, 1, 5, 20)
+
+def _weather_forecast(feels_like, tz=None):
+    start = datetime(2026, 6, 1, 6, tzinfo=tz)
+    n = len(feels_like)
+    return WeatherForecast(
+        times=[start + timedelta(hours=3 * i) for i in range(n)],
+        temperature_f=list(feels_like),
+        feels_like_f=list(feels_like),
+        wind_speed_mph=[5.0] * n,
+        visibility_miles=[10.0] * n,
+        weather_description=["clear sky"] * n,
+    )
+
+def _aqi_forecast(day, aqi):
+    return AirQualityForecast(dates=[day], aqi=[aqi], category=["Good"], pollutant=["O3"])
+
+def test_parse_forecasts():
+    weather = WeatherClient._parse_forecast({"list": [
+        {"dt": 1780300800, "main": {"temp": 70, "feels_like": 71}, "wind": {"speed": 4},
+         "weather": [{"description": "clear sky"}], "visibility": 16093.4},
+    ]})
+    assert weather.feels_like_f == [71] and round(weather.visibility_miles[0]) == 10
+    boston = WeatherClient._parse_forecast({"city": {"timezone": -14400}, "list": [
+        {"dt": 1780300800, "main": {"temp": 70, "feels_like": 71}, "wind": {"speed": 4},
+         "weather": [{"description": "clear sky"}]},
+    ]})
+    assert boston.times == [datetime(2026, 6, 1, 4, tzinfo=timezone(timedelta(hours=-4)))]
+
+    aqi = AirQualityClient._parse_forecast([
+        {"DateForecast": "2026-06-02 ", "AQI": 40, "ParameterName": "O3", "Category": {"Number": 1, "Name": "Good"}},
+        {"DateForecast": "2026-06-02 ", "AQI": -1, "ParameterName": "PM2.5", "Category": {"Number": 3, "Name": "Unhealthy for Sensitive Groups"}},
+        {"DateForecast": "2026-06-01 ", "AQI": 55, "ParameterName": "PM2.5", "Category": {"Number": 2, "Name": "Moderate"}},
+    ])
+    assert aqi.dates == [date(2026, 6, 1), date(2026, 6, 2)]
+    # A missing AQI falls back to its category, and the worst pollutant wins the day.
+    assert aqi.aqi == [55, 125] and aqi.pollutant == ["PM2.5", "PM2.5"]
+    assert AirQualityClient._parse_forecast([]) is None
+
+def test_hourly_inputs_interpolate_and_anchor_on_current():
+    scorer = ForecastScorer(hours=6)
+    current_weather = WeatherData.model_construct(timestamp=NOW, feels_like_f=60.0, wind_speed_mph=5.0, visibility_miles=10.0)
+    inputs = scorer.hourly_inputs(
+        _weather_forecast([66, 72]), _aqi_forecast(date(2026, 6, 2), 80),
+        current_weather, AirQualityData.model_construct(primary_aqi=30), now=NOW,
+    )
+    assert [ts.hour for ts in inputs["times"]] == [5, 6, 7, 8, 9, 10]
+    np.testing.assert_allclose(inputs["feels_like_f"][1:5], [66, 68, 70, 72])
+    assert inputs["feels_like_f"][0] == 60
+    # Today has no forecast entry, so the current reading stands in for it.
+    assert set(inputs["aqi"]) == {30}
+
+def test_score_runs_one_batch_and_picks_the_calmest_hour(monkeypatch):
+    calculator = RiskCalculator()
+    calls = []
+    batch = calculator.calculate_batch
+    monkeypatch.setattr(calculator, "calculate_batch", lambda *a: calls.append(a) or batch(*a))
+
+    # Hot afternoon, mild morning and evening.
+    feels_like = [70, 80, 95, 100, 95, 75, 70, 70]
+    forecast = ForecastScorer(calculator, hours=20).score(
+        _weather_forecast(feels_like), _aqi_forecast(date(2026, 6, 1), 35), now=NOW,
+    )
+    assert len(calls) == 1 and len(forecast.risk_scores) == 20
+    windows = forecast.windows
+    assert windows["morning_commute"].start == datetime(2026, 6, 1, 6)
+    assert windows["evening_commute"].start == datetime(2026, 6, 1, 19)
+    assert windows["exercise"].risk_score == forecast.risk_scores[1:16].min()
+    assert describe_windows(forecast)[0].startswith("Best time for morning commute: 6am-7am")
+    assert describe_window_records(to_record({"f": forecast})["f"]) == describe_windows(forecast)
+
+def test_score_without_forecasts_is_none():
+    assert ForecastScorer().score(None, None) is None
+
+def test_empty_forecasts_count_as_missing():
+    empty = WeatherClient._parse_forecast({"list": []})
+    current = WeatherData.model_construct(timestamp=NOW, feels_like_f=60.0, wind_speed_mph=5.0, visibility_miles=10.0)
+    assert ForecastScorer().score(empty, None, current) is None
+    assert ForecastScorer(hours=4).score(empty, _aqi_forecast(date(2026, 6, 1), 35), current, now=NOW) is not None
+
+def test_windows_use_the_locations_hours_on_any_server():
+    edt = timezone(timedelta(hours=-4))
+    forecast = ForecastScorer(hours=20).score(
+        _weather_forecast([70, 80, 95, 100, 95, 75, 70, 70], edt), None,
+        now=datetime(2026, 6, 1, 9, 20, tzinfo=timezone.utc),  # 5:20 in Boston
+    )
+    assert forecast.times[0] == datetime(2026, 6, 1, 5, tzinfo=edt)
+    assert forecast.windows["morning_commute"].start == datetime(2026, 6, 1, 6, tzinfo=edt)
+
+def test_forecast_failure_does_not_fail_the_run(monkeypatch):
+    from types import SimpleNamespace
+    from src.agents import nodes
+
+    def broken(*args):
+        raise ValueError("bad forecast")
+
+    monkeypatch.setattr(nodes, "get_forecast_scorer", lambda: SimpleNamespace(score=broken))
+    result = nodes.analyze_risk({
+        "run_id": "t", "timestamp": NOW, "errors": [], "data_quality": {},
+        "weather_data": WeatherData.model_construct(timestamp=NOW, feels_like_f=70.0, wind_speed_mph=5.0, visibility_miles=10.0),
+        "air_quality_data": AirQualityData.model_construct(primary_aqi=30),
+    })
+    assert result["risk_forecast"] is None and result["risk_score"] >= 0
+    assert result["errors"] == ["Forecast error: bad forecast"]
@@ -0,0 +1,28 @@
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+HEAVY_MODULES = {"langgraph", "langchain_core", "langchain_openai", "openai", "numpy", "pandas", "plotly"}
+# Generous bound on the cumulative import time of src.agents.graph (microseconds);
+# it was ~1.5 s when the graph and its dependencies loaded eagerly.
+MAX_IMPORT_US = 300_000
+
+def _importtime(module: str) -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = line.split("|")
+        if cum.strip().isdigit():
+            cumulative[name.strip()] = int(cum)
+    return cumulative
+
+def test_graph_import_is_lazy():
+    imported = _importtime("src.agents.graph")
+    assert not HEAVY_MODULES & {name.split(".")[0] for name in imported}
+    assert imported["src.agents.graph"] < MAX_IMPORT_US
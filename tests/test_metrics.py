@@ -0,0 +1,38 @@
+from src.utils.metrics import MetricsRegistry
+
+def test_histogram_and_counter_export():
+    registry = MetricsRegistry()
+    latency = registry.histogram("stage_seconds", "Stage latency", buckets=(0.1, 1.0))
+    errors = registry.counter("stage_errors_total", "Stage errors")
+    for value in (0.05, 0.05, 0.5, 2.0):
+        latency.observe(value, node="collect_data")
+    errors.inc(node="collect_data")
+
+    text = registry.to_prometheus()
+    assert 'stage_seconds_bucket{node="collect_data",le="0.1"} 2' in text
+    assert 'stage_seconds_bucket{node="collect_data",le="+Inf"} 4' in text
+    assert 'stage_seconds_count{node="collect_data"} 4' in text
+    assert 'stage_errors_total{node="collect_data"} 1' in text
+
+    assert latency.quantile(0.5, node="collect_data") == 0.1
+    assert registry.to_json()["stage_errors_total"] == [{"labels": {"node": "collect_data"}, "value": 1}]
+
+def test_graph_nodes_and_providers_are_instrumented(monkeypatch):
+    from src.agents import graph, nodes
+    from src.data_ingestion.collector import Provider
+    from src.utils import metrics
+
+    def failing(lat, lon):
+        raise RuntimeError("down")
+
+    monkeypatch.setattr(nodes.get_collector(), "providers", [
+        Provider("weather", "Weather", failing),
+        Provider("aqi", "AQI", lambda lat, lon: None),
+    ])
+    before_runs = metrics.NODE_LATENCY.count(node="draft_briefing")
+    before_errors = metrics.PROVIDER_ERRORS.value(provider="weather")
+
+    graph.run_health_guardian()
+
+    assert metrics.NODE_LATENCY.count(node="draft_briefing") == before_runs + 1
+    assert metrics.PROVIDER_ERRORS.value(provider="weather") == before_errors + 1
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+import numpy as np
+from src.utils.cache import BriefingHistory
+from src.utils.observations import ObservationStore
+
+def _state(ts, aqi=40, location="Boston", feels_like=70.0):
+    return {
+        "timestamp": ts,
+        "location": {"name": location},
+        "risk_score": 12.5,
+        "weather_data": {"temperature_f": 71.0, "feels_like_f": feels_like, "humidity": 50,
+                         "wind_speed_mph": 5.0, "cloud_coverage": 10, "visibility_miles": 10.0, "pressure_hpa": 1015},
+        "air_quality_data": {"primary_aqi": aqi, "category": "Good", "primary_pollutant": "PM2.5"},
+    }
+
+def test_append_and_range_scan_across_day_partitions(tmp_path):
+    store = ObservationStore(tmp_path)
+    start = datetime(2026, 3, 1, 22, 0)
+    store.append([_state(start + timedelta(hours=i), aqi=i) for i in range(6)])
+    store.append([_state(start, location="Cambridge"), {"timestamp": start, "location": {"name": "Cambridge"}}])
+
+    assert store.describe() == {"Boston": {"2026-03-01": 2, "2026-03-02": 4}, "Cambridge": {"2026-03-01": 2}}
+
+    parts = list(store.scan_partitions("Boston", start + timedelta(hours=1), start + timedelta(hours=4), ("aqi",)))
+    assert all(isinstance(p["aqi"], np.memmap) for p in parts)  # sorted partitions are sliced, not copied
+    assert np.concatenate([p["aqi"] for p in parts]).tolist() == [1, 2, 3]
+
+    cambridge = store.scan("Cambridge", columns=("aqi", "aqi_category", "temperature_f"))
+    assert cambridge["aqi_category"].tolist() == [0, -1]
+    assert np.isnan(cambridge["aqi"][1]) and np.isnan(cambridge["temperature_f"][1])
+
+def test_out_of_order_appends_and_torn_rows(tmp_path):
+    store = ObservationStore(tmp_path)
+    base = datetime(2026, 3, 1, 12, 0)
+    store.append([_state(base + timedelta(minutes=30), aqi=2)])
+    store.append([_state(base, aqi=1)])
+
+    partition = tmp_path / "Boston" / "2026-03-01"
+    with open(partition / "aqi.bin", "ab") as f:  # a crash after writing one column
+        f.write(np.array([99], dtype="<f4").tobytes())
+    store.append([_state(base + timedelta(minutes=45), aqi=3)])
+
+    result = store.scan("Boston", base, base + timedelta(hours=1), columns=("timestamp", "aqi"))
+    assert result["aqi"].tolist() == [2, 1, 3]
+    assert (partition / "aqi.bin").stat().st_size == 3 * 4
+
+def test_history_saves_feed_the_store(tmp_path):
+    store = ObservationStore(tmp_path / "obs")
+    history = BriefingHistory(db_path=tmp_path / "history.db", legacy_dir=tmp_path, observations=store)
+    now = datetime.now()
+    history.save(_state(now, feels_like=55.0))
+    history.save_many([_state(now + timedelta(seconds=1), feels_like=56.0)])
+
+    assert store.scan("Boston", columns=("feels_like_f",))["feels_like_f"].tolist() == [55.0, 56.0]
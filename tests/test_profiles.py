@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+import numpy as np
+from src.scoring.action_generator import ActionGenerator
+from src.scoring.profiles import PROFILES, ProfileScorer, RiskProfile
+from src.scoring.risk_calculator import Concern, RiskCalculator
+
+def _snapshot(temp, wind, vis, aqi):
+    weather = None if temp is None else SimpleNamespace(feels_like_f=temp, wind_speed_mph=wind, visibility_miles=vis)
+    air = None if aqi is None else SimpleNamespace(primary_aqi=aqi)
+    return weather, air
+
+def test_general_profile_matches_risk_calculator():
+    rng = np.random.default_rng(3)
+    scorer = ProfileScorer([PROFILES["general"]])
+    calc = RiskCalculator()
+    edges = [(19.9, 20, 0.5, 50), (80, 30.1, 3, 151), (100.1, 5, 1, 101), (None, 0, 0, 75), (70, 3, 10, None), (None, 0, 0, None)]
+    randoms = [(rng.uniform(-10, 115), rng.uniform(0, 50), rng.uniform(0, 10), int(rng.integers(0, 400))) for _ in range(500)]
+    for snapshot in edges + randoms:
+        weather, air = _snapshot(*snapshot)
+        batch = scorer.score(weather, air)
+        expected = calc.calculate(weather, air)
+        assert batch.overall_score[0] == expected.overall_score
+        assert batch.risk_level[0] == expected.risk_level.value
+        assert batch.confidence[0] == expected.confidence
+        assert batch.concern_codes[0] == expected.concern_codes
+
+def test_sensitive_profiles_score_higher_in_one_pass():
+    scorer = ProfileScorer(list(PROFILES.values()) * 1000)
+    batch = scorer.score(*_snapshot(86, 5, 10, 90))
+    assert len(batch) == 5000
+
+    by_name = dict(zip(scorer.names[:5], batch.overall_score[:5]))
+    assert by_name["asthma"] > by_name["general"]
+    assert by_name["runner"] > by_name["general"]
+    elderly = batch.at(list(scorer.names).index("elderly"))
+    assert Concern.HOT in elderly.concern_codes
+    assert Concern.HOT not in batch.at(0).concern_codes
+
+    # Typed concern codes drive the per-user action plan.
+    plan = ActionGenerator().generate(elderly)
+    assert plan.mask_recommended
+    assert {"priority": "medium", "action": "Stay hydrated"} in plan.actions
+
+def test_custom_profile_breakpoints():
+    strict = RiskProfile("strict", level_breakpoints=(5, 10, 15))
+    batch = ProfileScorer([PROFILES["general"], strict]).score(*_snapshot(70, 2, 10, 40))
+    assert batch.overall_score[0] == batch.overall_score[1]
+    assert list(batch.risk_level) == ["low", "moderate"]
+
+def test_aqi_above_the_top_band_rises_at_the_first_band_rate():
+    asthma = PROFILES["asthma"]
+    batch = ProfileScorer([asthma]).score(None, SimpleNamespace(primary_aqi=110))
+    b1, _, b3 = asthma.aqi_breakpoints
+    np.testing.assert_allclose(batch.overall_score, [80 + (110 - b3) * 20 / b1])
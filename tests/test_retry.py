@@ -0,0 +1,135 @@
+import asyncio
+import time
+import pytest
+import requests
+from src.utils import retry
+from src.utils.retry import (
+    CircuitBreaker, CircuitOpenError, DeadlineExceeded,
+    request_timeout, retry_with_backoff, time_budget,
+)
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+@pytest.fixture(autouse=True)
+def fresh_breakers(monkeypatch):
+    monkeypatch.setattr(retry, "_breakers", {})
+    monkeypatch.setattr(retry, "_backoff", lambda attempt, initial, cap: 0.0)
+
+def test_retries_transient_errors_only():
+    calls = []
+
+    @retry_with_backoff(max_retries=2)
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise requests.ConnectionError("reset")
+        return "ok"
+
+    @retry_with_backoff(max_retries=2)
+    def unauthorized():
+        calls.append(1)
+        raise http_error(401)
+
+    assert flaky() == "ok"
+    assert len(calls) == 3
+
+    calls.clear()
+    with pytest.raises(requests.HTTPError):
+        unauthorized()
+    assert len(calls) == 1
+
+def test_breaker_opens_then_half_opens():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    time.sleep(0.06)
+    breaker.before_call()  # the single half-open trial
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    time.sleep(0.06)
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+def test_open_circuit_fails_fast():
+    calls = []
+
+    @retry_with_backoff(max_retries=1, breaker="flaky")
+    def failing():
+        calls.append(1)
+        raise http_error(503)
+
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            failing()
+    # The fifth consecutive failure opens the circuit, so its retry never reaches the provider.
+    with pytest.raises(CircuitOpenError):
+        failing()
+    with pytest.raises(CircuitOpenError):
+        failing()
+    assert len(calls) == 5
+
+def test_deadline_stops_retries(monkeypatch):
+    monkeypatch.setattr(retry, "_backoff", lambda attempt, initial, cap: 1.0)
+    calls = []
+
+    @retry_with_backoff(max_retries=5)
+    def slow():
+        calls.append(1)
+        raise requests.Timeout()
+
+    with time_budget(0.5):
+        assert 0 < request_timeout(10) <= 0.5
+        with pytest.raises(requests.Timeout):
+            slow()
+    assert len(calls) == 1
+
+    with time_budget(0):
+        with pytest.raises(DeadlineExceeded):
+            request_timeout(10)
+    assert request_timeout(10) == 10
+
+def test_async_retry():
+    calls = []
+
+    @retry_with_backoff(max_retries=2, breaker="async")
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 2:
+            raise http_error(502)
+        return "ok"
+
+    assert asyncio.run(flaky()) == "ok"
+    assert len(calls) == 2
+    assert retry.get_breaker("async").failures == 0
+
+def test_cancelled_half_open_trial_releases_the_breaker():
+    breaker = retry.get_breaker("slow")
+    breaker.reset_timeout = 0.0
+    breaker.failures, breaker.opened_at = breaker.failure_threshold, time.monotonic()
+    assert breaker.state == "half_open"
+    calls = []
+
+    @retry_with_backoff(max_retries=0, breaker="slow")
+    async def probe(delay):
+        calls.append(delay)
+        await asyncio.sleep(delay)
+        return "ok"
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(probe(1.0), timeout=0.05)
+        return await probe(0)
+
+    assert asyncio.run(main()) == "ok"
+    assert calls == [1.0, 0] and breaker.state == "closed"
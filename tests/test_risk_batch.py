@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+from src.scoring.risk_calculator import RiskCalculator
+
+def _scalar_inputs(temp, wind, vis, aqi):
+    weather = None if np.isnan(temp) else SimpleNamespace(feels_like_f=temp, wind_speed_mph=wind, visibility_miles=vis)
+    air = None if np.isnan(aqi) else SimpleNamespace(primary_aqi=int(aqi))
+    return weather, air
+
+def test_calculate_batch_matches_scalar_path():
+    rng = np.random.default_rng(7)
+    n = 5000
+    temp = np.concatenate([[19.9, 20, 32, 80, 90, 100, 100.1, np.nan], rng.uniform(-10, 115, n)])
+    wind = np.concatenate([[20, 20.1, 30, 30.1, 0, 5, 45, 3], rng.uniform(0, 50, n)])
+    vis = np.concatenate([[0.5, 1, 2.9, 3, 10, 0.1, 6, 1], rng.uniform(0, 10, n)])
+    aqi = np.concatenate([[50, 51, 100, 101, 150, 151, np.nan, 300], rng.integers(0, 400, n)]).astype(float)
+    aqi[rng.random(len(aqi)) < 0.1] = np.nan
+    temp[rng.random(len(temp)) < 0.1] = np.nan
+
+    calc = RiskCalculator()
+    batch = calc.calculate_batch(pd.Series(temp), wind, vis, aqi)
+
+    for i in range(len(temp)):
+        expected = calc.calculate(*_scalar_inputs(temp[i], wind[i], vis[i], aqi[i]))
+        assert batch.overall_score[i] == expected.overall_score
+        assert batch.risk_level[i] == expected.risk_level.value
+        assert batch.confidence[i] == expected.confidence
+        assert batch.concern_codes[i] == expected.concern_codes
@@ -0,0 +1,50 @@
+import asyncio
+from datetime import datetime
+from src import scheduler
+from src.config import Location
+from src.utils.cache import BriefingHistory
+
+def test_next_run_is_aligned_to_the_offset_grid():
+    base = datetime(2026, 1, 1, 8, 0).timestamp()
+    assert scheduler.next_run(base, 30, 20) - base == 20 * 60
+    assert scheduler.next_run(base + 20 * 60, 30, 20) - base == 50 * 60
+    assert scheduler.next_run(base + 51 * 60, 60, 20) - base == 80 * 60
+
+def test_run_due_stores_results_and_reschedules(monkeypatch, tmp_path):
+    from src.agents import graph
+
+    async def fake_run(limiter=None, location=None):
+        if location.name == "Broken":
+            raise RuntimeError("down")
+        return {"timestamp": datetime.now(), "location": {"name": location.name},
+                "risk_score": 12.0, "risk_level": "low", "briefing_text": f"Hello {location.name}"}
+
+    monkeypatch.setattr(graph, "arun_health_guardian", fake_run)
+    now = [datetime(2026, 1, 1, 8, 5).timestamp()]
+    history = BriefingHistory(db_path=tmp_path / "history.db", legacy_dir=tmp_path)
+    locations = [Location(name="Boston", lat=42.36, lon=-71.06), Location(name="Broken", lat=0, lon=0, interval_minutes=60)]
+    sched = scheduler.Scheduler(locations, offset_minutes=20, history=history, clock=lambda: now[0])
+
+    states = asyncio.run(sched.run_due())
+
+    assert [s["briefing_text"] for s in states] == ["Hello Boston"]
+    assert history.latest("Boston")[0]["briefing_text"] == "Hello Boston"
+    assert sched.due() == []
+    assert sched.seconds_until_next() == 15 * 60
+    assert sched.due_at["Broken"] - now[0] == 15 * 60
+
+def test_fan_out_failure_is_logged_and_rescheduled(monkeypatch, tmp_path):
+    from src.agents import fanout
+
+    async def broken_fan_out(subscribers, locations=None, history=None):
+        raise RuntimeError("no LLM")
+
+    monkeypatch.setattr(fanout, "afan_out", broken_fan_out)
+    now = datetime(2026, 1, 1, 8, 5).timestamp()
+    history = BriefingHistory(db_path=tmp_path / "history.db", legacy_dir=tmp_path)
+    sched = scheduler.Scheduler([Location(name="Boston", lat=42.36, lon=-71.06)], offset_minutes=20,
+                                history=history, clock=lambda: now,
+                                subscribers=[fanout.Subscriber("u1", "Boston", "general")])
+
+    assert asyncio.run(sched.run_due()) == []
+    assert sched.seconds_until_next() == 15 * 60
@@ -0,0 +1,40 @@
+import threading
+import time
+import pytest
+from src.utils.singleflight import SingleFlight
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    start = threading.Barrier(10)
+
+    def work():
+        calls.append(1)
+        time.sleep(0.1)
+        return "briefing"
+
+    results = []
+    def caller():
+        start.wait()
+        results.append(flight.do("boston", work))
+
+    threads = [threading.Thread(target=caller) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ["briefing"] * 10
+    assert len(calls) == 1
+    assert flight.do("boston", lambda: "next") == "next"
+
+def test_leader_error_reaches_waiters_and_releases_key():
+    flight = SingleFlight()
+    future, leader = flight.join("boston")
+    waiter, waiter_leads = flight.join("boston")
+    assert leader and not waiter_leads
+
+    flight.resolve("boston", error=RuntimeError("llm down"))
+    with pytest.raises(RuntimeError, match="llm down"):
+        waiter.result()
+    assert flight.join("boston")[1]
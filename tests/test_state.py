@@ -0,0 +1,48 @@
+import json
+from datetime import datetime
+from src.agents import nodes
+from src.agents.state import create_initial_state
+from src.data_ingestion.airquality_client import AirQualityData
+from src.data_ingestion.weather_client import WeatherData
+from src.utils.records import to_record
+
+NOW = datetime(2026, 6, 1, 8, 0)
+
+def _collected_state():
+    state = create_initial_state()
+    state["timestamp"] = NOW
+    state.update(nodes._collected(state, {
+        "weather": WeatherData(
+            timestamp=NOW, temperature_f=96.0, feels_like_f=98.0, humidity=40, wind_speed_mph=4.0,
+            weather_condition="Clear", weather_description="clear sky", cloud_coverage=0,
+            visibility_miles=10.0, pressure_hpa=1012,
+        ),
+        "aqi": AirQualityData(
+            timestamp=NOW, primary_aqi=120, primary_pollutant="O3",
+            category="Unhealthy for Sensitive Groups", reporting_area="Boston",
+        ),
+    }, []))
+    return state
+
+def test_concerns_reach_the_action_plan():
+    state = _collected_state()
+    state.update(nodes.analyze_risk(state))
+    assert state["assessment"].primary_concerns
+
+    plan = nodes.generate_actions(state)["action_plan"]
+    assert plan.mask_recommended
+    assert any(action["action"] == "Wear N95 mask outdoors." for action in plan.actions)
+
+def test_to_record_is_plain_json():
+    state = _collected_state()
+    state.update(nodes.analyze_risk(state))
+    state.update(nodes.generate_actions(state))
+    state["messages"] = [object()]
+
+    record = to_record(state)
+    assert "messages" not in record
+    assert record["location"]["name"] == state["location"].name
+    assert record["weather_data"]["timestamp"] == NOW.isoformat()
+    assert record["assessment"]["risk_level"] == state["risk_level"]
+    assert record["action_plan"]["mask_recommended"] is True
+    json.dumps(record)
@@ -0,0 +1,66 @@
+import asyncio
+import numpy as np
+from benchmarks.stubs import StubProviders
+from src.data_ingestion import airquality_client
+from src.data_ingestion.airquality_client import AirQualityClient
+from src.data_ingestion.stations import haversine_miles, parse_hourly_obs
+
+HEADER = ('"AQSID","SiteName","Status","Latitude","Longitude","ValidDate","ValidTime",'
+          '"ReportingArea_PipeDelimited","OZONE_AQI","PM10_AQI","PM25_AQI","NO2_AQI"')
+
+def _file(rows):
+    return [HEADER] + [",".join(f'"{value}"' for value in row) for row in rows]
+
+def test_parse_keeps_station_identity_and_every_pollutant():
+    index = parse_hourly_obs(_file([
+        ("250250042", "Roxbury, Dudley Sq", "Active", "42.3295", "-71.0826", "10/17/26", "14:00", "Boston|Eastern MA", "38", "", "112", "21"),
+        ("250171102", "Cambridge", "Active", "42.3766", "-71.1158", "10/17/26", "14:00", "Boston", "", "", "", ""),
+        ("250270024", "Worcester", "Active", "", "", "10/17/26", "14:00", "Worcester", "40", "", "", ""),
+        ("251110001", "Chicopee", "Active", "42.1946", "-72.5553", "10/17/26", "14:00", "Springfield", "-999", "55", "", ""),
+    ]))
+    assert len(index) == 2
+
+    rows, distances = index.nearest([42.36, 42.0], [-71.06, -72.5])
+    roxbury = index.station(int(rows[0]), float(distances[0]))
+    assert roxbury.aqsid == "250250042" and roxbury.reporting_area == "Boston"
+    assert roxbury.aqi == {"O3": 38, "PM2.5": 112, "NO2": 21}
+    assert roxbury.valid_at.hour == 14 and 2 < roxbury.distance_miles < 3
+    assert index.station(int(rows[1])).aqi == {"PM10": 55}
+
+    reading = index.observation(42.36, -71.06)
+    assert (reading.primary_aqi, reading.primary_pollutant, reading.category) == (
+        112, "PM2.5", "Unhealthy for Sensitive Groups")
+    assert index.observation(40.7, -74.0) is None
+
+def test_grid_lookups_match_brute_force():
+    rng = np.random.default_rng(7)
+    n = 3000
+    lats, lons = rng.uniform(25, 49, n), rng.uniform(-124, -67, n)
+    index = parse_hourly_obs(_file(
+        (f"{i:09d}", f"Site {i}", "Active", f"{lat:.5f}", f"{lon:.5f}", "10/17/26", "14:00", "Area", "", "", str(i % 200), "")
+        for i, (lat, lon) in enumerate(zip(lats, lons))
+    ))
+    q_lats, q_lons = rng.uniform(25, 49, 2000), rng.uniform(-124, -67, 2000)
+    rows, distances = index.nearest(q_lats, q_lons, max_miles=40)
+
+    d = haversine_miles(q_lats[:, None], q_lons[:, None], index.lat, index.lon)
+    expected = np.where(d.min(axis=1) <= 40, d.argmin(axis=1), -1)
+    assert np.array_equal(rows, expected)
+    assert np.allclose(distances[rows >= 0], d.min(axis=1)[rows >= 0])
+    assert np.array_equal(index.worst_aqi(rows)[rows >= 0], index.aqi[rows[rows >= 0], 1])
+
+    near = index.within(q_lats[0], q_lons[0], 120)
+    assert set(near) == set(np.flatnonzero(d[0] <= 120))
+    assert np.all(np.diff(d[0, near]) >= 0)
+
+def test_client_streams_one_hourly_file(monkeypatch):
+    with StubProviders() as stubs:
+        monkeypatch.setattr(airquality_client, "AIRNOW_FILES_URL", f"{stubs.url}/airnow")
+        client = AirQualityClient()
+        index = client.get_station_index()
+        assert len(index) == 2500
+        assert client.get_station_index() is index
+
+        async_index = asyncio.run(AirQualityClient().aget_station_index())
+        assert np.array_equal(async_index.aqsid, index.aqsid)
+        assert stubs.requests["airnow"] == 2
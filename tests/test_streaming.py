@@ -0,0 +1,24 @@
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from src.agents import graph, nodes
+from src.data_ingestion.collector import Provider
+from src.utils.cache import BriefingCache
+
+def test_briefing_stream_yields_tokens_and_final_state(monkeypatch, tmp_path):
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="Clear skies, enjoy the walk.")]))
+    monkeypatch.setattr(nodes, "get_llm", lambda: llm)
+    monkeypatch.setattr(nodes, "TEMPLATE_BRIEFING_TYPES", set())
+    monkeypatch.setattr(nodes, "briefing_cache", BriefingCache(db_path=tmp_path / "briefings.db"))
+    monkeypatch.setattr(nodes.get_collector(), "providers", [
+        Provider("weather", "Weather", lambda lat, lon: None),
+        Provider("aqi", "AQI", lambda lat, lon: None),
+    ])
+
+    stream = graph.BriefingStream()
+    chunks = list(stream)
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == "Clear skies, enjoy the walk."
+    assert stream.state["phase"] == "complete"
+    assert stream.state["briefing_text"] == "Clear skies, enjoy the walk."
+    assert set(stream.state["token_usage"]) == {"input_tokens", "output_tokens", "total_tokens"}
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+from src.agents import nodes
+from src.config import Location
+from src.data_ingestion.airquality_client import AirQualityClient, AirQualityData
+from src.data_ingestion.weather_client import WeatherData
+from src.scoring.trends import TrendDetector
+
+START = datetime(2026, 3, 1, 6, 0)
+
+def test_aqi_doubling_within_window(tmp_path):
+    detector = TrendDetector(db_path=tmp_path / "trends.db")
+    assert detector.update("Boston", START, {"aqi": 30}) == []
+    assert detector.update("Boston", START + timedelta(hours=1), {"aqi": 45}) == []
+    alerts = detector.update("Boston", START + timedelta(hours=2), {"aqi": 64})
+    assert alerts == ["Rapid change in AQI: 30 → 64 within 3h"]
+    # The 30 reading has left the window five hours later.
+    assert detector.update("Boston", START + timedelta(hours=5), {"aqi": 70}) == []
+
+def test_zscore_and_cusum_after_warmup(tmp_path):
+    detector = TrendDetector(db_path=tmp_path / "trends.db", warmup=12)
+    for i in range(24):
+        detector.update("Boston", START + timedelta(hours=4 * i), {"feels_like_f": 70 + (i % 3) - 1})
+
+    spike = detector.update("Boston", START + timedelta(hours=100), {"feels_like_f": 80})
+    assert any(alert.startswith("Unusually high feels-like temperature") for alert in spike)
+
+    drift = []
+    for i in range(1, 20):
+        drift += detector.update("Boston", START + timedelta(hours=100 + 4 * i), {"feels_like_f": 65})
+    assert "Sustained drop in feels-like temperature" in drift
+
+def test_state_persists_and_stale_updates_are_ignored(tmp_path):
+    TrendDetector(db_path=tmp_path / "trends.db").update("Boston", START, {"aqi": 20, "risk_score": 10})
+    detector = TrendDetector(db_path=tmp_path / "trends.db")
+    assert detector.update("Boston", START, {"aqi": 90}) == []
+    assert detector.stats("Boston", "aqi").count == 1
+    assert detector.stats("Boston", "risk_score").mean == 10
+    assert detector.stats("Cambridge", "aqi").count == 0
+
+def test_both_trend_nodes_feed_the_statistics(isolated_trend_state):
+    state = {
+        "run_id": "t", "timestamp": START, "location": Location(name="Boston", lat=42.36, lon=-71.06), "risk_score": 55.0,
+        "weather_data": WeatherData.model_construct(timestamp=START, feels_like_f=70.0),
+        "air_quality_data": AirQualityData.model_construct(timestamp=START, primary_aqi=30),
+    }
+    assert nodes.skip_trends(state)["trend_alerts"] == []
+    result = nodes.check_trends({
+        **state, "timestamp": START + timedelta(hours=1),
+        "air_quality_data": AirQualityData.model_construct(timestamp=START + timedelta(hours=1), primary_aqi=75),
+    })
+    assert result["trend_alert"] is True
+    assert result["trend_alerts"] == ["Rapid change in AQI: 30 → 75 within 3h"]
+    assert isolated_trend_state.stats("Boston", "aqi").count == 2
+    # The weather reading was the same cached observation both times.
+    assert isolated_trend_state.stats("Boston", "feels_like_f").count == 1
+
+def test_repeated_runs_over_a_cached_reading_fold_it_once(isolated_trend_state):
+    aqi = AirQualityClient._parse([{
+        "DateObserved": "2026-03-01 ", "HourObserved": 6, "LocalTimeZone": "EST", "AQI": 40,
+        "ParameterName": "PM2.5", "Category": {"Name": "Good"}, "ReportingArea": "Boston",
+    }])
+    assert aqi.timestamp == datetime(2026, 3, 1, 11, tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    for minutes in range(0, 60, 5):
+        nodes.skip_trends({
+            "run_id": "t", "timestamp": START + timedelta(minutes=minutes),
+            "location": Location(name="Boston", lat=42.36, lon=-71.06), "risk_score": 20.0,
+            "weather_data": None, "air_quality_data": aqi,
+        })
+    assert isolated_trend_state.stats("Boston", "aqi").count == 1
+    assert isolated_trend_state.stats("Boston", "risk_score").count == 1